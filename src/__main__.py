@@ -0,0 +1,7 @@
+"""
+Allows `python -m src`, the `music-warehouse` command line.
+"""
+
+from src.cli import main
+
+main()
@@ -0,0 +1,10 @@
+"""
+src/analytics/__init__.py
+
+Analytical engines built on top of the silver datasets.
+"""
+
+from .rank_matrix import RankMatrix
+from .silver_reader import load_charts
+
+__all__ = ["RankMatrix", "load_charts"]
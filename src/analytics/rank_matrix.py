@@ -0,0 +1,410 @@
+"""
+rank_matrix.py
+A compact, NumPy-backed rank time series over the silver chart snapshots.
+
+Ranks are held in one int16 array of shape (entity, country, date), with
+MISSING where an entity did not chart; charts deeper than int16 allows are
+held as int32 instead. Only the columns needed to build the index are read
+from silver (no full-history DataFrame), and the matrix can be saved and
+reopened memory-mapped, so queries over years of daily charts only touch
+the pages they read.
+
+Usage:
+    python -m src.analytics.rank_matrix --kind artists --top 10
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import typer
+
+from src.config import OUTPUT_DIR, RANK_MATRIX_DIR
+from src.transform_data.silver_writer import open_partitioned, silver_files, silver_path
+
+app = typer.Typer()
+
+MISSING = -1
+RANK_DTYPE = np.int16
+WIDE_RANK_DTYPE = np.int32
+
+# Columns identifying a chart entity; tracks are labelled "<artist> - <track>"
+ENTITY_COLUMNS = {
+    "artists": ["artist_name"],
+    "tracks": ["artist_name", "track_name"],
+}
+
+READ_COLUMNS = ["chart_country", "chart_date", "rank", "load_time"]
+
+
+def _entity_labels(table: pa.Table, kind: str) -> pa.Array:
+    columns = [pc.cast(table.column(c), pa.string()) for c in ENTITY_COLUMNS[kind]]
+    if len(columns) == 1:
+        return columns[0]
+    return pc.binary_join_element_wise(*columns, " - ")
+
+
+def _read_columns(
+        output_dir: Path,
+        kind: str
+) -> List[Tuple[np.ndarray, ...]]:
+    """
+    (entity, country, date, rank, load_time) arrays for every silver file of `kind`.
+    """
+    columns = READ_COLUMNS + ENTITY_COLUMNS[kind]
+    partitioned_dir = silver_path(output_dir, kind, "partitioned")
+    tables = [
+        pq.read_table(file, columns=columns)
+        for file in silver_files(output_dir, kind)
+        if partitioned_dir not in file.parents
+    ]
+    if partitioned_dir.exists():
+        tables.append(open_partitioned(partitioned_dir).to_table(columns=columns))
+
+    parts = []
+    for table in tables:
+        if table.num_rows == 0:
+            continue
+        parts.append((
+            _entity_labels(table, kind).to_numpy(zero_copy_only=False).astype(str),
+            table.column("chart_country").to_numpy().astype(str),
+            pc.cast(table.column("chart_date"), pa.date32()).to_numpy().astype("datetime64[D]"),
+            table.column("rank").to_numpy().astype(np.int64),
+            pc.cast(table.column("load_time"), pa.timestamp("us")).to_numpy(),
+        ))
+    return parts
+
+
+class RankMatrix:
+    """
+    Rank of every entity in every country on every chart date.
+
+    `ranks[e, c, d]` is the rank of `entities[e]` in `countries[c]` on
+    `dates[d]`, or MISSING. Dates are the sorted union of chart dates over
+    all countries; a country has a chart on a date when any entity charts
+    there. "Previous chart" is the same country's latest earlier chart, like
+    in gold, so a day a country's chart is missing is skipped, not counted
+    as everyone dropping off.
+    """
+
+    def __init__(
+            self,
+            kind: str,
+            entities: np.ndarray,
+            countries: np.ndarray,
+            dates: np.ndarray,
+            ranks: np.ndarray
+    ):
+        self.kind = kind
+        self.entities = np.asarray(entities)
+        self.countries = np.asarray(countries)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.ranks = ranks
+        self._entity_index = {name: i for i, name in enumerate(self.entities)}
+        self._country_index = {name: i for i, name in enumerate(self.countries)}
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.ranks.shape
+
+    @classmethod
+    def from_arrays(
+            cls,
+            kind: str,
+            entity: np.ndarray,
+            country: np.ndarray,
+            date: np.ndarray,
+            rank: np.ndarray
+    ) -> "RankMatrix":
+        """
+        Build from parallel per-row arrays. Later rows win when a
+        (entity, country, date) cell appears more than once. Ranks beyond
+        int16 widen the matrix to int32 rather than wrapping around.
+        """
+        rank = np.asarray(rank)
+        dtype = RANK_DTYPE
+        if len(rank):
+            if rank.min() < 0:
+                raise ValueError(f"Negative rank {rank.min()} in {kind} charts")
+            if rank.max() > np.iinfo(WIDE_RANK_DTYPE).max:
+                raise ValueError(f"Rank {rank.max()} in {kind} charts does not fit the rank matrix")
+            if rank.max() > np.iinfo(RANK_DTYPE).max:
+                dtype = WIDE_RANK_DTYPE
+        entities, e = np.unique(entity, return_inverse=True)
+        countries, c = np.unique(country, return_inverse=True)
+        dates, d = np.unique(np.asarray(date, dtype="datetime64[D]"), return_inverse=True)
+        ranks = np.full((len(entities), len(countries), len(dates)), MISSING, dtype=dtype)
+        ranks[e, c, d] = rank
+        return cls(kind, entities, countries, dates, ranks)
+
+    @classmethod
+    def from_silver(
+            cls,
+            output_dir: Path = OUTPUT_DIR,
+            kind: str = "artists"
+    ) -> "RankMatrix":
+        """
+        Build from every silver file of `kind` (flat and partitioned).
+
+        Flat silver files are overlapping full-history snapshots; rows are
+        applied in load_time order so the latest load of a chart wins.
+        """
+        parts = _read_columns(output_dir, kind)
+        if not parts:
+            raise FileNotFoundError(f"No silver {kind} data under {output_dir}")
+        entity, country, date, rank, load_time = (np.concatenate(column) for column in zip(*parts))
+        order = np.argsort(load_time, kind="stable")
+        return cls.from_arrays(kind, entity[order], country[order], date[order], rank[order])
+
+    # --- persistence ---
+
+    def save(self, path: Path) -> Path:
+        """
+        Write ranks.npy plus an index.json of labels to directory `path`.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "ranks.npy", np.ascontiguousarray(self.ranks))
+        index = {
+            "kind": self.kind,
+            "entities": self.entities.tolist(),
+            "countries": self.countries.tolist(),
+            "dates": self.dates.astype(str).tolist(),
+        }
+        (path / "index.json").write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(
+            cls,
+            path: Path,
+            mmap: bool = True
+    ) -> "RankMatrix":
+        """
+        Open a saved matrix; with `mmap` the rank array is memory-mapped read-only.
+        """
+        path = Path(path)
+        index = json.loads((path / "index.json").read_text(encoding="utf-8"))
+        ranks = np.load(path / "ranks.npy", mmap_mode="r" if mmap else None)
+        return cls(
+            index["kind"],
+            np.array(index["entities"], dtype=str),
+            np.array(index["countries"], dtype=str),
+            np.array(index["dates"], dtype="datetime64[D]"),
+            ranks,
+        )
+
+    # --- lookups ---
+
+    def entity_index(self, entity: str) -> int:
+        return self._entity_index[entity]
+
+    def country_index(self, country: str) -> int:
+        return self._country_index[country]
+
+    def series(
+            self,
+            entity: str,
+            country: str
+    ) -> pd.Series:
+        """
+        Rank history of one entity in one country, indexed by date (NaN when not charting).
+        """
+        ranks = self.ranks[self.entity_index(entity), self.country_index(country)].astype(np.float64)
+        ranks[ranks == MISSING] = np.nan
+        return pd.Series(ranks, index=pd.DatetimeIndex(self.dates), name=entity)
+
+    # --- vectorized analytics ---
+
+    def present(self) -> np.ndarray:
+        """Boolean (entity, country, date) mask of charting entries."""
+        return self.ranks != MISSING
+
+    def charted(self) -> np.ndarray:
+        """Boolean (country, date) mask of dates each country has a chart on."""
+        return self.present().any(axis=0)
+
+    def previous_charts(self) -> np.ndarray:
+        """
+        (country, date) index of each country's previous chart date, -1 before its first chart.
+        """
+        charted = self.charted()
+        positions = np.where(charted, np.arange(charted.shape[-1]), -1)
+        previous = np.full(charted.shape, -1, dtype=np.int64)
+        previous[:, 1:] = np.maximum.accumulate(positions, axis=-1)[:, :-1]
+        return previous
+
+    def _previous_ranks(self) -> np.ndarray:
+        """Ranks on each country's previous chart, MISSING before its first chart."""
+        previous = self.previous_charts()
+        index = np.broadcast_to(np.maximum(previous, 0), self.ranks.shape)
+        ranks = np.take_along_axis(np.asarray(self.ranks), index, axis=-1)
+        return np.where(previous >= 0, ranks, MISSING).astype(self.ranks.dtype)
+
+    def deltas(self) -> np.ndarray:
+        """
+        Rank change versus the country's previous chart, positive when moving
+        up (previous rank - rank). NaN when either chart lacks the entity.
+        """
+        previous = self._previous_ranks()
+        charted = (self.ranks != MISSING) & (previous != MISSING)
+        deltas = previous.astype(np.float32) - self.ranks.astype(np.float32)
+        deltas[~charted] = np.nan
+        return deltas
+
+    def new_entries(self) -> np.ndarray:
+        """
+        Entries charting on a date but not on the country's previous chart.
+        Everything on a country's first chart is new, matching the gold rank deltas.
+        """
+        return self.present() & (self._previous_ranks() == MISSING)
+
+    def drop_offs(self) -> np.ndarray:
+        """
+        Entries on the country's previous chart but not on its chart for this
+        date. Dates the country has no chart on have no drop-offs.
+        """
+        return (self._previous_ranks() != MISSING) & ~self.present() & self.charted()
+
+    def streaks(self) -> np.ndarray:
+        """Length of the current consecutive charting run at every cell."""
+        present = self.present().astype(np.int32)
+        total = np.cumsum(present, axis=-1)
+        # running total at the last missing cell, carried forward
+        reset = np.maximum.accumulate(np.where(present == 0, total, 0), axis=-1)
+        return total - reset
+
+    def longest_streaks(self) -> np.ndarray:
+        """Longest consecutive charting run per (entity, country)."""
+        if self.ranks.shape[-1] == 0:
+            return np.zeros(self.ranks.shape[:2], dtype=np.int32)
+        return self.streaks().max(axis=-1)
+
+    def _previous_chart_dates(
+            self,
+            d: int,
+            country_ids: np.ndarray
+    ) -> np.ndarray:
+        """
+        Date index of the chart before date `d` for each of `country_ids`, -1
+        if none, walking back one date column at a time.
+        """
+        previous = np.full(len(country_ids), -1, dtype=np.int64)
+        for p in range(d - 1, -1, -1):
+            pending = np.flatnonzero(previous < 0)
+            if len(pending) == 0:
+                break
+            charted = (np.asarray(self.ranks[:, country_ids[pending], p]) != MISSING).any(axis=0)
+            previous[pending[charted]] = p
+        return previous
+
+    def top_movers(
+            self,
+            n: int = 10,
+            date: Optional[str] = None,
+            country: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Biggest climbers on `date` (default: the latest), optionally in one
+        country, versus each country's previous chart. Only the date column
+        involved and the columns back to each country's previous chart are
+        read from the matrix.
+        """
+        if date is None:
+            d = len(self.dates) - 1
+        else:
+            d = int(np.searchsorted(self.dates, np.datetime64(date, "D")))
+            if d >= len(self.dates) or self.dates[d] != np.datetime64(date, "D"):
+                raise KeyError(f"No {self.kind} chart on {date}")
+        if d <= 0:
+            return pd.DataFrame(columns=["entity", "country", "rank", "prev_rank", "rank_delta"])
+
+        countries = slice(None)
+        if country is not None:
+            c = self.country_index(country)
+            countries = slice(c, c + 1)
+        current = np.asarray(self.ranks[:, countries, d], dtype=np.int32)
+        country_ids = np.arange(len(self.countries))[countries]
+        previous_dates = self._previous_chart_dates(d, country_ids)
+        previous = np.full(current.shape, MISSING, dtype=np.int32)
+        found = previous_dates >= 0
+        previous[:, found] = self.ranks[:, country_ids[found], previous_dates[found]]
+        charted = (current != MISSING) & (previous != MISSING)
+        delta = np.where(charted, previous - current, 0)
+
+        flat = delta.ravel()
+        candidates = np.flatnonzero(flat > 0)
+        top = candidates[np.argsort(-flat[candidates], kind="stable")[:n]]
+        e, c = np.unravel_index(top, delta.shape)
+        return pd.DataFrame({
+            "entity": self.entities[e],
+            "country": self.countries[countries][c],
+            "rank": current[e, c],
+            "prev_rank": previous[e, c],
+            "rank_delta": delta[e, c],
+        })
+
+
+def build_rank_matrix(
+        output_dir: Path = OUTPUT_DIR,
+        kind: str = "artists",
+        matrix_dir: Path = RANK_MATRIX_DIR
+) -> RankMatrix:
+    """
+    Build the matrix for `kind` from silver and persist it under matrix_dir/<kind>.
+    """
+    matrix = RankMatrix.from_silver(output_dir, kind)
+    matrix.save(Path(matrix_dir) / kind)
+    return matrix
+
+
+# CLI entry point
+def main(
+        kind: str = typer.Option(
+            "artists",
+            "--kind",
+            "-k",
+            help="Chart type: artists or tracks"
+        ),
+        output_dir: Path = typer.Option(
+            OUTPUT_DIR,
+            "--output-dir",
+            "-o",
+            help="Data directory containing silver/geo"
+        ),
+        matrix_dir: Path = typer.Option(
+            RANK_MATRIX_DIR,
+            "--matrix-dir",
+            help="Directory to persist the rank matrix in"
+        ),
+        top: int = typer.Option(
+            10,
+            "--top",
+            "-n",
+            help="Number of top movers to show for the latest chart date"
+        ),
+):
+    if kind not in ENTITY_COLUMNS:
+        raise typer.BadParameter(f"Unknown kind '{kind}', expected artists or tracks")
+
+    matrix = build_rank_matrix(output_dir, kind, matrix_dir)
+    entities, countries, dates = matrix.shape
+    typer.echo(
+        f"Rank matrix {entities} {kind} × {countries} countries × {dates} dates "
+        f"({matrix.ranks.nbytes / 1e6:.1f} MB) → {Path(matrix_dir) / kind}"
+    )
+    movers = matrix.top_movers(top)
+    if movers.empty:
+        typer.echo("No movers: fewer than two chart dates.")
+    else:
+        typer.echo(movers.to_string(index=False))
+
+
+if __name__ == "__main__":
+    app.command()(main)
+    app()
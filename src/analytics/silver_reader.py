@@ -0,0 +1,237 @@
+"""
+silver_reader.py
+Read API for the silver chart datasets.
+
+    from src.analytics import load_charts
+    df = load_charts("tracks", countries=["japan"], date_range=("2025-11-01", "2025-11-30"),
+                     columns=["rank", "track_name", "artist_name"])
+
+Only live silver files are read (both layouts, skipping files retired by
+compaction). Partitioned data is pruned by directory before any file is
+opened; flat files get the country/date filter pushed down to pyarrow, which
+skips row groups by their statistics, and only the requested columns are
+decoded. By default only the latest load of each (chart_country,
+chart_date, rank) is kept, the same rule as the gold build and compaction.
+
+Decoded per-file tables are kept in an in-process LRU cache keyed on the
+file's path, size and mtime plus the projection and filter, so repeated
+interactive queries reuse them, and a rewritten or new file is read afresh.
+Results are returned as Arrow or as pandas with the compact silver dtypes,
+converted without copying where Arrow allows it.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.config import OUTPUT_DIR, SILVER_CACHE_MAX_BYTES
+from src.transform_data.compact import METADATA_TYPES, PANDAS_TYPES, to_compact_table
+from src.transform_data.silver_writer import open_partitioned, silver_files, silver_path
+from src.utils.chart_schemas import get_schema
+
+# Columns needed to keep the latest load of every chart entry
+KEY_COLUMNS = ["chart_country", "chart_date", "rank", "load_time"]
+
+DateLike = Union[str, date, pd.Timestamp]
+
+
+class TableCache:
+    """
+    Thread-safe LRU cache of Arrow tables bounded by their total size in bytes.
+    """
+    def __init__(
+            self,
+            max_bytes: int = SILVER_CACHE_MAX_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._tables: "OrderedDict[Hashable, pa.Table]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            key: Hashable
+    ) -> Optional[pa.Table]:
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(
+            self,
+            key: Hashable,
+            table: pa.Table
+    ):
+        if table.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._tables.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._tables[key] = table
+            self._bytes += table.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._tables.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._tables)
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._bytes = 0
+
+
+_cache = TableCache()
+
+
+def get_cache() -> TableCache:
+    return _cache
+
+
+def _fingerprint(path: Path) -> Tuple[str, int, int]:
+    stat = Path(path).stat()
+    return str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def _filter(
+        countries: Optional[Sequence[str]],
+        date_range: Optional[Tuple[Optional[DateLike], Optional[DateLike]]]
+) -> Optional[pc.Expression]:
+    conditions = []
+    if countries is not None:
+        conditions.append(pc.field("chart_country").isin(list(countries)))
+    if date_range is not None:
+        start, end = date_range
+        if start is not None:
+            conditions.append(pc.field("chart_date") >= pa.scalar(pd.Timestamp(start).date()))
+        if end is not None:
+            conditions.append(pc.field("chart_date") <= pa.scalar(pd.Timestamp(end).date()))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def _read(
+        dataset: ds.Dataset,
+        fingerprint: tuple,
+        kind: str,
+        columns: List[str],
+        row_filter: Optional[pc.Expression],
+        cache: Optional[TableCache],
+        partition_keys: Optional[dict] = None
+) -> pa.Table:
+    """
+    One file's table with `columns` in compact schema order, from `cache` if
+    it was read before. Partition keys are added as columns, as partitioned
+    files do not store them.
+    """
+    key = (fingerprint, tuple(columns), str(row_filter))
+    table = cache.get(key) if cache is not None else None
+    if table is not None:
+        return table
+
+    present = [c for c in columns if c in dataset.schema.names]
+    table = dataset.to_table(columns=present, filter=row_filter)
+    for name, value in (partition_keys or {}).items():
+        if name in columns:
+            table = table.append_column(name, pa.array([value] * table.num_rows))
+    table = to_compact_table(table, kind, columns)
+    if cache is not None:
+        cache.put(key, table)
+    return table
+
+
+def latest_loads(table: pa.Table) -> pa.Table:
+    """
+    Keep the most recently loaded row of every (chart_country, chart_date, rank).
+    """
+    keys = table.select(KEY_COLUMNS).to_pandas()
+    duplicate = keys.sort_values("load_time", kind="stable").duplicated(KEY_COLUMNS[:-1], keep="last")
+    if not duplicate.any():
+        return table
+    return table.filter(pa.array(~duplicate.sort_index().to_numpy()))
+
+
+def load_charts(
+        kind: str,
+        countries: Optional[Iterable[str]] = None,
+        date_range: Optional[Tuple[Optional[DateLike], Optional[DateLike]]] = None,
+        columns: Optional[Sequence[str]] = None,
+        output_dir: Path = OUTPUT_DIR,
+        latest: bool = True,
+        as_arrow: bool = False,
+        cache: Optional[TableCache] = _cache
+) -> Union[pd.DataFrame, pa.Table]:
+    """
+    Load silver chart rows of `kind`.
+
+    Args:
+        kind (str): Registered chart type, e.g. 'artists'.
+        countries (Iterable[str]): Only these chart countries.
+        date_range (tuple): Inclusive (start, end) chart dates; either may be None.
+        columns (Sequence[str]): Columns to return, default all.
+        output_dir (Path): Directory holding the silver datasets.
+        latest (bool): Keep only the latest load of each chart entry.
+        as_arrow (bool): Return a pyarrow Table instead of a DataFrame.
+        cache (TableCache): Cache of decoded files; None reads every file.
+
+    :return: Matching rows, with compact silver types.
+    """
+    schema = get_schema(kind)
+    all_columns = schema.columns + list(METADATA_TYPES)
+    columns = list(columns) if columns is not None else all_columns
+    unknown = set(columns) - set(all_columns)
+    if unknown:
+        raise ValueError(f"Unknown {kind} columns: {', '.join(sorted(unknown))}")
+    countries = list(countries) if countries is not None else None
+    read_columns = columns + [c for c in KEY_COLUMNS if latest and c not in columns]
+    row_filter = _filter(countries, date_range)
+
+    partitioned_dir = silver_path(output_dir, kind, "partitioned")
+    tables = [
+        _read(ds.dataset(file, format="parquet"), _fingerprint(file), kind, read_columns, row_filter, cache)
+        for file in silver_files(output_dir, kind)
+        if partitioned_dir not in file.parents
+    ]
+    if partitioned_dir.exists():
+        # directory pruning: only partitions matching the filter are opened
+        for fragment in open_partitioned(partitioned_dir).get_fragments(filter=row_filter):
+            partition_keys = ds.get_partition_keys(fragment.partition_expression)
+            tables.append(_read(
+                ds.dataset(fragment.path, format="parquet"), _fingerprint(fragment.path), kind, read_columns,
+                None, cache, partition_keys
+            ))
+
+    if tables:
+        table = pa.concat_tables(tables)
+    else:
+        table = to_compact_table(pa.table({}), kind, read_columns)
+    if latest:
+        table = latest_loads(table)
+    table = table.select(columns)
+
+    if as_arrow:
+        return table
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get, split_blocks=True)
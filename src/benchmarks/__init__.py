@@ -0,0 +1,5 @@
+"""
+src/benchmarks/__init__.py
+
+Standalone performance benchmarks for the music warehouse pipeline.
+"""
@@ -0,0 +1,112 @@
+"""
+bench_imports.py
+Import-time benchmark for the `music-warehouse` CLI.
+
+Each probe runs in a fresh interpreter, so the timings include interpreter
+start-up the way a cron-driven invocation sees it. The CLI probes also
+report which heavy dependencies ended up in `sys.modules`; any of them
+being loaded for `--help` is a regression.
+
+Usage:
+    python -m src.benchmarks.bench_imports
+    python -m src.benchmarks.bench_imports --repeat 20 --budget-ms 150
+"""
+
+import json
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Dict, List, Tuple
+
+import typer
+
+
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "requests", "apscheduler", "duckdb")
+
+# name -> python statements run in a fresh interpreter
+PROBES: Dict[str, str] = {
+    "python": "pass",
+    "import typer": "import typer",
+    "import src.cli": "import src.cli",
+    "music-warehouse --help": (
+        "import sys; sys.argv = ['music-warehouse', '--help']\n"
+        "from src.cli import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "music-warehouse bench --help": (
+        "import sys; sys.argv = ['music-warehouse', 'bench', '--help']\n"
+        "from src.cli import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "import src.transform_data.transform_tracks": "import src.transform_data.transform_tracks",
+}
+
+# probes expected to leave every heavy module unloaded
+LIGHT_PROBES = ("import src.cli", "music-warehouse --help", "music-warehouse bench --help")
+
+_REPORT = (
+    "\nimport json, sys\n"
+    "print('\\n' + json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+)
+
+
+def run_probe(code: str) -> Tuple[float, List[str]]:
+    """
+    Run `code` in a new interpreter.
+    :return: (wall seconds, heavy modules it left loaded)
+    """
+    script = code + _REPORT.format(heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return time.perf_counter() - started, json.loads(out.strip().splitlines()[-1])
+
+
+def run_benchmark(repeat: int = 10) -> Dict[str, dict]:
+    results = {}
+    for name, code in PROBES.items():
+        runs = [run_probe(code) for _ in range(repeat)]
+        times = [t for t, _ in runs]
+        results[name] = {
+            "min_ms": min(times) * 1000,
+            "median_ms": median(times) * 1000,
+            "heavy_modules": runs[-1][1],
+        }
+    return results
+
+
+# CLI entry point
+def main(
+        repeat: int = typer.Option(
+            10,
+            "--repeat",
+            "-r",
+            help="Interpreter launches per probe (min and median are reported)"
+        ),
+        budget_ms: float = typer.Option(
+            0.0,
+            "--budget-ms",
+            help="Fail if `music-warehouse --help` takes longer than this (min over runs); 0 disables"
+        ),
+):
+    results = run_benchmark(repeat)
+    failed = False
+    for name, r in results.items():
+        heavy = ", ".join(r["heavy_modules"]) or "-"
+        typer.echo(f"{name:45} min {r['min_ms']:7.1f} ms  median {r['median_ms']:7.1f} ms  heavy: {heavy}")
+        if name in LIGHT_PROBES and r["heavy_modules"]:
+            typer.secho(f"{name} loaded heavy modules: {heavy}", fg=typer.colors.RED)
+            failed = True
+
+    help_ms = results["music-warehouse --help"]["min_ms"]
+    if budget_ms and help_ms > budget_ms:
+        typer.secho(f"--help took {help_ms:.1f} ms, over the {budget_ms:.0f} ms budget", fg=typer.colors.RED)
+        failed = True
+    if failed:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
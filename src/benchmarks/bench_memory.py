@@ -0,0 +1,85 @@
+"""
+bench_memory.py
+Compares the in-memory footprint of chart frames as parsed (int64, plain
+strings, timestamps) with the compact silver types of
+src/transform_data/compact.py, column by column.
+
+Usage:
+    python -m src.benchmarks.bench_memory
+    python -m src.benchmarks.bench_memory --copies 30      # e.g. a month of the same charts
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import typer
+
+from src.transform_data.compact import to_compact_frame
+from src.transform_data.engine import transform_chart_file
+from src.utils.chart_schemas import CHART_SCHEMAS
+
+RAW_DIR = Path(__file__).parent.parent.parent / "data" / "raw" / "geo"
+
+
+def memory_report(
+        before: pd.DataFrame,
+        after: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Deep memory usage of every column of `before` and `after`, with dtypes and the ratio.
+    """
+    report = pd.DataFrame({
+        "dtype": before.dtypes.astype(str),
+        "bytes": before.memory_usage(index=False, deep=True),
+        "compact_dtype": after.dtypes.astype(str),
+        "compact_bytes": after.memory_usage(index=False, deep=True),
+    })
+    report.loc["total"] = ["", report["bytes"].sum(), "", report["compact_bytes"].sum()]
+    report["ratio"] = report["bytes"] / report["compact_bytes"]
+    return report
+
+
+def run_benchmark(
+        raw_dir: Path = RAW_DIR,
+        copies: int = 1
+) -> dict:
+    """
+    :return: {chart_type: memory_report of every raw file of the type, repeated `copies` times}
+    """
+    results = {}
+    for kind in CHART_SCHEMAS:
+        files = sorted((raw_dir / kind).glob("*.json"))
+        if not files:
+            continue
+        frames = [transform_chart_file(file, kind) for file in files]
+        parsed = pd.concat(frames * copies, ignore_index=True)
+        results[kind] = memory_report(parsed, to_compact_frame(parsed, kind))
+    return results
+
+
+# CLI entry point
+def main(
+        raw_dir: Path = typer.Option(
+            RAW_DIR,
+            "--raw-dir",
+            help="Directory with one raw directory per chart type"
+        ),
+        copies: int = typer.Option(
+            1,
+            "--copies",
+            "-n",
+            help="Repeat the raw charts this many times, to approximate a longer history"
+        ),
+):
+    for kind, report in run_benchmark(raw_dir, copies).items():
+        total = report.loc["total"]
+        typer.echo(
+            f"{kind}: {total['bytes'] / 1e6:.2f} MB parsed → {total['compact_bytes'] / 1e6:.2f} MB compact "
+            f"({total['ratio']:.1f}x smaller)"
+        )
+        typer.echo(report.drop(index="total").to_string(float_format="{:.1f}".format))
+        typer.echo("")
+
+
+if __name__ == "__main__":
+    typer.run(main)
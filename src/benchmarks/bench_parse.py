@@ -0,0 +1,92 @@
+"""
+bench_parse.py
+Compares the fast-path chart parser with the pd.json_normalize transform
+on the raw sample data in data/raw/geo.
+
+Usage:
+    python -m src.benchmarks.bench_parse --repeat 5
+"""
+
+import time
+from functools import partial
+from pathlib import Path
+from statistics import median
+
+import typer
+
+from src.transform_data.engine import transform_chart_file
+from src.utils.chart_schemas import CHART_SCHEMAS
+
+RAW_DIR = Path(__file__).parent.parent.parent / "data" / "raw" / "geo"
+
+
+def time_engine(
+        files: list,
+        transform,
+        engine: str,
+        repeat: int
+) -> float:
+    """
+    Median seconds to parse every file once with `engine`.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for file in files:
+            transform(file, engine=engine)
+        timings.append(time.perf_counter() - started)
+    return median(timings)
+
+
+def run_benchmark(
+        raw_dir: Path = RAW_DIR,
+        repeat: int = 5
+) -> dict:
+    """
+    :return: {chart_type: {"files": n, "pandas": seconds, "fast": seconds, "speedup": x}}
+    """
+    results = {}
+    for kind in CHART_SCHEMAS:
+        files = sorted((raw_dir / kind).glob("*.json"))
+        if not files:
+            continue
+        transform = partial(transform_chart_file, kind=kind)
+        # warm up imports and the OS file cache
+        transform(files[0], engine="pandas")
+        transform(files[0], engine="fast")
+
+        pandas_time = time_engine(files, transform, "pandas", repeat)
+        fast_time = time_engine(files, transform, "fast", repeat)
+        results[kind] = {
+            "files": len(files),
+            "pandas": pandas_time,
+            "fast": fast_time,
+            "speedup": pandas_time / fast_time if fast_time else float("inf"),
+        }
+    return results
+
+
+# CLI entry point
+def main(
+        raw_dir: Path = typer.Option(
+            RAW_DIR,
+            "--raw-dir",
+            help="Directory with artists/ and tracks/ raw JSON files"
+        ),
+        repeat: int = typer.Option(
+            5,
+            "--repeat",
+            "-r",
+            help="Number of timed passes over the files (median is reported)"
+        ),
+):
+    results = run_benchmark(raw_dir, repeat)
+    for kind, r in results.items():
+        typer.echo(
+            f"{kind:8} {r['files']:4d} files  pandas {r['pandas'] * 1000:8.1f} ms  "
+            f"fast {r['fast'] * 1000:8.1f} ms  speedup {r['speedup']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
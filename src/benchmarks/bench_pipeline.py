@@ -0,0 +1,295 @@
+"""
+bench_pipeline.py
+Benchmark suite for the ingestion and transform hot paths.
+
+Synthetic raw corpora of each requested size are generated in a temporary
+directory and the parse, normalize, concat and parquet-write stages are
+timed per chart type. Ingestion (LastfmClient.run) is timed against a local
+mock Last.fm server with injected latency. Results are written as JSON
+tagged with the current commit, and can be compared with an earlier run.
+
+Usage:
+    python -m src.benchmarks.bench_pipeline --sizes 100,10000,1000000
+    python -m src.benchmarks.bench_pipeline --baseline data/benchmarks/<earlier>.json
+"""
+
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Callable, List, Optional
+
+import pandas as pd
+import typer
+
+from src.benchmarks.mock_server import MockLastfmServer
+from src.benchmarks.synthetic import write_corpus
+from src.clients.lastfm_client import CHART_TYPES, LastfmClient
+from src.config import COUNTRIES, TRANSFORM_ENGINE
+from src.lastfm_fetch.response_cache import ResponseCache
+from src.transform_data.fast_parse import extract_columns
+from src.transform_data.silver_writer import write_silver
+from src.transform_data.transform_artists import transform_artist_data_country
+from src.transform_data.transform_tracks import transform_track_data_country
+from src.utils.chart_schemas import get_schema
+from src.utils.raw_io import load_payload
+
+RESULTS_DIR = Path(__file__).parent.parent.parent / "data" / "benchmarks"
+
+TRANSFORMS = {
+    "artists": transform_artist_data_country,
+    "tracks": transform_track_data_country,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def timed(
+        fn: Callable,
+        repeat: int
+):
+    """
+    Run `fn` `repeat` times. :return: (median seconds, last result)
+    """
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return median(timings), result
+
+
+def _result(stage: str, kind: str, records: int, seconds: float, **extra) -> dict:
+    return {
+        "stage": stage,
+        "kind": kind,
+        "records": records,
+        "seconds": round(seconds, 6),
+        "records_per_s": round(records / seconds, 1) if seconds else None,
+        **extra,
+    }
+
+
+def normalize(
+        records: List[dict],
+        kind: str,
+        engine: str
+) -> pd.DataFrame:
+    """
+    Flatten already-parsed records into a DataFrame the way `engine` does.
+    """
+    if engine == "fast":
+        return pd.DataFrame(extract_columns(records, kind))
+    return pd.json_normalize(records)
+
+
+def bench_transform(
+        work_dir: Path,
+        kind: str,
+        records: int,
+        repeat: int = 3,
+        engine: str = TRANSFORM_ENGINE,
+        days: int = 30
+) -> List[dict]:
+    """
+    Time parse / normalize / concat / write over a synthetic corpus of `records` records.
+    """
+    files = write_corpus(work_dir / f"raw_{records}", kind, records, days=days)
+    transform = TRANSFORMS[kind]
+    tags = {"files": len(files), "engine": engine}
+
+    schema = get_schema(kind)
+    parse_s, payloads = timed(lambda: [load_payload(f) for f in files], repeat)
+    record_lists = [payload[schema.root_key][schema.record_key] for payload in payloads]
+    # normalize is timed on the parsed payloads, so it excludes file reads and JSON decoding
+    normalize_s, _ = timed(lambda: [normalize(r, kind, engine) for r in record_lists], repeat)
+    dfs = [transform(f, engine=engine) for f in files]
+    concat_s, df = timed(lambda: pd.concat(dfs, ignore_index=True), repeat)
+    written = []
+    write_s, _ = timed(lambda: written.append(write_silver(df, work_dir / f"silver_{records}" / kind, kind)), repeat)
+
+    return [
+        _result("parse", kind, records, parse_s, **tags),
+        _result("normalize", kind, records, normalize_s, **tags),
+        _result("concat", kind, records, concat_s, **tags),
+        _result("write", kind, records, write_s, bytes=written[-1].stat().st_size, **tags),
+    ]
+
+
+def bench_ingestion(
+        work_dir: Path,
+        countries: int = len(COUNTRIES),
+        latency: float = 0.05,
+        concurrency: int = 4,
+        limit: int = 50
+) -> dict:
+    """
+    Time one LastfmClient.run over `countries` countries against the mock
+    server, with a fresh response cache so every chart is fetched.
+    """
+    names = [f"Country {i}" for i in range(countries)]
+    with MockLastfmServer(latency=latency) as server:
+        client = LastfmClient(
+            countries=names,
+            limit=limit,
+            concurrency=concurrency,
+            rate_limit=10_000,
+            base_url=server.url,
+            cache=ResponseCache(work_dir / "cache.sqlite"),
+            data_dir=work_dir / "ingest",
+            api_key="benchmark",
+        )
+        started = time.perf_counter()
+        failures = client.run()
+        seconds = time.perf_counter() - started
+        client.http_client.close()
+        requests = server.requests
+
+    return _result(
+        "ingest", "charts", countries * len(CHART_TYPES) * limit, seconds,
+        requests=requests, failures=len(failures), latency=latency, concurrency=concurrency,
+    )
+
+
+def run_suite(
+        sizes: List[int],
+        repeat: int = 3,
+        engine: str = TRANSFORM_ENGINE,
+        latency: float = 0.05,
+        concurrency: int = 4,
+        ingest: bool = True
+) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="music_warehouse_bench_") as tmp:
+        work_dir = Path(tmp)
+        for records in sizes:
+            for kind in TRANSFORMS:
+                typer.echo(f"Benchmarking {kind} transform with {records} records...")
+                results.extend(bench_transform(work_dir, kind, records, repeat, engine))
+        if ingest:
+            typer.echo(f"Benchmarking ingestion against the mock server ({latency * 1000:.0f} ms latency)...")
+            results.append(bench_ingestion(work_dir, latency=latency, concurrency=concurrency))
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+        current: dict,
+        baseline: dict,
+        threshold: float = 0.10
+) -> List[dict]:
+    """
+    Pair up results by (stage, kind, records).
+    :return: Rows with the time ratio current/baseline and a regression flag.
+    """
+    previous = {(r["stage"], r["kind"], r["records"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        before = previous.get((r["stage"], r["kind"], r["records"]))
+        if not before or not before["seconds"]:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        rows.append({**r, "baseline_seconds": before["seconds"], "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def save_results(
+        report: dict,
+        results_dir: Path = RESULTS_DIR
+) -> Path:
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"bench_{datetime.now():%Y%m%d_%H%M%S}_{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
+
+
+# CLI entry point
+def main(
+        sizes: str = typer.Option(
+            "100,10000",
+            "--sizes",
+            "-s",
+            help="Comma-separated corpus sizes in records, e.g. 100,10000,1000000"
+        ),
+        repeat: int = typer.Option(
+            3,
+            "--repeat",
+            "-r",
+            help="Timed passes per stage (median is reported)"
+        ),
+        engine: str = typer.Option(
+            TRANSFORM_ENGINE,
+            "--engine",
+            help="Transform engine to benchmark: 'fast' or 'pandas'"
+        ),
+        latency: float = typer.Option(
+            0.05,
+            "--latency",
+            help="Injected mock server latency in seconds"
+        ),
+        concurrency: int = typer.Option(
+            4,
+            "--concurrency",
+            "-w",
+            help="Ingestion workers"
+        ),
+        ingest: bool = typer.Option(
+            True,
+            "--ingest/--no-ingest",
+            help="Also benchmark ingestion against the mock server"
+        ),
+        results_dir: Path = typer.Option(
+            RESULTS_DIR,
+            "--results-dir",
+            help="Directory to write the JSON results to"
+        ),
+        baseline: Optional[Path] = typer.Option(
+            None,
+            "--baseline",
+            "-b",
+            help="Earlier results JSON to compare against"
+        ),
+        threshold: float = typer.Option(
+            0.10,
+            "--threshold",
+            help="Slowdown ratio above which a stage is flagged as a regression"
+        ),
+):
+    report = run_suite([int(s) for s in sizes.split(",")], repeat, engine, latency, concurrency, ingest)
+    for r in report["results"]:
+        typer.echo(
+            f"{r['stage']:9} {r['kind']:7} {r['records']:>9d} records  {r['seconds'] * 1000:10.1f} ms  "
+            f"{r['records_per_s'] or 0:>12,.0f} rec/s"
+        )
+    path = save_results(report, results_dir)
+    typer.echo(f"Results → {path}")
+
+    if baseline:
+        rows = compare(report, json.loads(Path(baseline).read_text(encoding="utf-8")), threshold)
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            typer.echo(f"{row['stage']:9} {row['kind']:7} {row['records']:>9d}  x{row['ratio']:.2f} vs baseline{flag}")
+        if any(row["regression"] for row in rows):
+            raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
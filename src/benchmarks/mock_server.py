@@ -0,0 +1,295 @@
+"""
+mock_server.py
+A local stand-in for the Last.fm API, for load, latency and failure testing
+without spending the real API key.
+
+geo.gettopartists / geo.gettoptracks are answered with synthetic charts
+paginated like the real service (`@attr.totalPages`, the last page short),
+and artist.getInfo / artist.getTopTags / track.getInfo with synthetic
+metadata for whatever entity is asked for.
+Every response can be delayed by a latency with jitter, a fraction of
+requests fails with 5xx statuses or Last.fm error payloads, and requests
+beyond a server-side rate limit get 429 with Retry-After, as Last.fm
+does with error 29. Point the pipeline at it with LASTFM_BASE_URL:
+
+Usage:
+    python -m src.benchmarks.mock_server --port 8765 --latency 0.1 --error-rate 0.05 --rate-limit 20
+    LASTFM_BASE_URL=http://127.0.0.1:8765/2.0/ LASTFM_API_KEY=test python -m src.clients.lastfm_client
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import typer
+
+from src.benchmarks.synthetic import IMAGE_SIZES, chart_payload, entity_payload
+from src.utils.rate_limiter import TokenBucket
+
+METHODS = {
+    "geo.gettopartists": "artists",
+    "geo.gettoptracks": "tracks",
+}
+
+# Per-entity metadata methods; method names are case-insensitive, as on Last.fm
+ENTITY_METHODS = ("artist.getinfo", "artist.gettoptags", "track.getinfo")
+
+# Last.fm caps geo chart pages at 1000 entries
+MAX_LIMIT = 1000
+
+# Transient failures: HTTP statuses, and Last.fm error codes returned in the body
+ERROR_STATUSES = (500, 502, 503)
+API_ERRORS = {
+    8: "Operation failed - Most likely the backend service failed. Please try again.",
+    11: "Service Offline - This service is temporarily offline. Try again later.",
+    16: "The service is temporarily unavailable, please try again.",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        status, body, headers = self.server.respond(params)
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            latency: float,
+            jitter: float,
+            error_rate: float,
+            api_error_rate: float,
+            rate_limit: float,
+            total: int,
+            images: int,
+            seed: Optional[int]
+    ):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.api_error_rate = api_error_rate
+        self.total = total
+        self.images = images
+        self.limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            return (
+                self._random.uniform(-self.jitter, self.jitter),
+                self._random.random(),
+                self._random.choice(ERROR_STATUSES),
+                self._random.choice(list(API_ERRORS)),
+            )
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[outcome] += 1
+
+    def respond(self, params: dict) -> tuple:
+        """
+        :return: (HTTP status, JSON body, extra headers) for one request.
+        """
+        jitter, roll, status, code = self._draw()
+        time.sleep(max(0.0, self.latency + jitter))
+
+        if self.limiter is not None and not self.limiter.try_acquire():
+            self._count("throttled")
+            retry_after = max(1, round(1 / self.limiter.rate))
+            return 429, {"error": 29, "message": "Rate Limit Exceeded"}, {"Retry-After": str(retry_after)}
+
+        if roll < self.error_rate:
+            self._count("errors")
+            return status, {"error": 16, "message": API_ERRORS[16]}, {}
+        if roll < self.error_rate + self.api_error_rate:
+            self._count("api_errors")
+            return 200, {"error": code, "message": API_ERRORS[code]}, {}
+
+        method = params.get("method", "").lower()
+        if method in ENTITY_METHODS:
+            if not params.get("artist") or (method == "track.getinfo" and not params.get("track")):
+                self._count("invalid")
+                return 200, {"error": 6, "message": "The artist you supplied could not be found"}, {}
+            self._count("ok")
+            return 200, entity_payload(method, params["artist"], params.get("track"), images=self.images), {}
+
+        kind = METHODS.get(method)
+        if kind is None:
+            self._count("invalid")
+            return 400, {"error": 3, "message": "Invalid Method - No method with that name in this package"}, {}
+        if not params.get("country"):
+            self._count("invalid")
+            return 400, {"error": 6, "message": "country param required"}, {}
+
+        self._count("ok")
+        return 200, chart_payload(
+            kind,
+            params["country"],
+            limit=max(1, min(int(params.get("limit", 50)), MAX_LIMIT)),
+            page=max(1, int(params.get("page", 1))),
+            total=self.total,
+            images=self.images,
+        ), {}
+
+
+class MockLastfmServer:
+    """
+    Context manager running the stand-in API in a background thread.
+
+        with MockLastfmServer(latency=0.05, error_rate=0.1, rate_limit=50) as server:
+            LastfmClient(base_url=server.url, ...).run()
+            server.stats  # Counter of requests / ok / throttled / errors / api_errors
+
+    Args:
+        latency (float): Seconds every response is delayed by.
+        jitter (float): Uniform +/- seconds added to the latency.
+        error_rate (float): Fraction of requests failing with a 5xx status.
+        api_error_rate (float): Fraction answered 200 with a Last.fm error payload.
+        rate_limit (float): Requests per second served before 429s (0 disables).
+        total (int): Chart length, which determines the number of pages.
+        images (int): Image entries per record, to scale payload size.
+        port (int): Port to bind on localhost; 0 picks a free one.
+        seed (int): Seed for reproducible jitter and failures.
+    """
+
+    def __init__(
+            self,
+            latency: float = 0.05,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            api_error_rate: float = 0.0,
+            rate_limit: float = 0.0,
+            total: int = 10000,
+            images: int = len(IMAGE_SIZES),
+            port: int = 0,
+            host: str = "127.0.0.1",
+            seed: Optional[int] = None
+    ):
+        self._server = _Server(
+            host, port, latency, jitter, error_rate, api_error_rate, rate_limit, total, images, seed
+        )
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/2.0/"
+
+    @property
+    def stats(self) -> Counter:
+        return self._server.stats
+
+    @property
+    def requests(self) -> int:
+        return self._server.stats["requests"]
+
+    def start(self) -> "MockLastfmServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "MockLastfmServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# CLI entry point
+def main(
+        port: int = typer.Option(
+            8765,
+            "--port",
+            "-p",
+            help="Port to listen on"
+        ),
+        host: str = typer.Option(
+            "127.0.0.1",
+            "--host",
+            help="Interface to bind"
+        ),
+        latency: float = typer.Option(
+            0.05,
+            "--latency",
+            help="Response latency in seconds"
+        ),
+        jitter: float = typer.Option(
+            0.0,
+            "--jitter",
+            help="Uniform +/- latency jitter in seconds"
+        ),
+        error_rate: float = typer.Option(
+            0.0,
+            "--error-rate",
+            help="Fraction of requests failing with a 5xx status"
+        ),
+        api_error_rate: float = typer.Option(
+            0.0,
+            "--api-error-rate",
+            help="Fraction of requests answered with a Last.fm error payload"
+        ),
+        rate_limit: float = typer.Option(
+            0.0,
+            "--rate-limit",
+            "-r",
+            help="Requests per second before answering 429 (0 disables)"
+        ),
+        total: int = typer.Option(
+            10000,
+            "--total",
+            help="Entries per chart, which sets the number of pages"
+        ),
+        images: int = typer.Option(
+            len(IMAGE_SIZES),
+            "--images",
+            help="Image entries per record, to scale payload size"
+        ),
+):
+    server = MockLastfmServer(
+        latency, jitter, error_rate, api_error_rate, rate_limit, total, images, port=port, host=host
+    ).start()
+    typer.secho(f"Mock Last.fm API listening on {server.url}", fg=typer.colors.BRIGHT_GREEN)
+    typer.echo(f"Use it with: LASTFM_BASE_URL={server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        typer.echo(f"Served {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,175 @@
+"""
+synthetic.py
+Generates Last.fm-shaped chart payloads and raw corpora of arbitrary size
+for benchmarks, mirroring the structure of geo.gettopartists / geo.gettoptracks
+responses (including the image arrays the transforms drop).
+"""
+
+import json
+import math
+import random
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from src.config import COUNTRIES
+
+IMAGE_SIZES = ["small", "medium", "large", "extralarge"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "tse", "vu", "no", "zel", "an", "dri", "po", "sha", "el", "tor", "yu", "ben"]
+
+# Distinct artists; track artists are drawn from the same pool so entities overlap
+ARTIST_VOCABULARY = 5000
+
+
+def _name(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(SYLLABLES) + rng.choice(SYLLABLES) for _ in range(words)).title()
+
+
+def _mbid(n: int, group: int) -> str:
+    return f"{n:08x}-{group:04x}-4000-8000-{n:012x}"
+
+
+def _images(seed: int, count: int = len(IMAGE_SIZES)) -> List[dict]:
+    sizes = [IMAGE_SIZES[i % len(IMAGE_SIZES)] for i in range(count)]
+    return [{"#text": f"https://lastfm.freetls.fastly.net/i/u/{size}/{seed:032x}.png", "size": size} for size in sizes]
+
+
+def _url(*names: str) -> str:
+    return "https://www.last.fm/music/" + "/_/".join(n.replace(" ", "+") for n in names)
+
+
+def artist_record(
+        rng: random.Random,
+        rank: int,
+        images: int = len(IMAGE_SIZES)
+) -> dict:
+    n = rng.randrange(ARTIST_VOCABULARY)
+    artist = _name(random.Random(n), 2)
+    return {
+        "name": artist,
+        "listeners": str(rng.randint(1_000, 2_000_000)),
+        "mbid": _mbid(n, 0) if n % 5 else "",
+        "url": _url(artist),
+        "streamable": "0",
+        "image": _images(n, images),
+        "@attr": {"rank": str(rank)},
+    }
+
+
+def track_record(
+        rng: random.Random,
+        rank: int,
+        vocabulary: int = 20000,
+        images: int = len(IMAGE_SIZES)
+) -> dict:
+    n = rng.randrange(vocabulary)
+    names = random.Random(n)
+    a = n % ARTIST_VOCABULARY
+    track, artist = _name(names, 3), _name(random.Random(a), 2)
+    return {
+        "name": track,
+        "duration": str(names.randint(90, 400)),
+        "listeners": str(rng.randint(100, 500_000)),
+        "mbid": _mbid(n, 1) if n % 3 else "",
+        "url": _url(artist, track),
+        "streamable": {"#text": "0", "fulltrack": "0"},
+        "artist": {"name": artist, "mbid": _mbid(a, 0) if a % 5 else "", "url": _url(artist)},
+        "image": _images(n, images),
+        "@attr": {"rank": str(rank)},
+    }
+
+
+def chart_payload(
+        kind: str,
+        country: str,
+        limit: int = 50,
+        page: int = 1,
+        total: int = 10000,
+        seed: Optional[int] = None,
+        images: int = len(IMAGE_SIZES)
+) -> dict:
+    """
+    One page of a geo chart response. Track ranks are 0-based and artist
+    ranks 1-based, as returned by Last.fm. `images` sets the length of each
+    record's image array, the bulk of a real payload.
+    """
+    rng = random.Random(seed if seed is not None else zlib.crc32(f"{kind}|{country}|{page}".encode()))
+    start = (page - 1) * limit
+    count = max(0, min(limit, total - start))
+    attr = {
+        "country": country, "page": str(page), "perPage": str(limit),
+        "totalPages": str(math.ceil(total / limit)), "total": str(total),
+    }
+    if kind == "artists":
+        records = [artist_record(rng, start + i + 1, images) for i in range(count)]
+        return {"topartists": {"artist": records, "@attr": attr}}
+    records = [track_record(rng, start + i, images=images) for i in range(count)]
+    return {"tracks": {"track": records, "@attr": attr}}
+
+
+def entity_payload(
+        method: str,
+        artist: str,
+        track: Optional[str] = None,
+        images: int = len(IMAGE_SIZES)
+) -> dict:
+    """
+    Response of artist.getInfo, artist.getTopTags or track.getInfo for an
+    entity, deterministic in its names.
+    """
+    seed = zlib.crc32(f"{artist}|{track or ''}".encode())
+    rng = random.Random(seed)
+    tags = [{"name": _name(rng, 1).lower(), "url": _url(artist)} for _ in range(5)]
+    if method == "artist.gettoptags":
+        counts = sorted((rng.randint(1, 100) for _ in tags), reverse=True)
+        return {"toptags": {"tag": [{**t, "count": c} for t, c in zip(tags, counts)], "@attr": {"artist": artist}}}
+    stats = {"listeners": str(rng.randint(1_000, 2_000_000)), "playcount": str(rng.randint(10_000, 90_000_000))}
+    if method == "track.getinfo":
+        return {"track": {
+            "name": track, "mbid": "", "url": _url(artist, track), "duration": str(rng.randint(90, 400) * 1000),
+            "streamable": {"#text": "0", "fulltrack": "0"}, **stats,
+            "artist": {"name": artist, "mbid": "", "url": _url(artist)},
+            "toptags": {"tag": tags},
+        }}
+    return {"artist": {
+        "name": artist, "mbid": "", "url": _url(artist), "image": _images(seed, images), "streamable": "0",
+        "ontour": "0", "stats": stats, "similar": {"artist": []}, "tags": {"tag": tags},
+        "bio": {"summary": f"{artist} is a synthetic artist.", "content": ""},
+    }}
+
+
+def write_corpus(
+        root: Path,
+        kind: str,
+        records: int,
+        records_per_file: int = 50,
+        countries: List[str] = COUNTRIES,
+        days: int = 30,
+        start: date = date(2025, 1, 1),
+        seed: int = 0
+) -> List[Path]:
+    """
+    Write `records` chart records of `kind` as raw JSON files under root/<kind>,
+    spread round-robin over countries and days. Files beyond one per
+    country-day get later fetch times, like repeated pulls.
+
+    :return: The written file paths.
+    """
+    folder = Path(root) / kind
+    folder.mkdir(parents=True, exist_ok=True)
+    n_files = math.ceil(records / records_per_file)
+    written = []
+    for i in range(n_files):
+        country = countries[i % len(countries)]
+        day = start + timedelta(days=(i // len(countries)) % days)
+        pull = i // (len(countries) * days)
+        limit = min(records_per_file, records - i * records_per_file)
+        payload = chart_payload(kind, country, limit=limit, seed=seed + i)
+        path = folder / (
+            f"{country.lower().replace(' ', '_')}_{day:%Y-%m-%d}_"
+            f"{pull // 3600 % 24:02d}-{pull // 60 % 60:02d}-{pull % 60:02d}.json"
+        )
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        written.append(path)
+    return written
@@ -0,0 +1,171 @@
+"""
+cli.py
+Single `music-warehouse` entry point for the pipeline commands.
+
+Subcommands are registered by dotted path and only imported when they are
+actually invoked, so `--help`, command listing and argument errors never load
+pandas, pyarrow, requests or APScheduler. Each subcommand is the existing
+module's `main`, unchanged.
+
+Usage:
+    python -m src --help
+    python -m src ingest --limit 50
+    python -m src transform artists --incremental
+    python -m src compact --retention 0
+    python -m src build gold
+    python -m src bench imports
+"""
+
+import importlib
+from typing import Dict, NamedTuple, Optional, Union
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+class LazyCommand(NamedTuple):
+    target: str  # "package.module:function"
+    help: str
+
+
+class LazyCommands(NamedTuple):
+    commands: Dict[str, Union[LazyCommand, "LazyCommands"]]
+    help: str
+
+
+COMMANDS: Dict[str, Union[LazyCommand, LazyCommands]] = {
+    "ingest": LazyCommand(
+        "src.clients.lastfm_client:main",
+        "Download the geo charts for every configured country into the raw layer."
+    ),
+    "enrich": LazyCommand(
+        "src.lastfm_fetch.enrichment:main",
+        "Fetch artist and track metadata for the entities in new raw charts."
+    ),
+    "transform": LazyCommands({
+        "all": LazyCommand(
+            "src.transform_data.engine:main",
+            "Transform every chart type in one pass over the raw directory."
+        ),
+        "artists": LazyCommand(
+            "src.transform_data.transform_artists:main",
+            "Transform raw artist charts into the silver dataset."
+        ),
+        "tracks": LazyCommand(
+            "src.transform_data.transform_tracks:main",
+            "Transform raw track charts into the silver dataset."
+        ),
+    }, "Transform raw JSON charts into silver datasets."),
+    "compact": LazyCommand(
+        "src.transform_data.compaction:main",
+        "Merge small silver files and retire superseded snapshots."
+    ),
+    "build": LazyCommands({
+        "gold": LazyCommand(
+            "src.gold.build_gold:main",
+            "Build the DuckDB gold warehouse from the silver datasets."
+        ),
+        "rank-matrix": LazyCommand(
+            "src.analytics.rank_matrix:main",
+            "Build the entity x country x date rank matrix."
+        ),
+    }, "Build derived datasets from the silver layer."),
+    "schedule": LazyCommand(
+        "src.utils.schedular:main",
+        "Run the full pipeline on a cron schedule, or once with --once."
+    ),
+    "bench": LazyCommands({
+        "parse": LazyCommand(
+            "src.benchmarks.bench_parse:main",
+            "Compare the pandas and fast parse engines on the raw files."
+        ),
+        "pipeline": LazyCommand(
+            "src.benchmarks.bench_pipeline:main",
+            "Benchmark ingestion and transform stages on synthetic corpora."
+        ),
+        "memory": LazyCommand(
+            "src.benchmarks.bench_memory:main",
+            "Compare parsed and compact chart frame memory footprints."
+        ),
+        "imports": LazyCommand(
+            "src.benchmarks.bench_imports:main",
+            "Time CLI start-up and check heavy modules stay unloaded."
+        ),
+        "mock-server": LazyCommand(
+            "src.benchmarks.mock_server:main",
+            "Serve a local stand-in for the Last.fm API."
+        ),
+    }, "Performance benchmarks."),
+}
+
+
+def load_command(name: str, entry: LazyCommand) -> TyperCommand:
+    """
+    Import the entry's function and wrap it as a click command.
+    """
+    module_name, attr = entry.target.split(":")
+    func = getattr(importlib.import_module(module_name), attr)
+    app = typer.Typer(add_completion=False, rich_markup_mode=None)
+    app.command(name=name, help=entry.help)(func)
+    return typer.main.get_command(app)
+
+
+class LazyGroup(TyperGroup):
+    """
+    Group whose subcommands come from a registry of dotted paths.
+
+    Listing and help only need the registry's help text, so `get_command`
+    returns lightweight placeholders; the real command is imported in
+    `resolve_command`, i.e. only once it has been picked to run.
+    """
+
+    def __init__(self, *, lazy_commands: Optional[Dict[str, Union[LazyCommand, LazyCommands]]] = None, **attrs):
+        super().__init__(**attrs)
+        self.lazy_commands = COMMANDS if lazy_commands is None else lazy_commands
+
+    def list_commands(self, ctx):
+        return super().list_commands(ctx) + [n for n in self.lazy_commands if n not in self.commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        entry = self.lazy_commands.get(cmd_name)
+        if entry is None:
+            return None
+        if isinstance(entry, LazyCommands):
+            return LazyGroup(
+                name=cmd_name, lazy_commands=entry.commands, help=entry.help, no_args_is_help=True,
+                rich_markup_mode=None
+            )
+        return TyperCommand(name=cmd_name, help=entry.help, rich_markup_mode=None)
+
+    def resolve_command(self, ctx, args):
+        cmd_name, cmd, args = super().resolve_command(ctx, args)
+        entry = self.lazy_commands.get(cmd_name)
+        if isinstance(entry, LazyCommand) and cmd_name not in self.commands:
+            cmd = load_command(cmd_name, entry)
+        return cmd_name, cmd, args
+
+
+app = typer.Typer(
+    name="music-warehouse",
+    cls=LazyGroup,
+    no_args_is_help=True,
+    add_completion=False,
+    # plain click formatting: rendering help through rich alone costs ~100 ms of imports
+    rich_markup_mode=None,
+    help="Last.fm chart warehouse: ingest, transform, build and benchmark."
+)
+
+
+@app.callback()
+def callback():
+    pass
+
+
+def main():
+    app(prog_name="music-warehouse")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,9 @@
-from .lastfm_client import main as lastfm_main
-__all__ = ["lastfm_main"]
\ No newline at end of file
+__all__ = ["lastfm_main"]
+
+
+def __getattr__(name):
+    # resolved lazily so `import src.clients` does not load requests and the fetch stack
+    if name == "lastfm_main":
+        from .lastfm_client import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,58 +4,145 @@ High-level client for orchestrating Last.fm geo data pulls.
 Uses pull_geo.py utilities to fetch top artists and tracks by country.
 Forms the ingestion (Extract) step of the ETL pipeline.
 """
-import time
 import typer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from src.config import DATA_DIR, COUNTRIES
-from src.lastfm_fetch import main as pull_geo_main
+from pathlib import Path
+from typing import Optional
+from src.config import API_KEY, BASE_URL, DATA_DIR, COUNTRIES, MAX_CONCURRENCY, RATE_LIMIT, RAW_FORMAT, RAW_STRIP_IMAGES
+from src.lastfm_fetch import IngestionManifest, LastfmHttpClient, ResponseCache, pull_chart
+from src.utils.metrics import get_metrics, write_run_report
+from src.utils.rate_limiter import TokenBucket
 
 app = typer.Typer()
 
+CHART_TYPES = ["artists", "tracks"]
+
 class LastfmClient:
     """
     A modular client for fetching Last.fm top artists and tracks
     for multiple countries.
+
+    Requests run on a bounded thread pool of `concurrency` workers and share
+    one pooled HTTP client and token bucket, so connections are reused and the
+    whole run never exceeds `rate_limit` requests per second no matter how
+    many countries are configured.
+
+    With a manifest, charts identical to the last saved payload are not
+    rewritten and the run is recorded as a no-op when nothing changed and
+    every chart was fetched.
+
+    `base_url`, `cache`, `data_dir` and `api_key` point a run at another API
+    endpoint, response cache, raw directory and key (e.g. a local mock server).
     """
     def __init__(
             self,
             countries: list = COUNTRIES,
             limit: int = 50,
-            delay: float = 1.5,
+            top: Optional[int] = None,
+            concurrency: int = MAX_CONCURRENCY,
+            rate_limit: float = RATE_LIMIT,
+            manifest: Optional[IngestionManifest] = None,
+            raw_format: str = RAW_FORMAT,
+            strip_images: bool = RAW_STRIP_IMAGES,
+            base_url: str = BASE_URL,
+            cache: Optional[ResponseCache] = None,
+            data_dir: Optional[Path] = None,
+            api_key: Optional[str] = None,
     ):
         self.countries = countries
         self.limit = limit
-        self.delay = delay
+        self.top = top
+        self.concurrency = concurrency
+        self.rate_limiter = TokenBucket(rate=rate_limit)
+        self.http_client = LastfmHttpClient(
+            base_url=base_url, pool_size=concurrency, rate_limiter=self.rate_limiter
+        )
+        self.manifest = manifest
+        self.raw_format = raw_format
+        self.strip_images = strip_images
+        self.cache = cache
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.api_key = api_key or API_KEY
 
         if not self.countries:
             raise ValueError("No countries provided for data fetching.")
+        if self.concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
 
         typer.echo(f"Loaded {len(self.countries)} countries for data fetching.")
 
+    def fetch_chart(
+            self,
+            country: str,
+            chart_type: str
+    ):
+        """
+        Fetch and save a single (country, chart_type) chart using the shared HTTP client.
+        """
+        typer.echo(f"Fetching top {chart_type} for {country}...")
+        return pull_chart(
+            country=country,
+            limit=self.limit,
+            chart_type=chart_type,
+            page=1,
+            client=self.http_client,
+            top=self.top,
+            manifest=self.manifest,
+            raw_format=self.raw_format,
+            strip_images=self.strip_images,
+            cache=self.cache,
+            data_dir=self.data_dir,
+            api_key=self.api_key
+        )
+
     def run(self):
         """
         Run ingestion for all countries (artists + tracks).
+        :return: List of (country, chart_type, error) tuples for failed charts.
         """
-        start_time = datetime.now()
-        print(f"Starting Last.fm data ingestion at {start_time:%Y-%m-%d %H:%M:%S}...")
+        if not self.api_key:
+            typer.secho("Error: LASTFM_API_KEY is not set in environment variables.", fg=typer.colors.RED)
+            raise typer.Exit(1)
 
-        for country in self.countries:
-            for chart_type in ["artists", "tracks"]:
+        start_time = datetime.now()
+        print(f"Starting Last.fm data ingestion at {start_time:%Y-%m-%d %H:%M:%S} "
+              f"({self.concurrency} workers, {self.rate_limiter.rate:g} req/s)...")
+
+        jobs = [(country, chart_type) for country in self.countries for chart_type in CHART_TYPES]
+        failures = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self.fetch_chart, country, chart_type): (country, chart_type)
+                for country, chart_type in jobs
+            }
+            for future in as_completed(futures):
+                country, chart_type = futures[future]
                 try:
-                    typer.echo(f"Fetching top {chart_type} for {country}...")
-                    pull_geo_main(
-                        country=country,
-                        limit=self.limit,
-                        chart_type=chart_type,
-                        page=1
-                    )
-                    time.sleep(self.delay)
+                    future.result()
                 except Exception as e:
                     typer.echo(f"Error fetching {chart_type} for {country}: {e}")
+                    failures.append((country, chart_type, e))
 
         end_time = datetime.now()
-        print(f"Finished ingestion at {end_time:%Y-%m-%d %H:%M:%S}.")
-        print(f"Data saved under {DATA_DIR}/artists and {DATA_DIR}/tracks.")
+        elapsed = (end_time - start_time).total_seconds()
+        print(f"Finished ingestion at {end_time:%Y-%m-%d %H:%M:%S} "
+              f"({len(jobs) - len(failures)}/{len(jobs)} charts in {elapsed:.1f}s).")
+        print(f"Data saved under {self.data_dir}/artists and {self.data_dir}/tracks.")
+
+        if self.manifest is not None:
+            run = self.manifest.finish_run(failures=len(failures))
+            if run["noop"]:
+                print("No chart changed since the last run; downstream transforms can be skipped.")
+            else:
+                print(f"{len(run['changed_files'])} charts changed, {run['unchanged_charts']} unchanged, "
+                      f"{run['failed_charts']} failed.")
+
+        get_metrics().count("failed_charts", len(failures))
+        # ingestion is the first stage of a pipeline run, whose later stages keep recording into the same run
+        print(f"Run report → {write_run_report('ingest', reset=False)}")
+        return failures
 
 # CLI entry point
 def main(
@@ -63,35 +150,58 @@ def main(
             50,
             "--limit",
             "-l",
-            help="Limit the number of top artists to fetch per country."
+            help="Limit the number of top artists to fetch per country (per page with --top)."
         ),
 
-        delay: float = typer.Option(
-            1.5,
-            "--delay",
-            "-d",
-            help="Delay in seconds between API requests to avoid rate limiting."
+        top: int = typer.Option(
+            0,
+            "--top",
+            "-n",
+            help="Fetch the top N entries per chart across multiple pages (0 fetches one page)."
+        ),
+
+        concurrency: int = typer.Option(
+            MAX_CONCURRENCY,
+            "--concurrency",
+            "-w",
+            help="Number of charts to fetch in parallel (1 fetches serially)."
+        ),
+
+        rate_limit: float = typer.Option(
+            RATE_LIMIT,
+            "--rate-limit",
+            "-r",
+            help="Maximum API requests per second across all workers."
+        ),
+
+        raw_format: str = typer.Option(
+            RAW_FORMAT,
+            "--raw-format",
+            help="Raw file format: 'json', 'ndjson.gz' or 'ndjson.zst'."
+        ),
+
+        strip_images: bool = typer.Option(
+            RAW_STRIP_IMAGES,
+            "--strip-images/--keep-images",
+            help="Drop the per-record image URL arrays from raw files."
+        ),
+
+        skip_unchanged: bool = typer.Option(
+            True,
+            "--skip-unchanged/--always-write",
+            help="Skip writing charts whose content matches the last saved payload."
         ),
 ):
     client = LastfmClient(
         limit=limit,
-        delay=delay
+        top=top or None,
+        concurrency=concurrency,
+        rate_limit=rate_limit,
+        manifest=IngestionManifest() if skip_unchanged else None,
+        raw_format=raw_format,
+        strip_images=strip_images
     )
     client.run()
 
 if __name__ == "__main__":
     typer.run(main)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
@@ -4,8 +4,24 @@
 Expose common configuration symbols for easy access.
 """
 
-from .lastfm_config import API_KEY, BASE_URL, DATA_DIR
+from .lastfm_config import (
+    API_KEY, BASE_URL, LASTFM_API_URL, DATA_DIR, MAX_CONCURRENCY, RATE_LIMIT, CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES,
+    CACHE_PATH, CACHE_TTL, CACHE_MAX_BYTES, ENRICH_STORE_PATH, ENRICH_TTL, RAW_FORMAT, RAW_STRIP_IMAGES
+)
+from .metrics_config import METRICS_DIR, PROMETHEUS_TEXTFILE_DIR
+from .pipeline_config import (
+    PIPELINE_CRON, PIPELINE_TIMEZONE, PIPELINE_MISFIRE_GRACE, PIPELINE_STATE_PATH, PIPELINE_LOCK_PATH
+)
 from .settings import COUNTRIES
-from .transform_config import ARTIST_JSON_PATH, OUTPUT_DIR, TRACKS_JSON_PATH
+from .transform_config import (
+    RAW_GEO_PATH, ARTIST_JSON_PATH, OUTPUT_DIR, GOLD_DB_PATH, RANK_MATRIX_DIR, TRACKS_JSON_PATH, TRANSFORM_WORKERS, TRANSFORM_ENGINE, SILVER_LAYOUT,
+    SILVER_COMPRESSION, ROW_GROUP_SIZE, STREAM_BATCH_SIZE, VALIDATION_MAX_EMPTY_MBID_RATE, COMPACT_TARGET_ROWS,
+    COMPACT_RETENTION, SILVER_CACHE_MAX_BYTES
+)
 
-__all__ = ["API_KEY", "BASE_URL", "DATA_DIR", "COUNTRIES", "ARTIST_JSON_PATH", "OUTPUT_DIR", "TRACKS_JSON_PATH"]
\ No newline at end of file
+__all__ = ["API_KEY", "BASE_URL", "LASTFM_API_URL", "DATA_DIR", "MAX_CONCURRENCY", "RATE_LIMIT", "CONNECT_TIMEOUT", "READ_TIMEOUT",
+           "MAX_RETRIES", "CACHE_PATH", "CACHE_TTL", "CACHE_MAX_BYTES", "ENRICH_STORE_PATH", "ENRICH_TTL", "RAW_FORMAT", "RAW_STRIP_IMAGES", "COUNTRIES", "RAW_GEO_PATH", "ARTIST_JSON_PATH",
+           "OUTPUT_DIR", "GOLD_DB_PATH", "RANK_MATRIX_DIR", "TRACKS_JSON_PATH", "TRANSFORM_WORKERS", "TRANSFORM_ENGINE", "SILVER_LAYOUT",
+           "SILVER_COMPRESSION", "ROW_GROUP_SIZE", "STREAM_BATCH_SIZE", "VALIDATION_MAX_EMPTY_MBID_RATE", "COMPACT_TARGET_ROWS", "COMPACT_RETENTION", "SILVER_CACHE_MAX_BYTES",
+           "METRICS_DIR", "PROMETHEUS_TEXTFILE_DIR",
+           "PIPELINE_CRON", "PIPELINE_TIMEZONE", "PIPELINE_MISFIRE_GRACE", "PIPELINE_STATE_PATH", "PIPELINE_LOCK_PATH"]
@@ -5,5 +5,29 @@ from dotenv import load_dotenv
 load_dotenv()
 
 API_KEY = os.getenv('LASTFM_API_KEY')
-BASE_URL = 'https://ws.audioscrobbler.com/2.0/'
+LASTFM_API_URL = 'https://ws.audioscrobbler.com/2.0/'
+# Point at a local stand-in (python -m src.benchmarks.mock_server) for load testing
+BASE_URL = os.getenv('LASTFM_BASE_URL', LASTFM_API_URL)
 DATA_DIR = Path(__file__).parent.parent.parent / 'data' / 'raw' / 'geo'
+
+# Global request budget shared by all concurrent ingestion workers
+RATE_LIMIT = float(os.getenv('LASTFM_RATE_LIMIT', '5'))
+MAX_CONCURRENCY = int(os.getenv('LASTFM_CONCURRENCY', '4'))
+
+# HTTP timeouts (seconds) and retry budget for each API request
+CONNECT_TIMEOUT = float(os.getenv('LASTFM_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('LASTFM_READ_TIMEOUT', '30'))
+MAX_RETRIES = int(os.getenv('LASTFM_MAX_RETRIES', '4'))
+
+# Local response cache; set LASTFM_CACHE_TTL=0 to disable
+CACHE_PATH = Path(__file__).parent.parent.parent / 'data' / 'cache' / 'lastfm_responses.sqlite'
+CACHE_TTL = float(os.getenv('LASTFM_CACHE_TTL', str(6 * 60 * 60)))
+CACHE_MAX_BYTES = int(os.getenv('LASTFM_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# Artist/track metadata from the enrichment stage; entries are refetched once older than the TTL
+ENRICH_STORE_PATH = Path(__file__).parent.parent.parent / 'data' / 'enrichment' / 'lastfm_metadata.sqlite'
+ENRICH_TTL = float(os.getenv('LASTFM_ENRICH_TTL', str(7 * 24 * 60 * 60)))
+
+# Raw landing format: 'json' (pretty-printed), 'ndjson.gz' or 'ndjson.zst'
+RAW_FORMAT = os.getenv('RAW_FORMAT', 'json')
+RAW_STRIP_IMAGES = os.getenv('RAW_STRIP_IMAGES', '0') == '1'
@@ -0,0 +1,8 @@
+import os
+from pathlib import Path
+
+# JSON run reports written at the end of ingestion and transform runs
+METRICS_DIR = Path(os.getenv('METRICS_DIR', Path(__file__).parent.parent.parent / 'data' / 'metrics'))
+
+# Optional Prometheus node_exporter textfile directory; unset disables the export
+PROMETHEUS_TEXTFILE_DIR = os.getenv('PROMETHEUS_TEXTFILE_DIR') or None
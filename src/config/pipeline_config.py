@@ -0,0 +1,13 @@
+import os
+from pathlib import Path
+
+# Cron expression (minute hour day month weekday) for the scheduled pipeline run
+PIPELINE_CRON = os.getenv('PIPELINE_CRON', '0 0 * * *')
+PIPELINE_TIMEZONE = os.getenv('PIPELINE_TIMEZONE', 'UTC')
+
+# A scheduled run missed by more than this many seconds is still started (coalesced into one)
+PIPELINE_MISFIRE_GRACE = int(os.getenv('PIPELINE_MISFIRE_GRACE', str(6 * 60 * 60)))
+
+# Last-run state used for catch-up after downtime, and the cross-process run lock
+PIPELINE_STATE_PATH = Path(__file__).parent.parent.parent / 'data' / '_pipeline_state.json'
+PIPELINE_LOCK_PATH = Path(__file__).parent.parent.parent / 'data' / '_pipeline.lock'
@@ -1,5 +1,35 @@
+import os
 from pathlib import Path
 
-ARTIST_JSON_PATH = Path('data/raw/geo/artists')
-TRACKS_JSON_PATH = Path('data/raw/geo/tracks')
-OUTPUT_DIR = Path('data')
\ No newline at end of file
+# Raw charts are stored in one directory per chart type under RAW_GEO_PATH
+RAW_GEO_PATH = Path('data/raw/geo')
+ARTIST_JSON_PATH = RAW_GEO_PATH / 'artists'
+TRACKS_JSON_PATH = RAW_GEO_PATH / 'tracks'
+OUTPUT_DIR = Path('data')
+GOLD_DB_PATH = Path('data/gold/music_warehouse.duckdb')
+RANK_MATRIX_DIR = Path('data/gold/rank_matrix')
+
+# Raw file parser: 'fast' (field extraction) or 'pandas' (pd.json_normalize)
+TRANSFORM_ENGINE = os.getenv('TRANSFORM_ENGINE', 'fast')
+
+# Processes used to parse raw files; 0 uses every CPU core
+TRANSFORM_WORKERS = int(os.getenv('TRANSFORM_WORKERS', '1'))
+
+# Silver output: 'flat' (one file per run) or 'partitioned' (Hive chart_date/chart_country dataset)
+SILVER_LAYOUT = os.getenv('SILVER_LAYOUT', 'flat')
+SILVER_COMPRESSION = os.getenv('SILVER_COMPRESSION', 'zstd')
+ROW_GROUP_SIZE = int(os.getenv('SILVER_ROW_GROUP_SIZE', str(128 * 1024)))
+
+# Records per batch when streaming raw files into parquet (--streaming)
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '10000'))
+
+# Share of rows without an MBID above which validation warns
+VALIDATION_MAX_EMPTY_MBID_RATE = float(os.getenv('VALIDATION_MAX_EMPTY_MBID_RATE', '0.5'))
+
+# Silver compaction: rows per compacted flat file, and seconds a superseded
+# file is kept for readers that listed it before it is deleted
+COMPACT_TARGET_ROWS = int(os.getenv('COMPACT_TARGET_ROWS', '1000000'))
+COMPACT_RETENTION = float(os.getenv('COMPACT_RETENTION', str(60 * 60)))
+
+# In-process cache of decoded silver files used by src.analytics.silver_reader
+SILVER_CACHE_MAX_BYTES = int(os.getenv('SILVER_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
@@ -0,0 +1,5 @@
+"""
+src/gold/__init__.py
+
+Gold layer: an embedded DuckDB warehouse built from the silver datasets.
+"""
@@ -0,0 +1,333 @@
+"""
+Build the gold layer from silver parquet into an embedded DuckDB file.
+
+Silver artist/track rows are loaded into `silver_artists` / `silver_tracks`
+(deduplicated on chart_country, chart_date, rank) and precomputed aggregate
+tables are kept up to date:
+
+    artist_rank_deltas / track_rank_deltas   rank change vs. the previous chart of the same country
+    artist_presence                          countries each artist charts in, per day
+    track_artist_rollup                      per artist track counts/listeners, per country-day
+
+Dimension tables with surrogate keys and key-only fact tables are
+maintained alongside them (see src/gold/dimensions.py).
+
+Only silver files not loaded before are read, and only the affected
+country-days are recomputed, so refreshes cost O(new data).
+
+Usage:
+    python -m src.gold.build_gold
+"""
+
+import time
+from pathlib import Path
+from typing import List
+
+import duckdb
+import typer
+
+from src.config import GOLD_DB_PATH, OUTPUT_DIR
+from src.gold.dimensions import refresh_model
+from src.transform_data.silver_writer import silver_files
+
+app = typer.Typer()
+
+KINDS = ("artists", "tracks")
+
+# Silver columns loaded per chart type; chart_date is normalised to DATE
+SILVER_COLUMNS = {
+    "artists": ["rank", "artist_name", "artist_mbid", "artist_url", "artist_listeners"],
+    "tracks": ["rank", "track_name", "track_mbid", "track_url", "track_listeners", "track_duration",
+               "artist_name", "artist_mbid", "artist_url"],
+}
+
+# Entity columns identifying a chart entry when computing rank deltas
+ENTITY_COLUMNS = {
+    "artists": ["artist_name"],
+    "tracks": ["track_name", "artist_name"],
+}
+
+SILVER_DDL = {
+    "artists": """
+        CREATE TABLE IF NOT EXISTS silver_artists (
+            chart_country VARCHAR, chart_date DATE, rank INTEGER,
+            artist_name VARCHAR, artist_mbid VARCHAR, artist_url VARCHAR, artist_listeners BIGINT,
+            load_time TIMESTAMP
+        )
+    """,
+    "tracks": """
+        CREATE TABLE IF NOT EXISTS silver_tracks (
+            chart_country VARCHAR, chart_date DATE, rank INTEGER,
+            track_name VARCHAR, track_mbid VARCHAR, track_url VARCHAR, track_listeners BIGINT,
+            track_duration VARCHAR, artist_name VARCHAR, artist_mbid VARCHAR, artist_url VARCHAR,
+            load_time TIMESTAMP
+        )
+    """,
+}
+
+
+def connect(db_path: Path = GOLD_DB_PATH) -> duckdb.DuckDBPyConnection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(db_path))
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS _loaded_files (
+            kind VARCHAR, path VARCHAR, size BIGINT, mtime_ns BIGINT, loaded_at TIMESTAMP,
+            PRIMARY KEY (kind, path)
+        )
+    """)
+    for ddl in SILVER_DDL.values():
+        con.execute(ddl)
+    return con
+
+
+def new_silver_files(
+        con: duckdb.DuckDBPyConnection,
+        kind: str,
+        files: List[Path]
+) -> List[Path]:
+    loaded = {
+        path: (size, mtime_ns)
+        for path, size, mtime_ns in con.execute(
+            "SELECT path, size, mtime_ns FROM _loaded_files WHERE kind = ?", [kind]
+        ).fetchall()
+    }
+    new = []
+    for file in files:
+        stat = file.stat()
+        if loaded.get(str(file)) != (stat.st_size, stat.st_mtime_ns):
+            new.append(file)
+    return new
+
+
+def _read_silver_sql(
+        kind: str,
+        hive: bool
+) -> str:
+    """
+    SELECT over silver parquet files; the file list is bound to its `?` parameter.
+    """
+    columns = ", ".join(SILVER_COLUMNS[kind])
+    return f"""
+        SELECT CAST(chart_country AS VARCHAR) AS chart_country, CAST(chart_date AS DATE) AS chart_date,
+               {columns}, CAST(load_time AS TIMESTAMP) AS load_time
+        FROM read_parquet(?, union_by_name = true, hive_partitioning = {str(hive).lower()})
+    """
+
+
+def load_silver(
+        con: duckdb.DuckDBPyConnection,
+        kind: str,
+        files: List[Path],
+        output_dir: Path
+) -> int:
+    """
+    Upsert new silver files into silver_<kind> and record the affected
+    (chart_country, chart_date) pairs in the temp table _affected_<kind>.
+
+    A country-day present in the new files replaces the stored version of that day.
+
+    :return: Number of affected country-days.
+    """
+    partitioned_root = (Path(output_dir) / "silver" / "geo" / "partitioned").resolve()
+    flat = [f for f in files if partitioned_root not in f.resolve().parents]
+    partitioned = [f for f in files if partitioned_root in f.resolve().parents]
+
+    selects, file_lists = [], []
+    if flat:
+        selects.append(_read_silver_sql(kind, hive=False))
+        file_lists.append([f.as_posix() for f in flat])
+    if partitioned:
+        selects.append(_read_silver_sql(kind, hive=True))
+        file_lists.append([f.as_posix() for f in partitioned])
+
+    con.execute(f"CREATE OR REPLACE TEMP TABLE _staging_{kind} AS {' UNION ALL BY NAME '.join(selects)}", file_lists)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _affected_{kind} AS
+        SELECT DISTINCT chart_country, chart_date FROM _staging_{kind}
+    """)
+    con.execute(f"""
+        DELETE FROM silver_{kind} s USING _affected_{kind} a
+        WHERE s.chart_country = a.chart_country AND s.chart_date = a.chart_date
+    """)
+    columns = ", ".join(["chart_country", "chart_date"] + SILVER_COLUMNS[kind] + ["load_time"])
+    con.execute(f"""
+        INSERT INTO silver_{kind} ({columns})
+        SELECT {columns} FROM _staging_{kind}
+        QUALIFY row_number() OVER (PARTITION BY chart_country, chart_date, rank ORDER BY load_time DESC) = 1
+    """)
+    con.execute(f"DROP TABLE _staging_{kind}")
+
+    con.executemany(
+        "INSERT OR REPLACE INTO _loaded_files VALUES (?, ?, ?, ?, now())",
+        [[kind, str(f), f.stat().st_size, f.stat().st_mtime_ns] for f in files]
+    )
+    return con.execute(f"SELECT count(*) FROM _affected_{kind}").fetchone()[0]
+
+
+def refresh_rank_deltas(
+        con: duckdb.DuckDBPyConnection,
+        kind: str
+):
+    """
+    Recompute <entity>_rank_deltas for the affected country-days and the
+    next chart date of each affected country, whose previous chart may have changed.
+    """
+    entity = kind[:-1]
+    keys = ENTITY_COLUMNS[kind]
+    key_select = ", ".join(f"c.{k}" for k in keys)
+    key_join = " AND ".join(f"p.{k} = c.{k}" for k in keys)
+    key_ddl = ", ".join(f"{k} VARCHAR" for k in keys)
+
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {entity}_rank_deltas (
+            chart_country VARCHAR, chart_date DATE, {key_ddl}, rank INTEGER,
+            prev_chart_date DATE, prev_rank INTEGER, rank_delta INTEGER, is_new_entry BOOLEAN
+        )
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _chart_days_{kind} AS
+        SELECT chart_country, chart_date,
+               lag(chart_date) OVER (PARTITION BY chart_country ORDER BY chart_date) AS prev_chart_date,
+               lead(chart_date) OVER (PARTITION BY chart_country ORDER BY chart_date) AS next_chart_date
+        FROM (SELECT DISTINCT chart_country, chart_date FROM silver_{kind})
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _refresh_{kind} AS
+        SELECT chart_country, chart_date FROM _affected_{kind}
+        UNION
+        SELECT d.chart_country, d.next_chart_date FROM _chart_days_{kind} d
+        JOIN _affected_{kind} a USING (chart_country, chart_date)
+        WHERE d.next_chart_date IS NOT NULL
+    """)
+    con.execute(f"""
+        DELETE FROM {entity}_rank_deltas t USING _refresh_{kind} r
+        WHERE t.chart_country = r.chart_country AND t.chart_date = r.chart_date
+    """)
+    con.execute(f"""
+        INSERT INTO {entity}_rank_deltas
+        SELECT c.chart_country, c.chart_date, {key_select}, c.rank,
+               d.prev_chart_date, p.rank AS prev_rank,
+               p.rank - c.rank AS rank_delta,
+               p.rank IS NULL AS is_new_entry
+        FROM silver_{kind} c
+        JOIN _refresh_{kind} r USING (chart_country, chart_date)
+        JOIN _chart_days_{kind} d USING (chart_country, chart_date)
+        LEFT JOIN silver_{kind} p
+          ON p.chart_country = c.chart_country AND p.chart_date = d.prev_chart_date AND {key_join}
+    """)
+
+
+def refresh_artist_presence(con: duckdb.DuckDBPyConnection):
+    """
+    Recompute artist_presence for every chart date touched by new artist data.
+    """
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS artist_presence (
+            chart_date DATE, artist_name VARCHAR, n_countries INTEGER, countries VARCHAR[],
+            best_rank INTEGER, avg_rank DOUBLE, total_listeners BIGINT
+        )
+    """)
+    con.execute("CREATE OR REPLACE TEMP TABLE _presence_dates AS SELECT DISTINCT chart_date FROM _affected_artists")
+    con.execute("DELETE FROM artist_presence WHERE chart_date IN (SELECT chart_date FROM _presence_dates)")
+    con.execute("""
+        INSERT INTO artist_presence
+        SELECT chart_date, artist_name, count(DISTINCT chart_country), list(DISTINCT chart_country ORDER BY chart_country),
+               min(rank), avg(rank), sum(artist_listeners)
+        FROM silver_artists
+        WHERE chart_date IN (SELECT chart_date FROM _presence_dates)
+        GROUP BY chart_date, artist_name
+    """)
+
+
+def refresh_track_artist_rollup(con: duckdb.DuckDBPyConnection):
+    """
+    Recompute track_artist_rollup for the country-days touched by new track data.
+    """
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS track_artist_rollup (
+            chart_country VARCHAR, chart_date DATE, artist_name VARCHAR,
+            n_tracks INTEGER, best_track_rank INTEGER, total_track_listeners BIGINT
+        )
+    """)
+    con.execute("""
+        DELETE FROM track_artist_rollup t USING _affected_tracks a
+        WHERE t.chart_country = a.chart_country AND t.chart_date = a.chart_date
+    """)
+    con.execute("""
+        INSERT INTO track_artist_rollup
+        SELECT s.chart_country, s.chart_date, s.artist_name, count(*), min(s.rank), sum(s.track_listeners)
+        FROM silver_tracks s JOIN _affected_tracks a USING (chart_country, chart_date)
+        GROUP BY s.chart_country, s.chart_date, s.artist_name
+    """)
+
+
+def build_gold(
+        output_dir: Path = OUTPUT_DIR,
+        db_path: Path = GOLD_DB_PATH,
+        full_refresh: bool = False
+) -> dict:
+    """
+    Load new silver files and refresh the gold aggregates.
+    :return: {kind: number of affected country-days}
+    """
+    if full_refresh and Path(db_path).exists():
+        Path(db_path).unlink()
+
+    con = connect(db_path)
+    summary = {}
+    try:
+        for kind in KINDS:
+            files = new_silver_files(con, kind, silver_files(output_dir, kind))
+            if not files:
+                typer.echo(f"No new silver {kind} files.")
+                summary[kind] = 0
+                continue
+
+            started = time.perf_counter()
+            con.execute("BEGIN TRANSACTION")
+            affected = load_silver(con, kind, files, output_dir)
+            refresh_rank_deltas(con, kind)
+            if kind == "artists":
+                refresh_artist_presence(con)
+            else:
+                refresh_track_artist_rollup(con)
+            refresh_model(con, kind)
+            con.execute("COMMIT")
+
+            summary[kind] = affected
+            typer.echo(
+                f"Loaded {len(files)} silver {kind} files, refreshed {affected} country-days "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+    finally:
+        con.close()
+    return summary
+
+
+# CLI entry point
+def main(
+        output_dir: Path = typer.Option(
+            OUTPUT_DIR,
+            "--output-dir",
+            "-o",
+            help="Data directory containing silver/geo"
+        ),
+        db_path: Path = typer.Option(
+            GOLD_DB_PATH,
+            "--db",
+            help="DuckDB file to build the gold layer in"
+        ),
+        full_refresh: bool = typer.Option(
+            False,
+            "--full-refresh",
+            help="Rebuild the gold database from scratch"
+        ),
+):
+    build_gold(output_dir, db_path, full_refresh)
+    typer.secho(f"Gold layer up to date → {db_path}", fg=typer.colors.BRIGHT_GREEN)
+
+
+if __name__ == "__main__":
+    app.command()(main)
+    app()
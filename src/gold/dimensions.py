@@ -0,0 +1,248 @@
+"""
+Warehouse modeling for the gold layer: dimension tables with integer
+surrogate keys and key-only fact tables.
+
+    dim_country         country_key ↔ chart_country
+    dim_artist          artist_key  ↔ resolved artist identity
+    dim_track           track_key   ↔ resolved track identity (+ artist_key)
+    fact_artist_chart   chart_date, country_key, artist_key, rank, listeners
+    fact_track_chart    chart_date, country_key, track_key, artist_key, rank, listeners
+
+Identities are resolved by MusicBrainz id when one is present and otherwise
+by the normalized Last.fm URL (or name when there is no URL). Every id/URL
+ever seen for an entity is kept in an alias table, so a row that only has a
+URL still joins to the artist first seen with an mbid, and keys never change
+once assigned. Like the aggregates in build_gold, dimensions and facts are
+refreshed only for the country-days affected by new silver data.
+"""
+
+import duckdb
+
+# Alias tables map 'mbid:<id>' / 'url:<url>' / 'name:<name>' to a surrogate key
+DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS dim_country (
+        country_key SMALLINT PRIMARY KEY, chart_country VARCHAR UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dim_artist (
+        artist_key INTEGER PRIMARY KEY, artist_name VARCHAR, artist_mbid VARCHAR, artist_url VARCHAR,
+        first_seen DATE, last_seen DATE
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS artist_alias (alias VARCHAR PRIMARY KEY, artist_key INTEGER)",
+    """
+    CREATE TABLE IF NOT EXISTS dim_track (
+        track_key INTEGER PRIMARY KEY, track_name VARCHAR, track_mbid VARCHAR, track_url VARCHAR,
+        artist_key INTEGER, track_duration INTEGER, first_seen DATE, last_seen DATE
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS track_alias (alias VARCHAR PRIMARY KEY, track_key INTEGER)",
+    """
+    CREATE TABLE IF NOT EXISTS fact_artist_chart (
+        chart_date DATE, country_key SMALLINT, artist_key INTEGER, rank SMALLINT, listeners BIGINT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fact_track_chart (
+        chart_date DATE, country_key SMALLINT, track_key INTEGER, artist_key INTEGER, rank SMALLINT,
+        listeners BIGINT
+    )
+    """,
+]
+
+# Alias a silver row (table alias `t`) is looked up by: its own mbid, else URL, else name
+ARTIST_ALIAS = """coalesce('mbid:' || norm_text({t}.artist_mbid), 'url:' || norm_url({t}.artist_url),
+                'name:' || norm_text({t}.artist_name))"""
+TRACK_ALIAS = """coalesce('mbid:' || norm_text({t}.track_mbid), 'url:' || norm_url({t}.track_url),
+               'name:' || norm_text({t}.track_name) || ' - ' || coalesce(norm_text({t}.artist_name), ''))"""
+
+MACROS = [
+    "CREATE OR REPLACE TEMP MACRO norm_text(s) AS nullif(lower(trim(regexp_replace(s, '\\s+', ' ', 'g'))), '')",
+    "CREATE OR REPLACE TEMP MACRO norm_url(u) AS nullif(rtrim(lower(trim(u)), '/'), '')",
+]
+
+
+def ensure_tables(con: duckdb.DuckDBPyConnection):
+    for statement in DDL + MACROS:
+        con.execute(statement)
+
+
+def _affected_rows(kind: str) -> str:
+    return f"""
+        SELECT s.* FROM silver_{kind} s
+        JOIN _affected_{kind} a USING (chart_country, chart_date)
+    """
+
+
+def upsert_countries(
+        con: duckdb.DuckDBPyConnection,
+        kind: str
+):
+    con.execute(f"""
+        INSERT INTO dim_country
+        SELECT (SELECT coalesce(max(country_key), 0) FROM dim_country) + row_number() OVER (ORDER BY chart_country),
+               chart_country
+        FROM (SELECT DISTINCT chart_country FROM _affected_{kind})
+        WHERE chart_country NOT IN (SELECT chart_country FROM dim_country)
+    """)
+
+
+def _resolve(
+        con: duckdb.DuckDBPyConnection,
+        entity: str,
+        candidates_sql: str,
+        extra_columns: str,
+        extra_select: str
+):
+    """
+    Assign surrogate keys to candidate rows of `entity` ('artist' or 'track').
+
+    `candidates_sql` must yield mbid, url, name, chart_date and the display
+    columns. Rows are matched against known aliases (mbid first, then URL,
+    then name); unmatched rows become new entities, grouped by mbid when
+    present and by URL/name otherwise. The resolved keys are left in the
+    temp table _resolved_<entity>.
+    """
+    key = f"{entity}_key"
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _cand_{entity} AS
+        SELECT *,
+               -- borrow the mbid of another row with the same URL in this batch
+               coalesce(mbid, max(mbid) OVER (PARTITION BY url)) AS resolved_mbid
+        FROM ({candidates_sql})
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _resolved_{entity} AS
+        SELECT c.*, coalesce(m.{key}, u.{key}, n.{key}) AS {key},
+               coalesce('mbid:' || c.resolved_mbid, 'url:' || c.url, 'name:' || c.name) AS natural_key
+        FROM _cand_{entity} c
+        LEFT JOIN {entity}_alias m ON m.alias = 'mbid:' || c.resolved_mbid
+        LEFT JOIN {entity}_alias u ON u.alias = 'url:' || c.url
+        LEFT JOIN {entity}_alias n ON n.alias = 'name:' || c.name AND c.url IS NULL
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _new_{entity} AS
+        SELECT natural_key,
+               (SELECT coalesce(max({key}), 0) FROM dim_{entity}) + row_number() OVER (ORDER BY natural_key) AS {key}
+        FROM (SELECT DISTINCT natural_key FROM _resolved_{entity} WHERE {key} IS NULL)
+    """)
+    con.execute(f"""
+        UPDATE _resolved_{entity} r SET {key} = n.{key}
+        FROM _new_{entity} n WHERE r.{key} IS NULL AND r.natural_key = n.natural_key
+    """)
+    con.execute(f"""
+        INSERT INTO dim_{entity} ({key}, {extra_columns}, first_seen, last_seen)
+        SELECT {key}, {extra_select}, min(chart_date), max(chart_date)
+        FROM _resolved_{entity}
+        WHERE {key} IN (SELECT {key} FROM _new_{entity})
+        GROUP BY {key}
+    """)
+    con.execute(f"""
+        UPDATE dim_{entity} d SET
+            first_seen = least(d.first_seen, r.first_seen),
+            last_seen = greatest(d.last_seen, r.last_seen)
+        FROM (SELECT {key}, min(chart_date) AS first_seen, max(chart_date) AS last_seen
+              FROM _resolved_{entity} GROUP BY {key}) r
+        WHERE d.{key} = r.{key}
+    """)
+    con.execute(f"""
+        INSERT OR IGNORE INTO {entity}_alias
+        SELECT DISTINCT alias, {key} FROM (
+            SELECT 'mbid:' || resolved_mbid AS alias, {key} FROM _resolved_{entity} WHERE resolved_mbid IS NOT NULL
+            UNION ALL
+            SELECT 'url:' || url, {key} FROM _resolved_{entity} WHERE url IS NOT NULL
+            UNION ALL
+            SELECT 'name:' || name, {key} FROM _resolved_{entity} WHERE url IS NULL AND name IS NOT NULL
+        )
+        QUALIFY row_number() OVER (PARTITION BY alias ORDER BY {key}) = 1
+    """)
+
+
+def upsert_artists(
+        con: duckdb.DuckDBPyConnection,
+        kind: str
+):
+    """
+    Resolve the artists of the affected country-days of silver_<kind>.
+    """
+    _resolve(
+        con,
+        "artist",
+        f"""
+        SELECT DISTINCT norm_text(artist_mbid) AS mbid, norm_url(artist_url) AS url,
+               norm_text(artist_name) AS name, chart_date, artist_name, artist_mbid, artist_url
+        FROM ({_affected_rows(kind)})
+        """,
+        "artist_name, artist_mbid, artist_url",
+        "any_value(artist_name), max(nullif(artist_mbid, '')), any_value(artist_url)",
+    )
+
+
+def upsert_tracks(con: duckdb.DuckDBPyConnection):
+    """
+    Resolve the tracks of the affected country-days; artists must be resolved first.
+    """
+    _resolve(
+        con,
+        "track",
+        f"""
+        SELECT DISTINCT norm_text(t.track_mbid) AS mbid, norm_url(t.track_url) AS url,
+               norm_text(t.track_name) || ' - ' || coalesce(norm_text(t.artist_name), '') AS name,
+               t.chart_date, t.track_name, t.track_mbid, t.track_url, t.track_duration, al.artist_key
+        FROM ({_affected_rows("tracks")}) t
+        LEFT JOIN artist_alias al ON al.alias = {ARTIST_ALIAS.format(t="t")}
+        """,
+        "track_name, track_mbid, track_url, artist_key, track_duration",
+        "any_value(track_name), max(nullif(track_mbid, '')), any_value(track_url), min(artist_key), "
+        "max(TRY_CAST(track_duration AS INTEGER))",
+    )
+
+
+def refresh_facts(
+        con: duckdb.DuckDBPyConnection,
+        kind: str
+):
+    """
+    Rebuild the fact rows of the affected country-days of silver_<kind>.
+    """
+    con.execute(f"""
+        DELETE FROM fact_{kind[:-1]}_chart f USING (
+            SELECT a.chart_date, c.country_key FROM _affected_{kind} a JOIN dim_country c USING (chart_country)
+        ) x
+        WHERE f.chart_date = x.chart_date AND f.country_key = x.country_key
+    """)
+    artist_join = f"JOIN artist_alias al ON al.alias = {ARTIST_ALIAS.format(t='s')}"
+    if kind == "artists":
+        con.execute(f"""
+            INSERT INTO fact_artist_chart
+            SELECT s.chart_date, c.country_key, al.artist_key, s.rank, s.artist_listeners
+            FROM ({_affected_rows(kind)}) s
+            JOIN dim_country c USING (chart_country)
+            {artist_join}
+        """)
+    else:
+        con.execute(f"""
+            INSERT INTO fact_track_chart
+            SELECT s.chart_date, c.country_key, tl.track_key, al.artist_key, s.rank, s.track_listeners
+            FROM ({_affected_rows(kind)}) s
+            JOIN dim_country c USING (chart_country)
+            {artist_join}
+            JOIN track_alias tl ON tl.alias = {TRACK_ALIAS.format(t="s")}
+        """)
+
+
+def refresh_model(
+        con: duckdb.DuckDBPyConnection,
+        kind: str
+):
+    """
+    Update dimensions and facts for the country-days in _affected_<kind>.
+    """
+    ensure_tables(con)
+    upsert_countries(con, kind)
+    upsert_artists(con, kind)
+    if kind == "tracks":
+        upsert_tracks(con)
+    refresh_facts(con, kind)
@@ -1,8 +1,34 @@
 """
 `src/lastfm_fetch/__init__.py`
 Expose the main functions for fetching data from Last.fm.
+
+Names are resolved lazily (PEP 562) so that importing a light submodule,
+e.g. `src.lastfm_fetch.manifest`, does not pull in requests.
 """
 
-from .pull_geo import main
+import importlib
+
+_EXPORTS = {
+    "main": "pull_geo",
+    "fetch_geo_data": "pull_geo",
+    "save_response": "pull_geo",
+    "pull_chart": "pull_geo",
+    "LastfmHttpClient": "http_client",
+    "LastfmAPIError": "http_client",
+    "get_default_client": "http_client",
+    "IngestionManifest": "manifest",
+    "last_run_was_noop": "manifest",
+    "ResponseCache": "response_cache",
+    "get_default_cache": "response_cache",
+    "MetadataStore": "metadata_store",
+    "Enricher": "enrichment",
+    "enrich": "enrichment",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["main"]
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
@@ -0,0 +1,287 @@
+"""
+enrichment.py
+Fetches artist and track metadata (artist.getInfo, artist.getTopTags,
+track.getInfo) for the entities that appear in the raw geo charts.
+
+Entities are collected from the raw files not seen by a previous run and
+deduplicated across charts, countries and days, so an artist in eleven
+country charts is a single entity. Only (entity, method) pairs missing from
+the metadata store or older than its TTL are fetched, concurrently through
+one pooled HTTP client and token bucket like ingestion, and results are
+written to the store in batches as they arrive.
+
+Usage:
+    python -m src.lastfm_fetch.enrichment
+    python -m src.lastfm_fetch.enrichment --all-files --ttl 0     # refresh everything
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import typer
+
+from src.config import API_KEY, BASE_URL, DATA_DIR, ENRICH_STORE_PATH, ENRICH_TTL, MAX_CONCURRENCY, RATE_LIMIT
+from src.lastfm_fetch.http_client import LastfmAPIError, LastfmHttpClient
+from src.lastfm_fetch.metadata_store import MetadataRow, MetadataStore
+from src.transform_data.watermark import ProcessedFiles
+from src.utils.chart_schemas import CHART_SCHEMAS, get_schema
+from src.utils.metrics import get_metrics, stage, write_run_report
+from src.utils.raw_io import iter_records, list_raw_files
+from src.utils.rate_limiter import TokenBucket
+
+# Methods fetched for each entity kind
+ENRICH_METHODS = {
+    "artist": ("artist.getInfo", "artist.getTopTags"),
+    "track": ("track.getInfo",),
+}
+
+# Last.fm "Invalid parameters", returned for unknown artists and tracks
+NOT_FOUND_ERRORS = {6}
+
+# Results written to the store per transaction
+STORE_BATCH_SIZE = 100
+
+
+class Entity(NamedTuple):
+    kind: str  # 'artist' or 'track'
+    name: str
+    artist: Optional[str] = None  # the track's artist
+
+    @property
+    def key(self) -> str:
+        # Last.fm names are case-insensitive
+        if self.kind == "track":
+            return f"track:{self.artist.casefold()}\t{self.name.casefold()}"
+        return f"artist:{self.name.casefold()}"
+
+    def params(self, method: str) -> dict:
+        if self.kind == "track":
+            return {"method": method, "artist": self.artist, "track": self.name, "autocorrect": 0}
+        return {"method": method, "artist": self.name, "autocorrect": 0}
+
+
+def _value(record: dict, path: Tuple[str, ...]):
+    for key in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def collect_entities(
+        files: Iterable[Tuple[str, Path]]
+) -> Dict[str, Entity]:
+    """
+    Unique artists and tracks in raw chart files, given as (chart type, path) pairs.
+
+    Any registered chart type with an `artist_name` column contributes
+    artists, and one that also has `track_name` contributes tracks.
+    :return: {entity key: Entity}, in first-seen order.
+    """
+    entities: Dict[str, Entity] = {}
+    for kind, path in files:
+        paths = {f.column: f.path for f in get_schema(kind).fields}
+        artist_path, track_path = paths.get("artist_name"), paths.get("track_name")
+        if artist_path is None:
+            continue
+        for record in iter_records(path, kind):
+            artist = _value(record, artist_path)
+            if not artist:
+                continue
+            entity = Entity("artist", artist)
+            entities.setdefault(entity.key, entity)
+            track = _value(record, track_path) if track_path else None
+            if track:
+                entity = Entity("track", track, artist)
+                entities.setdefault(entity.key, entity)
+    return entities
+
+
+class Enricher:
+    """
+    Fetches the metadata of entities that are missing or stale in a MetadataStore.
+
+    Requests run on a bounded thread pool sharing one pooled HTTP client and
+    token bucket, so the whole run stays under `rate_limit` requests per second.
+    """
+    def __init__(
+            self,
+            store: Optional[MetadataStore] = None,
+            concurrency: int = MAX_CONCURRENCY,
+            rate_limit: float = RATE_LIMIT,
+            base_url: str = BASE_URL,
+            client: Optional[LastfmHttpClient] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        self.store = store if store is not None else MetadataStore()
+        self.concurrency = concurrency
+        self.http_client = client or LastfmHttpClient(
+            base_url=base_url, pool_size=concurrency, rate_limiter=TokenBucket(rate=rate_limit)
+        )
+
+    def pending(
+            self,
+            entities: Iterable[Entity]
+    ) -> List[Tuple[Entity, str]]:
+        """
+        (entity, method) pairs that have no entry in the store within its TTL.
+        """
+        fresh = self.store.fresh()
+        return [
+            (entity, method)
+            for entity in entities
+            for method in ENRICH_METHODS[entity.kind]
+            if (entity.key, method) not in fresh
+        ]
+
+    def fetch(
+            self,
+            entity: Entity,
+            method: str
+    ) -> MetadataRow:
+        """
+        Fetch one method for one entity; an entity Last.fm does not know is returned with its error code.
+        """
+        params = entity.params(method)
+        try:
+            payload = self.http_client.get_json({**params, "api_key": API_KEY, "format": "json"})
+        except LastfmAPIError as e:
+            if e.code not in NOT_FOUND_ERRORS:
+                raise
+            return entity.key, method, params, None, e.code
+        return entity.key, method, params, payload, None
+
+    def run(
+            self,
+            entities: Iterable[Entity]
+    ) -> Tuple[int, List[Tuple[Entity, str, Exception]]]:
+        """
+        Fetch every pending (entity, method) pair and store the results.
+        :return: (number of results stored, [(entity, method, error), ...] for failed fetches)
+        """
+        entities = list(entities)
+        jobs = self.pending(entities)
+        metrics = get_metrics()
+        metrics.count("enrich_entities", len(entities))
+        metrics.count("enrich_up_to_date", sum(len(ENRICH_METHODS[e.kind]) for e in entities) - len(jobs))
+
+        stored, not_found, failures, batch = 0, 0, [], []
+        with stage("enrich") as timer, ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.fetch, entity, method): (entity, method) for entity, method in jobs}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        entity, method = futures[future]
+                        failures.append((entity, method, e))
+                        continue
+                    batch.append(row)
+                    not_found += row[-1] is not None
+                    if len(batch) >= STORE_BATCH_SIZE:
+                        self.store.put_many(batch)
+                        stored, batch = stored + len(batch), []
+            finally:
+                # keep what was fetched even if the run is interrupted
+                if batch:
+                    self.store.put_many(batch)
+                    stored += len(batch)
+                timer.add(records=stored)
+
+        metrics.count("enrich_not_found", not_found)
+        metrics.count("enrich_failed", len(failures))
+        return stored, failures
+
+
+def enrich(
+        raw_dir: Path = DATA_DIR,
+        enricher: Optional[Enricher] = None,
+        all_files: bool = False
+) -> Tuple[int, List[Tuple[Entity, str, Exception]]]:
+    """
+    Enrich the entities of every registered chart type under `raw_dir/<kind>`.
+
+    Unless `all_files`, only raw files not seen by an earlier successful run
+    are read. Files are recorded as seen only when every fetch succeeded, so
+    failed entities are retried next time.
+    :return: Enricher.run's (stored, failures).
+    """
+    enricher = enricher or Enricher()
+    files = [(kind, file) for kind in CHART_SCHEMAS for file in list_raw_files(Path(raw_dir) / kind)]
+
+    watermark = None
+    if not all_files:
+        watermark = ProcessedFiles(enricher.store.path.parent)
+        files = [(kind, file) for kind, file in files if not watermark.is_processed(file)]
+    typer.echo(f"Reading entities from {len(files)} raw chart files")
+
+    entities = collect_entities(files)
+    stored, failures = enricher.run(entities.values())
+
+    if watermark is not None and not failures:
+        watermark.mark([file for _, file in files], enricher.store.path.parent)
+        watermark.save()
+    return stored, failures
+
+
+# CLI entry point
+def main(
+        raw_dir: Path = typer.Option(
+            DATA_DIR,
+            "--raw-dir",
+            "-r",
+            help="Directory holding one raw directory per chart type"
+        ),
+        store_path: Path = typer.Option(
+            ENRICH_STORE_PATH,
+            "--store",
+            help="SQLite metadata store"
+        ),
+        ttl: float = typer.Option(
+            ENRICH_TTL,
+            "--ttl",
+            help="Seconds before a stored entry is fetched again"
+        ),
+        all_files: bool = typer.Option(
+            False,
+            "--all-files",
+            help="Read every raw file, not only those new since the last run"
+        ),
+        concurrency: int = typer.Option(
+            MAX_CONCURRENCY,
+            "--concurrency",
+            "-w",
+            help="Number of concurrent requests"
+        ),
+        rate_limit: float = typer.Option(
+            RATE_LIMIT,
+            "--rate-limit",
+            help="Maximum requests per second across all workers"
+        ),
+):
+    if not API_KEY:
+        typer.secho("Error: LASTFM_API_KEY is not set in environment variables.", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    started = datetime.now()
+    store = MetadataStore(store_path, ttl=ttl)
+    try:
+        stored, failures = enrich(raw_dir, Enricher(store, concurrency, rate_limit), all_files)
+    finally:
+        store.close()
+
+    elapsed = (datetime.now() - started).total_seconds()
+    color = typer.colors.GREEN if not failures else typer.colors.YELLOW
+    typer.secho(f"Stored {stored} metadata entries in {elapsed:.1f}s, {len(failures)} failed → {store_path}", fg=color)
+    for entity, method, error in failures[:20]:
+        typer.secho(f"  {method} {entity.name}: {error}", fg=typer.colors.RED)
+    typer.echo(f"Run report → {write_run_report('enrich')}")
+    if failures:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
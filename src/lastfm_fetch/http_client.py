@@ -0,0 +1,168 @@
+"""
+http_client.py
+Reusable HTTP client for the Last.fm API.
+
+Keeps a pooled keep-alive `requests.Session` so consecutive calls reuse the
+same TCP+TLS connection, applies separate connect/read timeouts, and retries
+throttled or failed requests with exponential backoff and jitter.
+"""
+
+import random
+import threading
+import time
+import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from src.config import BASE_URL, CONNECT_TIMEOUT, MAX_CONCURRENCY, MAX_RETRIES, READ_TIMEOUT
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import TokenBucket
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Last.fm API error codes that are transient (operation failed, service
+# offline, temporary error, rate limit exceeded)
+RETRY_API_ERRORS = {8, 11, 16, 29}
+
+
+def _content_length(response) -> int:
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+class LastfmAPIError(Exception):
+    """Raised when Last.fm returns an error payload instead of data."""
+    def __init__(self, code: int, message: str):
+        super().__init__(f"Last.fm API error {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+    :return: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class LastfmHttpClient:
+    """
+    Pooled, retrying HTTP client for Last.fm API calls.
+
+    One instance is safe to share between threads; pass the same instance
+    to every worker so they share the connection pool and rate limiter.
+    """
+    def __init__(
+            self,
+            base_url: str = BASE_URL,
+            connect_timeout: float = CONNECT_TIMEOUT,
+            read_timeout: float = READ_TIMEOUT,
+            max_retries: int = MAX_RETRIES,
+            backoff_factor: float = 0.5,
+            max_backoff: float = 30.0,
+            pool_size: int = MAX_CONCURRENCY,
+            rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        # pool_block caps in-flight connections at pool_size even when nested
+        # thread pools (e.g. parallel page fetches) issue more requests
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def backoff(
+            self,
+            attempt: int,
+            retry_after: Optional[float] = None
+    ) -> float:
+        """
+        Seconds to wait before retry number `attempt` (0-based), using full jitter.
+        A server-provided Retry-After always wins if it is longer.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_json(
+            self,
+            params: dict
+    ) -> dict:
+        """
+        Send a GET request to the API and return the decoded JSON payload.
+
+        Connection errors, timeouts, retryable HTTP statuses and transient
+        Last.fm error codes are retried up to `max_retries` times.
+        """
+        metrics = get_metrics()
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                metrics.count("rate_limit_wait_seconds", self.rate_limiter.acquire())
+
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.observe_http(time.perf_counter() - started, type(e).__name__)
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                metrics.observe_http(time.perf_counter() - started, response.status_code, _content_length(response))
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                else:
+                    response.raise_for_status()
+                    payload = response.json()
+
+                    error = payload.get("error") if isinstance(payload, dict) else None
+                    if error is None:
+                        return payload
+                    if error not in RETRY_API_ERRORS or attempt >= self.max_retries:
+                        raise LastfmAPIError(error, payload.get("message", ""))
+
+            metrics.count("http_retries")
+            time.sleep(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> LastfmHttpClient:
+    """
+    Return the process-wide shared client, creating it on first use.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = LastfmHttpClient()
+    return _default_client
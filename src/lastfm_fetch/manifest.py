@@ -0,0 +1,149 @@
+"""
+manifest.py
+Ingestion manifest that remembers the content hash of the last saved payload
+per (country, chart_type, page).
+
+save_response consults it to skip writing charts that have not changed since
+the previous run, and each run records whether it produced any new files and
+how many charts failed to fetch, so downstream transforms can skip no-op
+runs. A run with failures is never a no-op: the charts it missed may have
+changed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from src.config import DATA_DIR
+
+MANIFEST_PATH = DATA_DIR / "_manifest.json"
+
+
+def content_hash(data: dict) -> str:
+    """
+    Stable SHA-256 of a payload, independent of key order and whitespace.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IngestionManifest:
+    """
+    JSON-backed record of the last payload hash per chart and the outcome of the last run.
+    Safe to share between ingestion worker threads.
+    """
+    def __init__(
+            self,
+            path: Path = MANIFEST_PATH
+    ):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._changed = []
+        self._unchanged = []
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"charts": {}, "last_run": None}
+
+    @staticmethod
+    def key(
+            country: str,
+            chart_type: str,
+            page
+    ) -> str:
+        country_slug = country.lower().replace(" ", "_")
+        return f"{chart_type.lower()}/{country_slug}/{page}"
+
+    def is_unchanged(
+            self,
+            country: str,
+            chart_type: str,
+            page,
+            digest: str
+    ) -> bool:
+        """
+        True if `digest` matches the last saved payload for this chart.
+        Unchanged charts are counted towards the current run.
+        """
+        key = self.key(country, chart_type, page)
+        with self._lock:
+            entry = self.data["charts"].get(key)
+            if entry is None or entry["hash"] != digest:
+                return False
+            entry["last_checked_at"] = datetime.now().isoformat(timespec="seconds")
+            self._unchanged.append(key)
+            return True
+
+    def record(
+            self,
+            country: str,
+            chart_type: str,
+            page,
+            digest: str,
+            file_path: Path
+    ):
+        """
+        Remember the hash and location of a newly written payload.
+        """
+        key = self.key(country, chart_type, page)
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self.data["charts"][key] = {
+                "hash": digest,
+                "file": str(file_path),
+                "updated_at": now,
+                "last_checked_at": now,
+            }
+            self._changed.append(str(file_path))
+
+    def finish_run(
+            self,
+            failures: int = 0
+    ) -> dict:
+        """
+        Record the outcome of the current run and persist the manifest.
+        :param failures: Number of charts the run failed to fetch.
+        :return: The run summary; `noop` is True when no chart changed and none failed.
+        """
+        with self._lock:
+            run = {
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "changed_files": sorted(self._changed),
+                "unchanged_charts": len(self._unchanged),
+                "failed_charts": failures,
+                "noop": not self._changed and not failures,
+            }
+            self.data["last_run"] = run
+            self._changed = []
+            self._unchanged = []
+        self.save()
+        return run
+
+    def save(self):
+        """
+        Atomically write the manifest to disk.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def last_run_was_noop(path: Path = MANIFEST_PATH) -> bool:
+    """
+    True if the most recent ingestion run wrote no new raw files and fetched every chart.
+    Returns False when there is no manifest or no recorded run.
+    """
+    path = Path(path)
+    if not path.exists():
+        return False
+    with open(path, "r", encoding="utf-8") as f:
+        last_run: Optional[dict] = json.load(f).get("last_run")
+    return bool(last_run and last_run.get("noop") and not last_run.get("failed_charts"))
@@ -0,0 +1,136 @@
+"""
+metadata_store.py
+Local keyed store of Last.fm artist and track metadata.
+
+Each row holds the payload of one enrichment method (e.g. artist.getInfo)
+for one entity key, with the time it was fetched. Entries older than the
+refresh TTL count as stale and are fetched again by the next enrichment
+run; nothing is evicted, so the store doubles as the enrichment dataset.
+Entities Last.fm does not know are stored with their error code and no
+payload, so they are not asked for again until the TTL has passed.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple
+from src.config import ENRICH_STORE_PATH, ENRICH_TTL
+
+# (entity key, method, params, payload or None, Last.fm error code or None)
+MetadataRow = Tuple[str, str, dict, Optional[dict], Optional[int]]
+
+
+class MetadataStore:
+    """
+    SQLite-backed (entity key, method) → payload store with a refresh TTL.
+
+    Args:
+        path (Path): SQLite file to store metadata in.
+        ttl (float): Seconds after which an entry is due for a refresh; None
+            never refreshes.
+    """
+    def __init__(
+            self,
+            path: Path = ENRICH_STORE_PATH,
+            ttl: Optional[float] = ENRICH_TTL,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    payload TEXT,
+                    error INTEGER,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (key, method)
+                )
+                """
+            )
+
+    def fresh(
+            self,
+            now: Optional[float] = None
+    ) -> Set[Tuple[str, str]]:
+        """
+        (key, method) pairs fetched within the TTL.
+        """
+        with self._lock:
+            if self.ttl is None:
+                rows = self._conn.execute("SELECT key, method FROM metadata").fetchall()
+            else:
+                cutoff = (now if now is not None else time.time()) - self.ttl
+                rows = self._conn.execute(
+                    "SELECT key, method FROM metadata WHERE fetched_at >= ?", (cutoff,)
+                ).fetchall()
+        return set(rows)
+
+    def put_many(
+            self,
+            rows: Iterable[MetadataRow],
+            now: Optional[float] = None
+    ):
+        """
+        Insert or refresh a batch of results in one transaction.
+        """
+        fetched_at = now if now is not None else time.time()
+        values = [
+            (
+                key,
+                method,
+                json.dumps(params, sort_keys=True),
+                json.dumps(payload, separators=(",", ":")) if payload is not None else None,
+                error,
+                fetched_at,
+            )
+            for key, method, params, payload, error in rows
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)", values)
+
+    def get(
+            self,
+            key: str,
+            method: str
+    ) -> Optional[dict]:
+        """
+        Stored payload for `key` and `method`, regardless of age; None if missing or not found upstream.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM metadata WHERE key = ? AND method = ?", (key, method)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def entries(
+            self,
+            method: Optional[str] = None
+    ) -> Iterator[Tuple[str, str, Optional[dict]]]:
+        """
+        Iterate over stored (key, method, payload) rows, optionally for one method.
+        """
+        query = "SELECT key, method, payload FROM metadata"
+        args = ()
+        if method is not None:
+            query += " WHERE method = ?"
+            args = (method,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY key, method", args).fetchall()
+        for key, row_method, payload in rows:
+            yield key, row_method, json.loads(payload) if payload is not None else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -4,23 +4,36 @@ Fetches country-level music data (top artists/tracks) from the Last.fm API.
 
 Usage:
     python pull_geo.py --country "United States" --type "artists" --limit
+    python pull_geo.py --country "United States" --type "artists" --top 1000
 """
 
 import os
-import json
-import requests
+import math
 import typer
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from src.config import API_KEY, BASE_URL, DATA_DIR
+from pathlib import Path
+from typing import Annotated, Optional
+from src.config import API_KEY, DATA_DIR, LASTFM_API_URL, MAX_CONCURRENCY, RAW_FORMAT, RAW_STRIP_IMAGES
+from src.lastfm_fetch.http_client import LastfmHttpClient, get_default_client
+from src.lastfm_fetch.manifest import IngestionManifest, content_hash
+from src.lastfm_fetch.response_cache import ResponseCache, get_default_cache
+from src.utils.chart_schemas import CHART_SCHEMAS, get_schema
+from src.utils.metrics import get_metrics, stage
+from src.utils.raw_io import write_raw
 
 
 app = typer.Typer()
 
+
 def fetch_geo_data(
         country: str,
         chart_type: str,
         limit: int,
-        page: int
+        page: int,
+        client: Optional[LastfmHttpClient] = None,
+        cache: Optional[ResponseCache] = None,
+        api_key: Optional[str] = None
 ):
     """
     Fetches country-level music data (top artists/tracks) from the Last.fm API.
@@ -30,39 +43,230 @@ def fetch_geo_data(
         chart_type (str): The type of chart to fetch ('artists' or 'tracks').
         limit (int): Number of results to return per page.
         page (int): Page number to fetch.
+        client (LastfmHttpClient): Pooled HTTP client to use. Defaults to the
+            shared process-wide client.
+        cache (ResponseCache): Response cache to read through. Defaults to the
+            shared on-disk cache, if enabled.
+        api_key (str): Last.fm API key. Defaults to LASTFM_API_KEY.
     """
-    method = f"geo.gettop{chart_type}"
+    method = get_schema(chart_type).method
     params = {
         "method": method,
         "country": country,
-        "api_key": API_KEY,
+        "api_key": api_key or API_KEY,
         "format": "json",
         "limit": limit,
         "page": page,
     }
 
-    response = requests.get(BASE_URL, params=params, timeout=100)
-    response.raise_for_status()
-    return response.json()
+    client = client or get_default_client()
+    # responses from another endpoint (e.g. a local stand-in) never share cache entries with the real API
+    cache_params = params if client.base_url == LASTFM_API_URL else {**params, "endpoint": client.base_url}
+
+    with stage("fetch") as timer:
+        cache = cache if cache is not None else get_default_cache()
+        if cache is not None:
+            cached = cache.get(cache_params)
+            if cached is not None:
+                get_metrics().count("cache_hits")
+                timer.add(records=count_records(cached, chart_type))
+                return cached
+
+        data = client.get_json(params)
+        timer.add(records=count_records(data, chart_type))
+
+    if cache is not None:
+        cache.set(cache_params, data)
+    return data
+
+def count_records(
+        data,
+        chart_type: str
+) -> int:
+    """
+    Number of chart entries in a payload (0 for anything not shaped like a chart).
+    """
+    schema = CHART_SCHEMAS.get(chart_type)
+    try:
+        records = data[schema.root_key][schema.record_key]
+    except (AttributeError, KeyError, TypeError):
+        return 0
+    return len(records) if isinstance(records, list) else 1
+
+def _file_size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+def merge_pages(
+        pages: list,
+        chart_type: str,
+        top: Optional[int] = None
+) -> dict:
+    """
+    Merge chart pages into a single payload shaped like a one-page response.
+
+    Records keep page order and are sorted by rank within each page, then
+    truncated to `top` entries.
+
+    Args:
+        pages (list): Page payloads ordered by page number.
+        chart_type (str): The type of chart ('artists' or 'tracks').
+        top (int): Maximum number of records to keep.
+    """
+    schema = get_schema(chart_type)
+    root_key, record_key = schema.root_key, schema.record_key
+
+    records = []
+    for payload in pages:
+        page_records = payload[root_key][record_key]
+        records.extend(sorted(page_records, key=lambda r: int(r.get("@attr", {}).get("rank", 0))))
+    if top is not None:
+        records = records[:top]
+
+    attr = dict(pages[0][root_key].get("@attr", {}))
+    attr.update({
+        "page": "1",
+        "perPage": str(len(records)),
+        "totalPages": "1",
+        "pagesFetched": str(len(pages)),
+    })
+    return {root_key: {record_key: records, "@attr": attr}}
+
+def fetch_top_n(
+        country: str,
+        chart_type: str,
+        top: int,
+        limit: int = 50,
+        client: Optional[LastfmHttpClient] = None,
+        max_workers: int = MAX_CONCURRENCY,
+        cache: Optional[ResponseCache] = None,
+        api_key: Optional[str] = None
+) -> dict:
+    """
+    Fetches the top `top` entries of a country chart across as many pages as needed.
+
+    The first page is fetched to read `@attr.totalPages`; the remaining pages
+    are then fetched concurrently and merged into one rank-ordered payload.
+
+    Args:
+        country (str): The country to fetch data for.
+        chart_type (str): The type of chart to fetch ('artists' or 'tracks').
+        top (int): Number of chart entries to collect.
+        limit (int): Number of results to request per page.
+        client (LastfmHttpClient): Pooled HTTP client to use.
+        max_workers (int): Maximum number of pages fetched in parallel.
+        cache (ResponseCache): Response cache to read through.
+        api_key (str): Last.fm API key. Defaults to LASTFM_API_KEY.
+    """
+    if top < 1:
+        raise ValueError("top must be a positive number of chart entries.")
+
+    root_key = get_schema(chart_type).root_key
+    limit = min(limit, top)
+    first = fetch_geo_data(country, chart_type, limit, 1, client=client, cache=cache, api_key=api_key)
+
+    total_pages = int(first[root_key].get("@attr", {}).get("totalPages", 1))
+    pages_needed = min(total_pages, math.ceil(top / limit))
+
+    pages = [first]
+    if pages_needed > 1:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, pages_needed - 1))) as executor:
+            pages.extend(executor.map(
+                lambda page: fetch_geo_data(
+                    country, chart_type, limit, page, client=client, cache=cache, api_key=api_key
+                ),
+                range(2, pages_needed + 1)
+            ))
+
+    return merge_pages(pages, chart_type, top)
 
 def save_response(
         data: dict,
         country: str,
-        chart_type:str
+        chart_type:str,
+        manifest: Optional[IngestionManifest] = None,
+        page = 1,
+        raw_format: str = RAW_FORMAT,
+        strip_images: bool = RAW_STRIP_IMAGES,
+        data_dir: Optional[Path] = None
 ):
+    """
+    Save a chart payload to the raw data directory.
+
+    When a manifest is given, payloads identical to the last saved one for the
+    same (country, chart_type, page) are skipped.
+
+    Args:
+        raw_format (str): 'json' (pretty-printed), 'ndjson.gz' or 'ndjson.zst'
+            (compact NDJSON with a metadata header line).
+        strip_images (bool): Drop the per-record image URL arrays before writing.
+        data_dir (Path): Raw root to write under. Defaults to DATA_DIR.
+
+    :return: Path of the written file, or None if the chart was unchanged.
+    """
+    digest = None
+    if manifest is not None:
+        digest = content_hash(data)
+        if manifest.is_unchanged(country, chart_type, page, digest):
+            typer.echo(f"Unchanged {chart_type} chart for {country}, skipping write")
+            return None
+
     # Create sub folder for artists or tracks
-    folder = DATA_DIR / chart_type.lower()
+    folder = (data_dir or DATA_DIR) / chart_type.lower()
     folder.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    fetched_at = datetime.now()
+    timestamp = fetched_at.strftime("%Y-%m-%d_%H-%M-%S")
     country_slug = country.lower().replace(" ", "_")
 
-    file_path = folder / f"{country_slug}_{timestamp}.json"
+    with stage("save", records=count_records(data, chart_type.lower())) as timer:
+        file_path = write_raw(
+            data,
+            folder / f"{country_slug}_{timestamp}",
+            chart_type.lower(),
+            fmt=raw_format,
+            drop_images=strip_images,
+            metadata={"country": country, "page": page, "fetched_at": fetched_at.isoformat(timespec="seconds")},
+        )
+        timer.add(bytes_written=_file_size(file_path))
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if manifest is not None:
+        manifest.record(country, chart_type, page, digest, file_path)
 
     typer.echo(f"Saved {chart_type} data for {country} → {file_path}")
+    return file_path
+
+def pull_chart(
+        country: str,
+        chart_type: str,
+        limit: int,
+        page: int,
+        client: Optional[LastfmHttpClient] = None,
+        top: Optional[int] = None,
+        manifest: Optional[IngestionManifest] = None,
+        raw_format: str = RAW_FORMAT,
+        strip_images: bool = RAW_STRIP_IMAGES,
+        cache: Optional[ResponseCache] = None,
+        data_dir: Optional[Path] = None,
+        api_key: Optional[str] = None
+):
+    """
+    Fetch a single chart page, or the top `top` entries across pages,
+    and save it to the raw data directory.
+
+    :return: Path of the written file, or None if the manifest found it unchanged.
+    """
+    if top:
+        data = fetch_top_n(country, chart_type, top, limit, client=client, cache=cache, api_key=api_key)
+        page = f"top{top}"
+    else:
+        data = fetch_geo_data(country, chart_type, limit, page, client=client, cache=cache, api_key=api_key)
+    return save_response(
+        data, country, chart_type, manifest=manifest, page=page, raw_format=raw_format, strip_images=strip_images,
+        data_dir=data_dir
+    )
 
 # CLI entry point
 def main(
@@ -93,9 +297,18 @@ def main(
             "-p",
             help="Page number to fetch"
         ),
+
+        top: Annotated[Optional[int], typer.Option(
+            "--top",
+            "-n",
+            help="Fetch the top N entries across all needed pages (overrides --page)"
+        )] = None,
 ):
     if API_KEY:
-        data = fetch_geo_data(country, chart_type, limit, page)
+        if top:
+            data = fetch_top_n(country, chart_type, top, limit)
+        else:
+            data = fetch_geo_data(country, chart_type, limit, page)
         save_response(data, country, chart_type)
     else:
         typer.secho("Error: LASTFM_API_KEY is not set in environment variables.", fg=typer.colors.RED)
@@ -0,0 +1,172 @@
+"""
+response_cache.py
+On-disk cache of Last.fm API responses.
+
+Responses are stored in a local SQLite file keyed on the normalized request
+parameters (without the api_key), expire after a TTL and are evicted in
+least-recently-used order once the cache grows past a size limit. Re-running
+ingestion after a partial failure then only costs the missing calls, and
+cached payloads can be replayed offline in tests and notebooks.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from src.config import CACHE_MAX_BYTES, CACHE_PATH, CACHE_TTL
+
+# Request parameters that never change the response
+IGNORED_PARAMS = {"api_key"}
+
+
+def normalize_params(params: dict) -> dict:
+    """
+    Drop credentials and stringify values so equivalent requests compare equal.
+    """
+    return {
+        str(k): str(v)
+        for k, v in sorted(params.items())
+        if k not in IGNORED_PARAMS and v is not None
+    }
+
+
+def cache_key(params: dict) -> str:
+    normalized = json.dumps(normalize_params(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL expiry and size-based LRU eviction.
+
+    Any object with the same `get(params)` / `set(params, payload)` methods
+    can be passed to fetch_geo_data in its place.
+
+    Args:
+        path (Path): SQLite file to store responses in.
+        ttl (float): Seconds before an entry expires; None never expires
+            (useful for offline replay).
+        max_bytes (int): Total payload size above which the least recently
+            used entries are evicted.
+    """
+    def __init__(
+            self,
+            path: Path = CACHE_PATH,
+            ttl: Optional[float] = CACHE_TTL,
+            max_bytes: int = CACHE_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)")
+
+    def get(
+            self,
+            params: dict
+    ) -> Optional[dict]:
+        """
+        Return the cached payload for `params`, or None if missing or expired.
+        """
+        key = cache_key(params)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(payload)
+
+    def set(
+            self,
+            params: dict,
+            payload: dict
+    ):
+        """
+        Store `payload` for `params` and evict old entries if over the size limit.
+        """
+        key = cache_key(params)
+        body = json.dumps(payload, separators=(",", ":"))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(normalize_params(params)), body, len(body), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def entries(self) -> Iterator[Tuple[dict, dict]]:
+        """
+        Iterate over all cached (params, payload) pairs, ignoring expiry.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT params, payload FROM responses ORDER BY created_at").fetchall()
+        for params, payload in rows:
+            yield json.loads(params), json.loads(payload)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    Return the shared on-disk cache, or None if caching is disabled (LASTFM_CACHE_TTL=0).
+    """
+    global _default_cache
+    if not CACHE_TTL:
+        return None
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache()
+    return _default_cache
@@ -0,0 +1,111 @@
+"""
+compact.py
+Canonical compact types of silver chart data.
+
+Parsers produce wide, forgiving types (int64, plain strings, timestamps) so
+validation can see bad values. Before silver is written, columns are cast
+to the compact type declared for them in the chart-schema registry:
+
+    category   dictionary-encoded strings (country, artist and track names, MBIDs)
+    string     Arrow-backed strings (URLs, durations)
+    int16      ranks
+    int32      listener counts
+    bool       streamable flags ("1" is True)
+
+chart_country is a category, chart_date a date32 and load_time a
+microsecond timestamp. The same schema is used for parquet files and, via
+to_compact_frame, for pandas frames, where categories become pd.Categorical,
+strings string[pyarrow] and chart_date date32[pyarrow].
+"""
+
+from typing import Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.chart_schemas import get_schema
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+STORAGE_TYPES = {
+    "category": CATEGORY,
+    "string": pa.string(),
+    "int16": pa.int16(),
+    "int32": pa.int32(),
+    "int64": pa.int64(),
+    "bool": pa.bool_(),
+}
+
+METADATA_TYPES = {
+    "chart_country": CATEGORY,
+    "chart_date": pa.date32(),
+    "load_time": pa.timestamp("us"),
+}
+
+PANDAS_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+    pa.date32(): pd.ArrowDtype(pa.date32()),
+}
+
+
+def compact_schema(kind: str) -> pa.Schema:
+    """
+    Arrow schema of silver chart data of `kind`.
+    """
+    fields = [pa.field(column, STORAGE_TYPES[storage]) for column, storage in get_schema(kind).storage.items()]
+    return pa.schema(fields + [pa.field(column, type_) for column, type_ in METADATA_TYPES.items()])
+
+
+def _cast(column: pa.ChunkedArray, type_: pa.DataType) -> pa.ChunkedArray:
+    if column.type == type_:
+        return column
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    if type_ == pa.bool_() and not pa.types.is_boolean(column.type):
+        return pc.equal(column.cast(pa.string()), "1")
+    if pa.types.is_dictionary(type_):
+        return column.cast(type_.value_type).cast(type_)
+    # safe casts: an out-of-range rank or listener count raises instead of wrapping
+    return column.cast(type_)
+
+
+def to_compact_table(
+        data: Union[pa.Table, pd.DataFrame],
+        kind: str,
+        columns: Optional[Sequence[str]] = None
+) -> pa.Table:
+    """
+    Cast `data` to the compact silver schema of `kind`, in the schema's
+    column order whatever the order in `data` (files written by older runs or
+    by another engine differ). Schema columns missing from `data` become
+    typed nulls and columns outside the schema are dropped.
+
+    `columns` restricts the result to a subset of the schema (e.g. without the
+    partition columns, which partitioned files do not store), still in schema order.
+    """
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    schema = compact_schema(kind)
+    if columns is not None:
+        unknown = set(columns) - set(schema.names)
+        if unknown:
+            raise ValueError(f"Unknown {kind} columns: {', '.join(sorted(unknown))}")
+        schema = pa.schema([field for field in schema if field.name in columns])
+    arrays = [
+        _cast(table.column(field.name), field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def to_compact_frame(
+        data: Union[pa.Table, pd.DataFrame],
+        kind: str,
+        columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Silver chart data as a DataFrame with compact dtypes (see to_compact_table).
+    """
+    return to_compact_table(data, kind, columns).to_pandas(types_mapper=PANDAS_TYPES.get)
@@ -0,0 +1,286 @@
+"""
+compaction.py
+Merges small silver files into a few right-sized ones and retires the rest.
+
+Every transform run adds a timestamped file to the flat silver layout (a full
+snapshot, or an incremental part), and incremental runs add a file to each
+touched partition of the partitioned layout. Compaction reads the live files
+of a dataset, keeps the latest load of every (chart_country, chart_date,
+rank) like the gold build does, which drops rows of superseded snapshots,
+and writes the result sorted by (chart_country, chart_date, rank):
+
+    flat          files of at most COMPACT_TARGET_ROWS rows
+    partitioned   one file per chart_date/chart_country partition
+
+The swap is recorded in the dataset's live-file manifest (see
+silver_manifest.py), so it is safe while transforms keep writing: files that
+appear during a run are left alone, and merged files are deleted only by a
+later run, COMPACT_RETENTION seconds after they were retired.
+
+Usage:
+    python -m src.transform_data.compaction
+    python -m src.transform_data.compaction --kind tracks --layout flat --retention 0
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import typer
+
+from src.config import COMPACT_RETENTION, COMPACT_TARGET_ROWS, OUTPUT_DIR, ROW_GROUP_SIZE, SILVER_COMPRESSION
+from src.transform_data.compact import compact_schema, to_compact_frame, to_compact_table
+from src.transform_data.silver_manifest import SilverManifest
+from src.transform_data.silver_writer import PARTITION_SCHEMA, SILVER_LAYOUTS, silver_path
+from src.transform_data.watermark import next_part_path
+from src.utils.chart_schemas import CHART_SCHEMAS, get_schema
+from src.utils.metrics import stage, write_run_report
+
+SORT_COLUMNS = ["chart_country", "chart_date", "rank"]
+
+
+class CompactionResult(NamedTuple):
+    files_in: int
+    files_out: int
+    rows_in: int
+    rows_out: int
+    deleted: int  # retired files removed after their grace period
+
+
+def latest_loads(
+        df: pd.DataFrame,
+        keys: List[str]
+) -> pd.DataFrame:
+    """
+    Keep the most recently loaded row of every `keys` combination, sorted by `keys`.
+    """
+    df = df.sort_values("load_time", kind="stable").drop_duplicates(keys, keep="last")
+    return df.sort_values(keys, kind="stable").reset_index(drop=True)
+
+
+def _live_files(
+        dataset_dir: Path,
+        manifest: SilverManifest,
+        pattern: str
+) -> List[Path]:
+    files = [f for f in dataset_dir.glob(pattern) if not f.name.startswith((".", "_"))]
+    return sorted(manifest.live_files(files))
+
+
+def _write(
+        table: pa.Table,
+        output_file: Path,
+        kind: str,
+        compression: str,
+        row_group_size: int
+) -> Path:
+    # written under a hidden name so readers never see a partial file
+    tmp_file = output_file.with_name(f".{output_file.name}.tmp")
+    dictionary_columns = [c for c in get_schema(kind).dictionary_columns if c in table.column_names]
+    try:
+        pq.write_table(
+            table, tmp_file, compression=compression, row_group_size=row_group_size, use_dictionary=dictionary_columns
+        )
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+def purge_retired(
+        manifest: SilverManifest,
+        retention: float
+) -> int:
+    """
+    Delete retired files older than `retention` seconds.
+    :return: Number of files removed from the manifest.
+    """
+    expired = manifest.expired(retention)
+    for file in expired:
+        file.unlink(missing_ok=True)
+    manifest.forget(expired)
+    return len(expired)
+
+
+def compact_flat(
+        dataset_dir: Path,
+        kind: str,
+        target_rows: int = COMPACT_TARGET_ROWS,
+        retention: float = COMPACT_RETENTION,
+        min_files: int = 2,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE
+) -> CompactionResult:
+    """
+    Merge the live flat silver files of `kind` into files of at most `target_rows` rows.
+    Does nothing but purge expired files when fewer than `min_files` files are live.
+    """
+    manifest = SilverManifest(dataset_dir)
+    deleted = purge_retired(manifest, retention)
+    files = _live_files(dataset_dir, manifest, "*.parquet")
+    if len(files) < min_files:
+        manifest.save()
+        return CompactionResult(len(files), len(files), 0, 0, deleted)
+
+    with stage("compact", bytes_read=sum(f.stat().st_size for f in files)) as timer:
+        # older files may predate the compact schema or order their columns differently
+        tables = [to_compact_table(pq.read_table(f), kind) for f in files]
+        rows_in = sum(t.num_rows for t in tables)
+        df = latest_loads(to_compact_frame(pa.concat_tables(tables), kind), SORT_COLUMNS)
+        del tables
+
+        written: Dict[Path, int] = {}
+        for start in range(0, max(len(df), 1), target_rows):
+            chunk = to_compact_table(df.iloc[start:start + target_rows], kind)
+            output_file = _write(
+                chunk, next_part_path(dataset_dir, f"{kind}_compacted"), kind, compression, row_group_size
+            )
+            written[output_file] = chunk.num_rows
+        timer.add(records=len(df), bytes_written=sum(f.stat().st_size for f in written))
+
+    manifest.swap(written, files)
+    manifest.save()
+    return CompactionResult(len(files), len(written), rows_in, len(df), deleted)
+
+
+def compact_partitioned(
+        dataset_dir: Path,
+        kind: str,
+        retention: float = COMPACT_RETENTION,
+        min_files: int = 2,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE
+) -> CompactionResult:
+    """
+    Merge the live files of every chart_date/chart_country partition holding at least `min_files` of them.
+    """
+    manifest = SilverManifest(dataset_dir)
+    deleted = purge_retired(manifest, retention)
+    by_partition: Dict[Path, List[Path]] = {}
+    for file in _live_files(dataset_dir, manifest, "**/*.parquet"):
+        by_partition.setdefault(file.parent, []).append(file)
+
+    # partition columns live in the directory names, not in the files
+    columns = [c for c in compact_schema(kind).names if c not in PARTITION_SCHEMA.names]
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    files_in = rows_in = rows_out = 0
+    retired: List[Path] = []
+    written: Dict[Path, int] = {}
+    with stage("compact") as timer:
+        for partition, files in sorted(by_partition.items()):
+            files_in += len(files)
+            if len(files) < min_files:
+                continue
+            df = to_compact_frame(
+                pa.concat_tables([to_compact_table(pq.read_table(f), kind, columns) for f in files]), kind, columns
+            )
+            rows_in += len(df)
+            df = latest_loads(df, ["rank"])
+            output_file = _write(
+                to_compact_table(df, kind, columns),
+                partition / f"{kind}-compacted-{run_id}-0.parquet",
+                kind, compression, row_group_size
+            )
+            written[output_file] = len(df)
+            rows_out += len(df)
+            retired += files
+            timer.add(
+                records=len(df),
+                bytes_read=sum(f.stat().st_size for f in files),
+                bytes_written=output_file.stat().st_size
+            )
+
+    manifest.swap(written, retired)
+    manifest.save()
+    return CompactionResult(files_in, files_in - len(retired) + len(written), rows_in, rows_out, deleted)
+
+
+def compact_silver(
+        output_dir: Path,
+        kind: str,
+        layout: str = "flat",
+        target_rows: int = COMPACT_TARGET_ROWS,
+        retention: float = COMPACT_RETENTION,
+        min_files: int = 2,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE
+) -> Optional[CompactionResult]:
+    """
+    Compact the silver dataset of `kind` in `layout`; None if it does not exist.
+    """
+    dataset_dir = silver_path(output_dir, kind, layout)
+    if not dataset_dir.is_dir():
+        return None
+    if layout == "flat":
+        return compact_flat(dataset_dir, kind, target_rows, retention, min_files, compression, row_group_size)
+    return compact_partitioned(dataset_dir, kind, retention, min_files, compression, row_group_size)
+
+
+# CLI entry point
+def main(
+        output_dir: Path = typer.Option(
+            OUTPUT_DIR,
+            "--output-dir",
+            "-o",
+            help="Directory holding the silver datasets"
+        ),
+        kinds: Optional[List[str]] = typer.Option(
+            None,
+            "--kind",
+            "-k",
+            help="Chart type to compact; repeat for several (default: every registered type)"
+        ),
+        layouts: Optional[List[str]] = typer.Option(
+            None,
+            "--layout",
+            help="Silver layout to compact, 'flat' or 'partitioned'; repeat for both (default: both)"
+        ),
+        target_rows: int = typer.Option(
+            COMPACT_TARGET_ROWS,
+            "--target-rows",
+            help="Maximum rows per compacted flat file"
+        ),
+        retention: float = typer.Option(
+            COMPACT_RETENTION,
+            "--retention",
+            help="Seconds a retired file is kept for running readers before it is deleted"
+        ),
+        min_files: int = typer.Option(
+            2,
+            "--min-files",
+            help="Only compact a dataset or partition with at least this many live files"
+        ),
+        compression: str = typer.Option(
+            SILVER_COMPRESSION,
+            "--compression",
+            help="Parquet compression codec: 'zstd' or 'snappy'"
+        ),
+):
+    for layout in layouts or SILVER_LAYOUTS:
+        if layout not in SILVER_LAYOUTS:
+            raise typer.BadParameter(f"Unknown layout '{layout}'", param_hint="--layout")
+    try:
+        kinds = [get_schema(kind).kind for kind in kinds] if kinds else list(CHART_SCHEMAS)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--kind")
+
+    for kind in kinds:
+        for layout in layouts or SILVER_LAYOUTS:
+            result = compact_silver(output_dir, kind, layout, target_rows, retention, min_files, compression)
+            if result is None:
+                continue
+            typer.secho(
+                f"{layout} {kind}: {result.files_in} → {result.files_out} files, "
+                f"{result.rows_in - result.rows_out} superseded rows dropped, {result.deleted} retired files deleted",
+                fg=typer.colors.BRIGHT_GREEN
+            )
+    typer.echo(f"Run report → {write_run_report('compact')}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
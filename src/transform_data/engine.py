@@ -0,0 +1,319 @@
+"""
+engine.py
+Schema-driven raw → silver transform shared by every chart type.
+
+Column maps, dtypes and payload layout come from the chart-schema registry
+(src.utils.chart_schemas), so a newly registered chart type gets the fast
+parser, incremental watermarks, parallel parsing and both silver layouts
+without code of its own. Several chart types are transformed in a single
+pass: their raw files are parsed on one shared process pool, then each
+type is concatenated and written to its own silver dataset.
+
+Usage:
+    python -m src.transform_data.engine                        # every chart type under data/raw/geo
+    python -m src.transform_data.engine --kind tracks --incremental
+"""
+
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import typer
+
+from src.config import (
+    OUTPUT_DIR, RAW_GEO_PATH, ROW_GROUP_SIZE, SILVER_COMPRESSION, SILVER_LAYOUT, STREAM_BATCH_SIZE, TRANSFORM_ENGINE,
+    TRANSFORM_WORKERS
+)
+from src.lastfm_fetch.manifest import last_run_was_noop
+from src.transform_data.fast_parse import parse_chart_file, parse_file_metadata, to_int_array
+from src.transform_data.parallel import report_summary, transform_files
+from src.transform_data.silver_writer import silver_path, stream_silver, write_quarantine, write_silver
+from src.transform_data.validation import print_report, validate_chart_frame
+from src.transform_data.watermark import ProcessedFiles
+from src.utils.chart_schemas import CHART_SCHEMAS, get_schema
+from src.utils.metrics import get_metrics, stage, write_run_report
+from src.utils.raw_io import list_raw_files, load_payload
+
+
+def transform_chart_file(
+        path: Path,
+        kind: str,
+        engine: str = TRANSFORM_ENGINE
+) -> pd.DataFrame:
+    """
+    Transform one raw chart file of `kind` into a silver DataFrame, with the
+    fast field extractor or, for engine='pandas', with pd.json_normalize.
+    """
+    if engine == "fast":
+        return parse_chart_file(path, kind)
+
+    schema = get_schema(kind)
+    with stage("parse", bytes_read=Path(path).stat().st_size) as timer:
+        data = load_payload(path)
+        records = data[schema.root_key][schema.record_key]
+        timer.add(records=len(records))
+    normalize_started = time.perf_counter()
+
+    df = pd.json_normalize(records)
+    df.rename(columns=schema.rename_map, inplace=True)
+    df = df.drop('image', axis=1, errors='ignore')
+
+    country, chart_date = parse_file_metadata(path)
+    df['chart_country'] = country
+    df['chart_date'] = chart_date if chart_date is not None else np.datetime64("NaT", "us")
+    df['load_time'] = datetime.now()
+
+    for column in schema.int_columns:
+        try:
+            df[column] = df[column].astype(int)
+        except (TypeError, ValueError):
+            df[column] = to_int_array(df[column].tolist())
+
+    get_metrics().record_stage("normalize", time.perf_counter() - normalize_started, records=len(df))
+    return df
+
+
+def raw_sources(
+        raw_dir: Path = RAW_GEO_PATH,
+        kinds: Optional[List[str]] = None
+) -> Dict[str, Path]:
+    """
+    Raw directory of each chart type, `raw_dir/<kind>`.
+    Without `kinds`, every registered chart type that has a raw directory.
+    """
+    if kinds:
+        return {get_schema(kind).kind: Path(raw_dir) / kind for kind in kinds}
+    return {kind: Path(raw_dir) / kind for kind in CHART_SCHEMAS if (Path(raw_dir) / kind).is_dir()}
+
+
+def transform_charts(
+        sources: Dict[str, Path],
+        output_dir: Path,
+        workers: int = TRANSFORM_WORKERS,
+        incremental: bool = False,
+        layout: str = SILVER_LAYOUT,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE,
+        streaming: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE,
+        engine: str = TRANSFORM_ENGINE
+) -> Dict[str, Optional[Path]]:
+    """
+    Transform the raw files of every chart type in `sources` ({kind: raw directory}).
+
+    :return: {kind: written silver file or dataset directory}, None for a
+        chart type with nothing new to transform in incremental mode.
+    """
+    outputs: Dict[str, Optional[Path]] = {}
+    pending = {}
+    for kind, json_path in sources.items():
+        schema = get_schema(kind)
+        if not json_path.exists():
+            typer.echo(f"File {json_path} does not exist")
+            raise typer.Exit(1)
+
+        json_files = list_raw_files(json_path)
+        if not json_files:
+            typer.secho(f"No raw {schema.label} files found in {json_path}", fg=typer.colors.RED)
+            raise typer.Exit(1)
+        typer.echo(f"Found {len(json_files)} raw {schema.label} files")
+
+        silver_dir = silver_path(output_dir, kind, layout)
+        if streaming and layout != "flat":
+            raise typer.BadParameter("--streaming writes the flat layout only")
+
+        watermark = None
+        if incremental:
+            watermark = ProcessedFiles(silver_dir)
+            json_files = watermark.new_files(json_files)
+            typer.echo(f"{len(json_files)} new or changed {schema.label} files since the last incremental run")
+            if not json_files:
+                typer.echo(f"Nothing to do, silver {kind} are up to date.")
+                outputs[kind] = None
+                continue
+        pending[kind] = (json_files, silver_dir, watermark)
+
+    if streaming:
+        empty = []
+        for kind, (json_files, silver_dir, watermark) in pending.items():
+            label = get_schema(kind).label
+            started = time.perf_counter()
+            quarantine = []
+            output_file, rows, errors = stream_silver(
+                json_files, silver_dir, kind, batch_size, compression, row_group_size, quarantine
+            )
+            # streaming reads the files one after another
+            report_summary(label, len(json_files), errors, started, workers=1)
+            if len(errors) == len(json_files):
+                output_file.unlink()
+                typer.secho(f"No rows were streamed from the {label} files.", fg=typer.colors.RED)
+                empty.append(kind)
+                continue
+            typer.secho(f"Streamed {rows} rows → {output_file}", fg=typer.colors.BRIGHT_GREEN)
+            if quarantine:
+                quarantine_file = write_quarantine(pd.concat(quarantine), output_dir, kind, compression)
+                typer.secho(f"Quarantined {sum(map(len, quarantine))} rows → {quarantine_file}", fg=typer.colors.YELLOW)
+            if watermark is not None:
+                failed = {file for file, _ in errors}
+                watermark.mark([file for file in json_files if file not in failed], output_file)
+                watermark.save()
+            outputs[kind] = output_file
+        if empty:
+            raise typer.Exit(1)
+        return outputs
+
+    if not pending:
+        return outputs
+
+    # one pool parses the files of every chart type
+    files = [file for json_files, _, _ in pending.values() for file in json_files]
+    kinds = [kind for kind, (json_files, _, _) in pending.items() for _ in json_files]
+    started = time.perf_counter()
+    dfs, errors = transform_files(files, partial(transform_chart_file, engine=engine), workers, kinds=kinds)
+
+    failed = {file for file, _ in errors}
+    dfs_by_kind = {kind: [] for kind in pending}
+    for kind, df in zip((k for f, k in zip(files, kinds) if f not in failed), dfs):
+        dfs_by_kind[kind].append(df)
+
+    empty = []
+    for kind, (json_files, silver_dir, watermark) in pending.items():
+        label = get_schema(kind).label
+        kind_files = set(json_files)
+        kind_errors = [(file, error) for file, error in errors if file in kind_files]
+        report_summary(label, len(json_files), kind_errors, started, workers)
+        if not dfs_by_kind[kind]:
+            typer.secho(f"No dataframes were created from the {label} files.", fg=typer.colors.RED)
+            empty.append(kind)
+            continue
+
+        with stage("concat", records=sum(len(df) for df in dfs_by_kind[kind])):
+            combined_df = pd.concat(dfs_by_kind[kind])
+        typer.echo(f"Combined {label} dataframe shape: {combined_df.shape}")
+
+        # each raw file is its own source for the rank checks
+        source = np.repeat(np.arange(len(dfs_by_kind[kind])), [len(df) for df in dfs_by_kind[kind]])
+        combined_df, quarantine, report = validate_chart_frame(combined_df, kind, source)
+        print_report(report)
+        quarantine_file = write_quarantine(quarantine, output_dir, kind, compression)
+        if quarantine_file is not None:
+            typer.echo(f"Quarantined rows → {quarantine_file}")
+
+        output_file = write_silver(
+            combined_df,
+            silver_dir,
+            kind,
+            layout=layout,
+            compression=compression,
+            row_group_size=row_group_size,
+            replace_partitions=not incremental,
+        )
+        typer.secho(f"Saved {layout} parquet → {output_file}", fg=typer.colors.BRIGHT_GREEN)
+
+        if watermark is not None:
+            watermark.mark([file for file in json_files if file not in failed], output_file)
+            watermark.save()
+        outputs[kind] = output_file
+
+    if empty:
+        raise typer.Exit(1)
+    return outputs
+
+
+def transform_kind(
+        kind: str,
+        json_path: Path,
+        output_dir: Path,
+        **options
+) -> Optional[Path]:
+    """
+    Transform one chart type from an explicit raw directory; see transform_charts.
+    """
+    return transform_charts({kind: json_path}, output_dir, **options)[kind]
+
+
+# CLI entry point
+def main(
+        raw_dir: Path = typer.Option(
+            RAW_GEO_PATH,
+            "--raw-dir",
+            "-r",
+            help="Directory holding one raw directory per chart type"
+        ),
+        kinds: Optional[List[str]] = typer.Option(
+            None,
+            "--kind",
+            "-k",
+            help="Chart type to transform; repeat for several (default: every registered type with raw data)"
+        ),
+        output_dir: Path = typer.Option(
+            OUTPUT_DIR,
+            "--output-dir",
+            "-o",
+            help="Directory to save the transformed parquet files"
+        ),
+        workers: int = typer.Option(
+            TRANSFORM_WORKERS,
+            "--workers",
+            "-w",
+            help="Number of processes shared by every chart type to parse files (0 uses every CPU core)"
+        ),
+        incremental: bool = typer.Option(
+            False,
+            "--incremental",
+            "-i",
+            help="Only transform raw files not seen by a previous incremental run and append them"
+        ),
+        layout: str = typer.Option(
+            SILVER_LAYOUT,
+            "--layout",
+            help="Silver layout: 'flat' (one file per run) or 'partitioned' (chart_date/chart_country dataset)"
+        ),
+        compression: str = typer.Option(
+            SILVER_COMPRESSION,
+            "--compression",
+            help="Parquet compression codec: 'zstd' or 'snappy'"
+        ),
+        row_group_size: int = typer.Option(
+            ROW_GROUP_SIZE,
+            "--row-group-size",
+            help="Maximum rows per parquet row group"
+        ),
+        streaming: bool = typer.Option(
+            False,
+            "--streaming",
+            help="Stream records into parquet in fixed-size batches to bound memory (flat layout only)"
+        ),
+        batch_size: int = typer.Option(
+            STREAM_BATCH_SIZE,
+            "--batch-size",
+            help="Records per batch in --streaming mode"
+        ),
+        skip_if_noop: bool = typer.Option(
+            False,
+            "--skip-if-noop",
+            help="Do nothing if the last ingestion run found no changed charts"
+        )
+):
+    if skip_if_noop and last_run_was_noop():
+        typer.echo("Last ingestion run was a no-op, skipping transform.")
+        return
+    try:
+        sources = raw_sources(raw_dir, kinds)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--kind")
+    if not sources:
+        typer.secho(f"No raw chart directories found in {raw_dir}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    transform_charts(
+        sources, output_dir, workers, incremental, layout, compression, row_group_size, streaming, batch_size
+    )
+    typer.echo(f"Run report → {write_run_report('transform')}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
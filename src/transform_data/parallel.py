@@ -0,0 +1,101 @@
+"""
+Parallel execution helpers for the raw → silver transforms.
+Parses and normalizes raw chart files on a process pool and returns the
+results in input order, so combined output is deterministic.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+import typer
+
+from src.utils.metrics import get_metrics, reset_metrics
+
+
+def resolve_workers(workers: int) -> int:
+    """
+    Turn a --workers value into a process count; 0 or less means one per CPU core.
+    """
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _safe_transform(
+        transform: Callable[..., pd.DataFrame],
+        file: Path,
+        kind: Optional[str] = None,
+        collect_metrics: bool = False
+) -> Tuple[Optional[pd.DataFrame], Optional[str], Optional[dict]]:
+    # in a worker process, measure this file on its own and ship the numbers back
+    metrics = reset_metrics() if collect_metrics else None
+    try:
+        df, error = (transform(file) if kind is None else transform(file, kind)), None
+    except Exception as e:
+        df, error = None, str(e)
+    return df, error, metrics.snapshot() if metrics else None
+
+
+def transform_files(
+        files: List[Path],
+        transform: Callable[..., pd.DataFrame],
+        workers: int = 1,
+        kinds: Optional[List[str]] = None
+) -> Tuple[List[pd.DataFrame], List[Tuple[Path, str]]]:
+    """
+    Apply `transform` to every file, on a process pool when `workers` > 1.
+    With `kinds` (one chart type per file), `transform(file, kind)` is called
+    instead, so files of several chart types can share one pool.
+
+    `transform` must be a module-level function so it can be pickled.
+    A file that fails is reported instead of aborting the whole batch.
+    Stage metrics recorded in worker processes are merged into this process.
+
+    :return: (dataframes in input order, [(file, error message), ...])
+    """
+    kinds = kinds if kinds is not None else [None] * len(files)
+    workers = min(resolve_workers(workers), max(1, len(files)))
+    if workers == 1:
+        results = [_safe_transform(transform, file, kind) for file, kind in zip(files, kinds)]
+    else:
+        func = partial(_safe_transform, transform, collect_metrics=True)
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(func, files, kinds, chunksize=chunksize))
+
+    dfs, errors = [], []
+    for file, (df, error, snapshot) in zip(files, results):
+        if snapshot is not None:
+            get_metrics().merge(snapshot)
+        if error is None:
+            dfs.append(df)
+        else:
+            errors.append((file, error))
+    return dfs, errors
+
+
+def report_summary(
+        label: str,
+        total: int,
+        errors: List[Tuple[Path, str]],
+        started: float,
+        workers: int
+):
+    """
+    Print a one-line summary of a transform batch plus one line per failed file.
+    """
+    elapsed = time.perf_counter() - started
+    ok = total - len(errors)
+    color = typer.colors.GREEN if not errors else typer.colors.YELLOW
+    typer.secho(
+        f"Transformed {ok}/{total} {label} files in {elapsed:.2f}s "
+        f"using {min(resolve_workers(workers), max(1, total))} worker(s)",
+        fg=color
+    )
+    for file, error in errors:
+        typer.secho(f"  Error processing {file.name}: {error}", fg=typer.colors.RED)
@@ -0,0 +1,123 @@
+"""
+Live-file manifest of a silver dataset.
+
+Compaction never rewrites or deletes a silver file in place. It writes the
+merged files next to the old ones and then, in one atomic manifest update,
+lists the new files as live and the merged ones as retired. Readers skip
+retired files, and those files are only deleted by a later compaction once
+a grace period has passed, so a reader that listed the directory before the
+swap can still open every file it saw. Files written after the manifest was
+last updated (e.g. by a transform running during compaction) are not in the
+manifest at all and count as live.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_FILE = "_manifest.json"
+
+
+class SilverManifest:
+    """
+    JSON-backed record of the compacted and retired files of one silver
+    dataset directory (flat or partitioned), keyed by path relative to it.
+    """
+    def __init__(
+            self,
+            dataset_dir: Path
+    ):
+        self.dataset_dir = Path(dataset_dir)
+        self.path = self.dataset_dir / MANIFEST_FILE
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"files": {}, "retired": {}}
+
+    def _key(self, file: Path) -> str:
+        return Path(file).relative_to(self.dataset_dir).as_posix()
+
+    def is_live(
+            self,
+            file: Path
+    ) -> bool:
+        return self._key(file) not in self.data["retired"]
+
+    def live_files(
+            self,
+            files: List[Path]
+    ) -> List[Path]:
+        """
+        Filter `files` of this dataset down to those readers should use.
+        """
+        return [file for file in files if self.is_live(file)]
+
+    @property
+    def files(self) -> Dict[str, dict]:
+        """
+        Files written by compaction: {relative path: {"rows", "bytes", "compacted_at"}}.
+        """
+        return dict(self.data["files"])
+
+    @property
+    def retired(self) -> Dict[str, str]:
+        """
+        Files superseded by compaction: {relative path: retired at}.
+        """
+        return dict(self.data["retired"])
+
+    def swap(
+            self,
+            written: Dict[Path, int],
+            retired: List[Path]
+    ):
+        """
+        Record `written` ({file: rows}) as live and `retired` as superseded.
+        Takes effect for readers once saved.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        for file in retired:
+            self.data["files"].pop(self._key(file), None)
+            self.data["retired"][self._key(file)] = now
+        for file, rows in written.items():
+            self.data["files"][self._key(file)] = {
+                "rows": rows,
+                "bytes": Path(file).stat().st_size,
+                "compacted_at": now,
+            }
+
+    def expired(
+            self,
+            grace: float,
+            now: Optional[datetime] = None
+    ) -> List[Path]:
+        """
+        Retired files whose grace period of `grace` seconds has passed.
+        """
+        cutoff = (now or datetime.now()) - timedelta(seconds=grace)
+        return [
+            self.dataset_dir / key
+            for key, retired_at in self.data["retired"].items()
+            if datetime.fromisoformat(retired_at) <= cutoff
+        ]
+
+    def forget(
+            self,
+            files: List[Path]
+    ):
+        """
+        Drop deleted files from the manifest.
+        """
+        for file in files:
+            self.data["retired"].pop(self._key(file), None)
+            self.data["files"].pop(self._key(file), None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,239 @@
+"""
+Writers for the silver layer.
+
+Both layouts store the compact column types of src/transform_data/compact.py.
+
+Silver data can be written either as one flat parquet file per run
+(silver/geo/<kind>/<kind>_<timestamp>.parquet) or as a Hive-partitioned
+pyarrow dataset (silver/geo/partitioned/<kind>/chart_date=.../chart_country=...)
+so readers get partition pruning and predicate pushdown.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import typer
+
+from src.config import ROW_GROUP_SIZE, SILVER_COMPRESSION, STREAM_BATCH_SIZE
+from src.transform_data.compact import to_compact_table
+from src.transform_data.silver_manifest import SilverManifest
+from src.transform_data.streaming import stream_to_parquet
+from src.transform_data.watermark import next_part_path
+from src.utils.chart_schemas import get_schema
+from src.transform_data.validation import validate_chart_frame
+from src.utils.metrics import stage
+
+SILVER_LAYOUTS = ("flat", "partitioned")
+COMPRESSIONS = ("zstd", "snappy")
+
+PARTITION_SCHEMA = pa.schema([
+    ("chart_date", pa.date32()),
+    ("chart_country", pa.string()),
+])
+
+def silver_path(
+        output_dir: Path,
+        kind: str,
+        layout: str = "flat"
+) -> Path:
+    """
+    Directory holding silver data of `kind` ('artists' or 'tracks') for a layout.
+    """
+    if layout not in SILVER_LAYOUTS:
+        raise typer.BadParameter(f"Unknown layout '{layout}', expected one of {', '.join(SILVER_LAYOUTS)}")
+    if layout == "partitioned":
+        return Path(output_dir) / "silver" / "geo" / "partitioned" / kind
+    return Path(output_dir) / "silver" / "geo" / kind
+
+
+def quarantine_path(
+        output_dir: Path,
+        kind: str
+) -> Path:
+    """
+    Directory holding rows of `kind` that failed validation, one flat file per run.
+    """
+    return Path(output_dir) / "silver" / "geo" / "quarantine" / kind
+
+
+def write_quarantine(
+        df: pd.DataFrame,
+        output_dir: Path,
+        kind: str,
+        compression: str = SILVER_COMPRESSION
+) -> Optional[Path]:
+    """
+    Write quarantined rows (with their quarantine_reason) under quarantine_path().
+    :return: The written file, None if there were no rows.
+    """
+    if df.empty:
+        return None
+    quarantine_dir = quarantine_path(output_dir, kind)
+    quarantine_dir.mkdir(parents=True, exist_ok=True)
+    output_file = next_part_path(quarantine_dir, kind)
+    df.to_parquet(output_file, index=False, compression=compression)
+    return output_file
+
+
+def silver_files(
+        output_dir: Path,
+        kind: str
+) -> List[Path]:
+    """
+    Every live silver parquet file of `kind`, from both the flat and the partitioned layout.
+    Hidden/temporary files (leading '.' or '_') and files retired by compaction are skipped.
+    """
+    files = []
+    for layout in SILVER_LAYOUTS:
+        dataset_dir = silver_path(output_dir, kind, layout)
+        found = dataset_dir.glob("*.parquet") if layout == "flat" else dataset_dir.rglob("*.parquet")
+        files += SilverManifest(dataset_dir).live_files([f for f in found if not f.name.startswith((".", "_"))])
+    return sorted(files)
+
+
+def open_partitioned(dataset_dir: Path) -> ds.Dataset:
+    """
+    Open a partitioned silver dataset with its Hive partition columns typed.
+    Filters on chart_date/chart_country prune whole directories before any file is read.
+    Files retired by compaction are left out.
+    """
+    partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+    manifest = SilverManifest(dataset_dir)
+    if not manifest.retired:
+        return ds.dataset(dataset_dir, format="parquet", partitioning=partitioning)
+    files = [
+        f.as_posix() for f in sorted(Path(dataset_dir).rglob("*.parquet"))
+        if not f.name.startswith((".", "_")) and manifest.is_live(f)
+    ]
+    return ds.dataset(files, format="parquet", partitioning=partitioning, partition_base_dir=Path(dataset_dir).as_posix())
+
+
+def to_partitioned_table(
+        df: pd.DataFrame,
+        kind: str
+) -> pa.Table:
+    table = to_compact_table(df, kind)
+    # partition values are written as plain strings in the directory names
+    index = table.schema.get_field_index("chart_country")
+    return table.set_column(index, "chart_country", pc.cast(table.column(index), PARTITION_SCHEMA.field("chart_country").type))
+
+
+def stream_silver(
+        files: list,
+        output_dir: Path,
+        kind: str,
+        batch_size: int = STREAM_BATCH_SIZE,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE,
+        quarantine: Optional[List[pd.DataFrame]] = None,
+) -> Tuple[Path, int, List[Tuple[Path, str]]]:
+    """
+    Stream raw files straight into a new flat silver file with bounded memory.
+
+    Each batch is validated before it is written; rows that fail are appended
+    to `quarantine` (if given) instead. Duplicate ranks are only detected
+    within a batch. Raw files that fail to parse are skipped.
+    :return: (written file, number of rows, [(raw file, error)] for skipped files)
+    """
+    if compression not in COMPRESSIONS:
+        raise typer.BadParameter(f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = next_part_path(output_dir, kind)
+
+    def validate(batch: pa.RecordBatch, file: Path) -> pa.RecordBatch:
+        valid, rejected, _ = validate_chart_frame(batch.to_pandas(), kind, source=np.zeros(batch.num_rows))
+        if rejected.empty:
+            return batch
+        if quarantine is not None:
+            quarantine.append(rejected)
+        return pa.RecordBatch.from_pandas(valid, schema=batch.schema, preserve_index=False)
+
+    # parsing and writing are interleaved when streaming, so they are timed as one stage
+    with stage("stream", bytes_read=sum(Path(f).stat().st_size for f in files)) as timer:
+        rows, errors = stream_to_parquet(
+            files,
+            kind,
+            output_file,
+            batch_size=batch_size,
+            compression=compression,
+            row_group_size=row_group_size,
+            dictionary_columns=list(get_schema(kind).dictionary_columns),
+            on_batch=validate,
+        )
+        timer.add(records=rows, bytes_written=output_file.stat().st_size)
+    return output_file, rows, errors
+
+
+def write_silver(
+        df: pd.DataFrame,
+        output_dir: Path,
+        kind: str,
+        layout: str = "flat",
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE,
+        replace_partitions: bool = True,
+) -> Path:
+    """
+    Write a combined silver frame in the requested layout.
+
+    Args:
+        df (pd.DataFrame): Combined chart rows.
+        output_dir (Path): Silver directory from silver_path().
+        kind (str): 'artists' or 'tracks'.
+        layout (str): 'flat' or 'partitioned'.
+        compression (str): 'zstd' or 'snappy'.
+        row_group_size (int): Maximum rows per parquet row group.
+        replace_partitions (bool): For the partitioned layout, replace the
+            country-day partitions being written (full rebuild) instead of
+            adding another file to them (incremental append).
+
+    :return: The written file (flat) or the dataset directory (partitioned).
+    """
+    if compression not in COMPRESSIONS:
+        raise typer.BadParameter(f"Unknown compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dictionary_columns = [c for c in get_schema(kind).dictionary_columns if c in df.columns]
+
+    if layout == "flat":
+        output_file = next_part_path(output_dir, kind)
+        with stage("write", records=len(df)) as timer:
+            pq.write_table(
+                to_compact_table(df, kind),
+                output_file,
+                compression=compression,
+                row_group_size=row_group_size,
+                use_dictionary=dictionary_columns,
+            )
+            timer.add(bytes_written=output_file.stat().st_size)
+        return output_file
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    file_format = ds.ParquetFileFormat()
+    with stage("write", records=len(df)) as timer:
+        ds.write_dataset(
+            to_partitioned_table(df, kind),
+            output_dir,
+            format=file_format,
+            file_options=file_format.make_write_options(
+                compression=compression,
+                use_dictionary=dictionary_columns,
+            ),
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            basename_template=f"{kind}-{run_id}-{{i}}.parquet",
+            existing_data_behavior="delete_matching" if replace_partitions else "overwrite_or_ignore",
+            max_rows_per_group=row_group_size,
+            max_rows_per_file=0,
+            file_visitor=lambda written: timer.add(bytes_written=written.size),
+        )
+    return output_dir
@@ -0,0 +1,192 @@
+"""
+Streaming transform for very large raw chart files.
+
+Records are read incrementally from each raw file and yielded in fixed-size
+batches, converted to Arrow record batches and appended to the silver file
+with a pyarrow ParquetWriter, so peak memory is bounded by the batch size
+rather than by the size or number of raw files.
+
+A raw file that fails to parse is skipped and reported, like in the
+in-memory transform. Each file's batches are spooled to a temporary Arrow
+IPC file as they are read and only replayed into the silver file once the
+raw file has been read to the end, so none of a failed file's rows are
+written and memory stays bounded by the batch size.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.transform_data.compact import compact_schema, to_compact_table
+from src.transform_data.fast_parse import extract_columns, parse_file_metadata
+from src.utils.chart_schemas import get_schema
+from src.utils.raw_io import iter_records
+
+
+def chart_schema(kind: str) -> pa.Schema:
+    """
+    Arrow schema of parsed chart records of `kind`, matching the fast-path parser.
+    Batches are cast to the compact silver schema when they are written.
+    """
+    fields = [
+        pa.field(f.column, pa.int64() if f.dtype is int else pa.string())
+        for f in get_schema(kind).fields
+    ]
+    fields += [
+        pa.field("chart_country", pa.string()),
+        pa.field("chart_date", pa.timestamp("us")),
+        pa.field("load_time", pa.timestamp("us")),
+    ]
+    return pa.schema(fields)
+
+
+def iter_record_batches(
+        path: Path,
+        kind: str,
+        batch_size: int
+) -> Iterator[List[dict]]:
+    """
+    Yield the records of a raw chart file (any raw format) in lists of at most `batch_size`.
+    """
+    batch = []
+    for record in iter_records(path, kind):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_arrow_batches(
+        path: Path,
+        kind: str,
+        batch_size: int,
+        schema: pa.Schema
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yield Arrow record batches with silver columns for one raw chart file.
+    """
+    country, chart_date = parse_file_metadata(path)
+    load_time = datetime.now()
+    for records in iter_record_batches(path, kind, batch_size):
+        columns = extract_columns(records, kind)
+        n = len(records)
+        columns["chart_country"] = [country] * n
+        columns["chart_date"] = [chart_date] * n
+        columns["load_time"] = [load_time] * n
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+class FileSpool:
+    """
+    Temporary on-disk buffer for the batches of one raw file.
+    """
+    def __init__(
+            self,
+            path: Path,
+            schema: pa.Schema
+    ):
+        self.path = Path(path)
+        self._sink = pa.OSFile(str(self.path), "wb")
+        self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write(self, batch: pa.RecordBatch):
+        self._writer.write_batch(batch)
+
+    def _close(self):
+        if not self._sink.closed:
+            self._writer.close()
+            self._sink.close()
+
+    def replay(self) -> Iterator[pa.RecordBatch]:
+        """
+        Yield the spooled batches one at a time, then delete the spool.
+        """
+        self._close()
+        try:
+            with pa.OSFile(str(self.path), "rb") as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+        finally:
+            self.path.unlink(missing_ok=True)
+
+    def discard(self):
+        self._close()
+        self.path.unlink(missing_ok=True)
+
+
+def stream_to_parquet(
+        files: List[Path],
+        kind: str,
+        output_file: Path,
+        batch_size: int,
+        compression: str,
+        row_group_size: int,
+        dictionary_columns: List[str],
+        on_batch: Optional[Callable[[pa.RecordBatch, Path], pa.RecordBatch]] = None
+) -> Tuple[int, List[Tuple[Path, str]]]:
+    """
+    Stream every raw file of `kind` into a single parquet file with the compact silver schema.
+    `on_batch(batch, raw file)`, if given, returns the part of each batch to write.
+
+    Batches are buffered only until they fill one row group, so memory is
+    bounded by `row_group_size` rows. Each raw file is first streamed into a
+    FileSpool; a file that fails part-way is skipped without writing any of
+    its rows. The parquet file is written under a temporary name and only
+    renamed into place once every input has been read, so a write failure
+    never leaves a partial silver file behind.
+
+    :return: (number of rows written, [(raw file, error)] for skipped files)
+    """
+    schema = chart_schema(kind)
+    tmp_file = output_file.with_name(f".{output_file.name}.tmp")
+    spool_file = output_file.with_name(f".{output_file.name}.spool")
+    rows = 0
+    pending, pending_rows = [], 0
+    errors: List[Tuple[Path, str]] = []
+    try:
+        with pq.ParquetWriter(
+                tmp_file,
+                compact_schema(kind),
+                compression=compression,
+                use_dictionary=dictionary_columns,
+        ) as writer:
+            for file in files:
+                spool = FileSpool(spool_file, schema)
+                try:
+                    for batch in iter_arrow_batches(file, kind, batch_size, schema):
+                        spool.write(batch)
+                except Exception as e:
+                    spool.discard()
+                    errors.append((Path(file), str(e)))
+                    continue
+                for batch in spool.replay():
+                    if on_batch is not None:
+                        batch = on_batch(batch, file)
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    if pending_rows >= row_group_size:
+                        # write whole row groups only and carry the remainder over
+                        table = pa.Table.from_batches(pending, schema)
+                        full = (table.num_rows // row_group_size) * row_group_size
+                        writer.write_table(to_compact_table(table.slice(0, full), kind), row_group_size=row_group_size)
+                        rows += full
+                        rest = table.slice(full)
+                        pending, pending_rows = rest.to_batches(), rest.num_rows
+            if pending:
+                writer.write_table(
+                    to_compact_table(pa.Table.from_batches(pending, schema), kind), row_group_size=row_group_size
+                )
+                rows += pending_rows
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        spool_file.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_file, output_file)
+    return rows, errors
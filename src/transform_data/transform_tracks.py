@@ -1,120 +1,56 @@
 """
-Transform Last.fm artist data into parquet format.
-This script reads raw country-level artist chart data from data/raw/geo/tracks/,
+Transform Last.fm track data into parquet format.
+This script reads raw country-level track chart data from data/raw/geo/tracks/,
 cleans and flattens the data, and writes the transformed data to data/silver/geo/tracks/
+
+The transform itself is the shared schema-driven engine in
+src.transform_data.engine; this module keeps the track-only entry points.
 """
 
-import json
-import pandas as pd
 import typer
 from pathlib import Path
-from datetime import datetime
-from src.config import TRACKS_JSON_PATH, OUTPUT_DIR
-from src.transform_data.transform_artists import transform_artist_data_country
+from src.config import (
+    TRACKS_JSON_PATH, OUTPUT_DIR, ROW_GROUP_SIZE, SILVER_COMPRESSION, SILVER_LAYOUT, STREAM_BATCH_SIZE,
+    TRANSFORM_ENGINE, TRANSFORM_WORKERS
+)
+from src.lastfm_fetch.manifest import last_run_was_noop
+from src.transform_data.engine import transform_chart_file, transform_kind
+from src.utils.metrics import write_run_report
 
 app = typer.Typer()
 
 def transform_track_data_country(
-        file_path: Path
+        file_path: Path,
+        engine: str = TRANSFORM_ENGINE
 ):
-
     """
-    Process and transform raw track JSON data into parquet format.
-    :param file_path:
-    :return:
+    Process and transform one raw track chart file into a silver DataFrame.
     """
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Extract country and tracks list
-    tracks = data['tracks']['track']
-    df = pd.json_normalize(tracks)
-
-    # rename and select relevant columns
-    df.rename(
-        columns={
-            "@attr.rank": "rank",
-            "name" : "track_name",
-            "duration" : "track_duration",
-            "listeners" : "track_listeners",
-            "mbid" : "track_mbid",
-            "url" : "track_url",
-            "artist.name" : "artist_name",
-            "artist.mbid" : "artist_mbid",
-            "artist.url" : "artist_url",
-        },
-        inplace=True
-    )
-
-    df = df.drop('image', axis=1)
-
-    # infer metadata from file
-    parts = file_path.stem.split("_")
-    country = "_".join(parts[:-2])
-    date_str = parts[-2]
-
-    try:
-        chart_date = datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        typer.echo(f"Invalid date format: {date_str}")
-        chart_date = datetime.today().date()
-
-    # Add metadata columns
-    df['chart_country'] = country
-    df['chart_date'] = chart_date
-    df['load_time'] = datetime.now()
-
-    # fix column types
-    df['rank'] = df['rank'].astype(int)
-    df['track_listeners'] = df['track_listeners'].astype(int)
-
-    return df
+    return transform_chart_file(file_path, "tracks", engine)
 
 def transform_json_data(
         json_path: Path,
-        output_dir: Path
+        output_dir: Path,
+        workers: int = TRANSFORM_WORKERS,
+        incremental: bool = False,
+        layout: str = SILVER_LAYOUT,
+        compression: str = SILVER_COMPRESSION,
+        row_group_size: int = ROW_GROUP_SIZE,
+        streaming: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE
 ):
-    if not json_path.exists():
-        typer.echo(f"File not found: {json_path}")
-        raise typer.Exit(1)
-
-    json_files = sorted(json_path.glob("*.json"))
-    if not json_files:
-        typer.echo(f"No .json files found: {json_path}")
-        raise typer.Exit(1)
-
-    typer.echo(f"Found {len(json_files)} .json files")
-
-    all_dfs = []
-    for file in json_files:
-        typer.echo(f"Processing {file}")
-        try:
-            df = transform_track_data_country(file)
-            all_dfs.append(df)
-        except Exception as e:
-            typer.secho(f"Error processing {file.name}: {e}", fg=typer.colors.RED)
-        else:
-            typer.echo(f"Finished processing {file.name}")
-
-    if not all_dfs:
-        typer.secho(f"No data found: {json_path}", fg=typer.colors.RED)
-        raise typer.Exit(1)
-
-    # combine all dataframes
-    combined_df = pd.concat(all_dfs)
-    typer.echo("Combined dataframe shape: {combined_df.shape}")
-
-    output_dir = Path(output_dir / 'silver' / 'geo' / 'tracks')
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # save as parquet
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = output_dir / f"tracks_{timestamp}.parquet"
-    combined_df.to_parquet(output_file, index=False)
-
-    typer.secho(f"Saved combined parquet → {output_file}", fg=typer.colors.BRIGHT_GREEN)
-    typer.echo("All artist JSONs combined successfully.")
+    return transform_kind(
+        "tracks",
+        json_path,
+        output_dir,
+        workers=workers,
+        incremental=incremental,
+        layout=layout,
+        compression=compression,
+        row_group_size=row_group_size,
+        streaming=streaming,
+        batch_size=batch_size,
+    )
 
 
 # CLI entry point
@@ -131,9 +67,57 @@ def main(
             "-o",
             help="Output directory for transformed parquet files",
         ),
+        workers: int = typer.Option(
+            TRANSFORM_WORKERS,
+            "--workers",
+            "-w",
+            help="Number of processes used to parse files (0 uses every CPU core)",
+        ),
+        incremental: bool = typer.Option(
+            False,
+            "--incremental",
+            "-i",
+            help="Only transform raw files not seen by a previous incremental run and append them",
+        ),
+        layout: str = typer.Option(
+            SILVER_LAYOUT,
+            "--layout",
+            help="Silver layout: 'flat' (one file per run) or 'partitioned' (chart_date/chart_country dataset)",
+        ),
+        compression: str = typer.Option(
+            SILVER_COMPRESSION,
+            "--compression",
+            help="Parquet compression codec: 'zstd' or 'snappy'",
+        ),
+        row_group_size: int = typer.Option(
+            ROW_GROUP_SIZE,
+            "--row-group-size",
+            help="Maximum rows per parquet row group",
+        ),
+        streaming: bool = typer.Option(
+            False,
+            "--streaming",
+            help="Stream records into parquet in fixed-size batches to bound memory (flat layout only)",
+        ),
+        batch_size: int = typer.Option(
+            STREAM_BATCH_SIZE,
+            "--batch-size",
+            help="Records per batch in --streaming mode",
+        ),
+        skip_if_noop: bool = typer.Option(
+            False,
+            "--skip-if-noop",
+            help="Do nothing if the last ingestion run found no changed charts",
+        ),
 ):
-    transform_json_data(json_path, output_dir)
+    if skip_if_noop and last_run_was_noop():
+        typer.echo("Last ingestion run was a no-op, skipping track transform.")
+        return
+    transform_json_data(
+        json_path, output_dir, workers, incremental, layout, compression, row_group_size, streaming, batch_size
+    )
+    typer.echo(f"Run report → {write_run_report('transform_tracks')}")
 
 if __name__ == "__main__":
     app.command()(main)
-    app()
\ No newline at end of file
+    app()
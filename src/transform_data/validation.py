@@ -0,0 +1,144 @@
+"""
+validation.py
+Columnar checks run on combined silver rows before they are written.
+
+Every check is a vectorized mask over the whole frame, so validation costs a
+few passes over a handful of columns rather than a Python loop over records.
+Rows that fail a row-level check are routed to a quarantine dataset with the
+reason they failed instead of failing their whole file:
+
+    missing_value   a required column (see ChartSchema.required_columns) is null or empty
+    invalid_number  an integer column did not parse
+    negative_value  an integer column (rank, listeners) is below zero
+    out_of_range    an integer column does not fit its compact storage type (int16 ranks, int32 listeners)
+    bad_date        the chart date could not be parsed from the file name, or lies in the future
+    duplicate_rank  a rank already seen in the same raw file
+
+Chart-level checks (rank contiguity per raw file, the share of empty MBIDs)
+only report, as gaps and missing MBIDs are real in Last.fm charts.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import typer
+
+from src.config import VALIDATION_MAX_EMPTY_MBID_RATE
+from src.utils.chart_schemas import get_schema
+from src.utils.metrics import get_metrics, stage
+
+REASON_COLUMN = "quarantine_reason"
+
+
+@dataclass
+class ValidationReport:
+    kind: str
+    rows: int = 0
+    quarantined: Dict[str, int] = field(default_factory=dict)  # {reason: rows}
+    rank_gaps: int = 0  # raw files whose ranks are not contiguous
+    empty_mbid_rate: Dict[str, float] = field(default_factory=dict)  # {mbid column: share null or empty}
+
+    @property
+    def quarantined_rows(self) -> int:
+        return sum(self.quarantined.values())
+
+
+def _blank(column: pd.Series) -> np.ndarray:
+    blank = column.isna().to_numpy()
+    if not pd.api.types.is_numeric_dtype(column):
+        blank = blank | (column.astype("string").str.strip() == "").fillna(False).to_numpy(dtype=bool)
+    return blank
+
+
+def _any(masks, rows: int) -> np.ndarray:
+    return np.logical_or.reduce(masks) if masks else np.zeros(rows, dtype=bool)
+
+
+def _out_of_range(column: pd.Series, storage: str) -> np.ndarray:
+    """Values that would not survive the safe cast to `storage` when silver is written."""
+    if storage not in ("int16", "int32"):
+        return np.zeros(len(column), dtype=bool)
+    bounds = np.iinfo(storage)
+    return ((column < bounds.min) | (column > bounds.max)).fillna(False).to_numpy(dtype=bool)
+
+
+def validate_chart_frame(
+        df: pd.DataFrame,
+        kind: str,
+        source: Optional[np.ndarray] = None,
+        now: Optional[pd.Timestamp] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, ValidationReport]:
+    """
+    Split combined chart rows of `kind` into valid and quarantined rows.
+
+    Args:
+        df (pd.DataFrame): Rows of one or more raw files, as parsed.
+        kind (str): Registered chart type.
+        source (np.ndarray): Raw file id of each row; ranks must be unique
+            and contiguous per id. Defaults to (chart_country, chart_date).
+        now (pd.Timestamp): Latest acceptable chart date, default now.
+
+    :return: (valid rows with integer columns as int64, quarantined rows with
+        a quarantine_reason column, report)
+    """
+    schema = get_schema(kind)
+    report = ValidationReport(kind, rows=len(df))
+    with stage("validate", records=len(df)):
+        if source is None:
+            source = df.groupby(["chart_country", "chart_date"], sort=False, dropna=False).ngroup().to_numpy()
+        source = np.asarray(source)
+
+        # first failing check wins, so each quarantined row has one reason
+        n = len(df)
+        reasons = [
+            ("missing_value", _any([_blank(df[c]) for c in schema.required_columns], n)),
+            ("invalid_number", _any([df[c].isna().to_numpy() for c in schema.int_columns], n)),
+            ("negative_value", _any([(df[c] < 0).fillna(False).to_numpy(dtype=bool) for c in schema.int_columns], n)),
+            ("out_of_range", _any([_out_of_range(df[c], schema.storage[c]) for c in schema.int_columns], n)),
+        ]
+        latest = np.datetime64(now if now is not None else pd.Timestamp.now(), "us")
+        dates = df["chart_date"].to_numpy(dtype="datetime64[us]")
+        reasons.append(("bad_date", np.isnat(dates) | (dates > latest)))
+        ranks = pd.DataFrame({"source": source, "rank": df["rank"].to_numpy()})
+        reasons.append(("duplicate_rank", (ranks.duplicated() & ranks["rank"].notna()).to_numpy()))
+
+        bad = np.zeros(n, dtype=bool)
+        reason = np.empty(n, dtype=object)
+        for name, mask in reasons:
+            new = mask & ~bad
+            if new.any():
+                reason[new] = name
+                report.quarantined[name] = int(new.sum())
+                bad |= new
+
+        valid = df[~bad]
+        quarantine = df[bad].assign(**{REASON_COLUMN: reason[bad]})
+        valid = valid.astype({c: "int64" for c in schema.int_columns if valid[c].dtype != "int64"})
+
+        # chart-level checks, on the rows that will be written
+        rank_stats = pd.Series(valid["rank"].to_numpy()).groupby(source[~bad]).agg(["min", "max", "count"])
+        report.rank_gaps = int((rank_stats["max"] - rank_stats["min"] + 1 != rank_stats["count"]).sum())
+        for column in (c for c in schema.columns if c.endswith("_mbid")):
+            report.empty_mbid_rate[column] = float(_blank(valid[column]).mean()) if len(valid) else 0.0
+
+    metrics = get_metrics()
+    for name, rows in report.quarantined.items():
+        metrics.count(f"quarantined_{name}", rows)
+    return valid, quarantine, report
+
+
+def print_report(report: ValidationReport):
+    label = get_schema(report.kind).label
+    if report.quarantined:
+        reasons = ", ".join(f"{rows} {name}" for name, rows in report.quarantined.items())
+        typer.secho(
+            f"Quarantined {report.quarantined_rows} of {report.rows} {label} rows ({reasons})",
+            fg=typer.colors.YELLOW
+        )
+    if report.rank_gaps:
+        typer.secho(f"{report.rank_gaps} {label} charts have gaps in their ranks", fg=typer.colors.YELLOW)
+    for column, rate in report.empty_mbid_rate.items():
+        if rate > VALIDATION_MAX_EMPTY_MBID_RATE:
+            typer.secho(f"{rate:.0%} of {label} rows have no {column}", fg=typer.colors.YELLOW)
@@ -0,0 +1,126 @@
+"""
+Processed-file watermark for incremental silver builds.
+
+Records which raw files have already been transformed (by path, mtime, size
+and content hash) together with the silver part files they were written to,
+so each incremental run only reads raw files that are new or have changed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+WATERMARK_FILE = "_processed.json"
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def next_part_path(
+        silver_dir: Path,
+        prefix: str
+) -> Path:
+    """
+    Timestamped path for a new silver file that never overwrites an existing one.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    candidate = Path(silver_dir) / f"{prefix}_{timestamp}.parquet"
+    counter = 1
+    while candidate.exists():
+        candidate = Path(silver_dir) / f"{prefix}_{timestamp}_{counter}.parquet"
+        counter += 1
+    return candidate
+
+
+class ProcessedFiles:
+    """
+    JSON-backed watermark stored next to the silver output.
+
+    A raw file counts as processed when its path is recorded with the same
+    mtime and size, or, if those changed (e.g. after a fresh git checkout),
+    with the same content hash.
+    """
+    def __init__(
+            self,
+            silver_dir: Path
+    ):
+        self.path = Path(silver_dir) / WATERMARK_FILE
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"files": {}, "parts": []}
+
+    @staticmethod
+    def _key(file: Path) -> str:
+        return Path(file).as_posix()
+
+    def is_processed(
+            self,
+            file: Path
+    ) -> bool:
+        entry = self.data["files"].get(self._key(file))
+        if entry is None:
+            return False
+        stat = os.stat(file)
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return True
+        if entry["sha256"] == file_hash(file):
+            # Same content with a new mtime; remember the new stat to skip hashing next time
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            return True
+        return False
+
+    def new_files(
+            self,
+            files: List[Path]
+    ) -> List[Path]:
+        """
+        Filter `files` down to those not yet transformed.
+        """
+        return [file for file in files if not self.is_processed(file)]
+
+    def mark(
+            self,
+            files: List[Path],
+            output_file: Path
+    ):
+        """
+        Record `files` as transformed into the silver part `output_file`
+        (or into a partitioned dataset directory, which is not listed as a part).
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        for file in files:
+            stat = os.stat(file)
+            self.data["files"][self._key(file)] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": file_hash(file),
+                "output": Path(output_file).name,
+                "processed_at": now,
+            }
+        if Path(output_file).is_file():
+            self.data["parts"].append(Path(output_file).name)
+
+    @property
+    def parts(self) -> List[str]:
+        """
+        Names of the silver part files written by incremental runs, oldest first.
+        """
+        return list(self.data["parts"])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
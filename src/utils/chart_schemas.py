@@ -0,0 +1,114 @@
+"""
+Declarative registry of the Last.fm chart payloads the pipeline handles.
+
+Each chart type is described once: the API method that returns it, where its
+records sit in the payload (data[root_key][record_key]), and how record
+fields map to typed silver columns. Ingestion, the raw readers and writers,
+the fast parser, the streaming writer and the transform engine all read
+this registry, so a new chart endpoint only needs a `register_chart` call.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class Field(NamedTuple):
+    column: str  # silver column name
+    path: Tuple[str, ...]  # keys into each raw record, at most two deep
+    dtype: type  # int or str, as parsed
+    # compact silver type (see src/transform_data/compact.py): 'int16', 'int32',
+    # 'int64', 'bool', 'category' or 'string'; default int64/string by dtype
+    storage: str = ""
+
+
+@dataclass(frozen=True)
+class ChartSchema:
+    kind: str  # chart type and raw/silver directory name, e.g. 'artists'
+    label: str  # singular, for messages
+    method: str  # Last.fm API method
+    root_key: str
+    record_key: str
+    fields: Tuple[Field, ...]
+    # string columns with few distinct values, dictionary-encoded in parquet
+    dictionary_columns: Tuple[str, ...] = ()
+    # columns a row cannot be loaded without; rows missing one are quarantined
+    required_columns: Tuple[str, ...] = ("rank",)
+
+    @property
+    def columns(self) -> List[str]:
+        return [f.column for f in self.fields]
+
+    @property
+    def int_columns(self) -> List[str]:
+        return [f.column for f in self.fields if f.dtype is int]
+
+    @property
+    def storage(self) -> Dict[str, str]:
+        """
+        Compact silver type of every field column.
+        """
+        return {f.column: f.storage or ("int64" if f.dtype is int else "string") for f in self.fields}
+
+    @property
+    def rename_map(self) -> Dict[str, str]:
+        """
+        pd.json_normalize column name → silver column name.
+        """
+        return {".".join(f.path): f.column for f in self.fields if ".".join(f.path) != f.column}
+
+
+CHART_SCHEMAS: Dict[str, ChartSchema] = {}
+
+
+def register_chart(schema: ChartSchema) -> ChartSchema:
+    CHART_SCHEMAS[schema.kind] = schema
+    return schema
+
+
+def get_schema(kind: str) -> ChartSchema:
+    try:
+        return CHART_SCHEMAS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown chart type '{kind}', expected one of {', '.join(CHART_SCHEMAS)}") from None
+
+
+register_chart(ChartSchema(
+    kind="artists",
+    label="artist",
+    method="geo.gettopartists",
+    root_key="topartists",
+    record_key="artist",
+    fields=(
+        Field("artist_name", ("name",), str, "category"),
+        Field("artist_listeners", ("listeners",), int, "int32"),
+        Field("artist_url", ("url",), str),
+        Field("streamable", ("streamable",), str, "bool"),
+        Field("rank", ("@attr", "rank"), int, "int16"),
+        Field("artist_mbid", ("mbid",), str, "category"),
+    ),
+    dictionary_columns=("artist_name", "artist_mbid", "artist_url"),
+    required_columns=("artist_name", "rank"),
+))
+
+register_chart(ChartSchema(
+    kind="tracks",
+    label="track",
+    method="geo.gettoptracks",
+    root_key="tracks",
+    record_key="track",
+    fields=(
+        Field("track_name", ("name",), str, "category"),
+        Field("track_duration", ("duration",), str),
+        Field("track_listeners", ("listeners",), int, "int32"),
+        Field("track_mbid", ("mbid",), str, "category"),
+        Field("track_url", ("url",), str),
+        Field("streamable.#text", ("streamable", "#text"), str, "bool"),
+        Field("streamable.fulltrack", ("streamable", "fulltrack"), str, "bool"),
+        Field("artist_name", ("artist", "name"), str, "category"),
+        Field("artist_mbid", ("artist", "mbid"), str, "category"),
+        Field("artist_url", ("artist", "url"), str),
+        Field("rank", ("@attr", "rank"), int, "int16"),
+    ),
+    dictionary_columns=("track_name", "track_mbid", "track_url", "artist_name", "artist_mbid", "artist_url"),
+    required_columns=("track_name", "artist_name", "rank"),
+))
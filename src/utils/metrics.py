@@ -0,0 +1,298 @@
+"""
+metrics.py
+Per-stage timing and throughput instrumentation for the pipeline.
+
+Code under measurement wraps each unit of work in a stage:
+
+    with stage("parse", bytes_read=path.stat().st_size) as s:
+        data = load_payload(path)
+        s.add(records=len(records))
+
+and the HTTP client reports every attempt with observe_http(). Stages
+accumulate calls, seconds, records and bytes in a process-wide RunMetrics;
+at the end of a run write_run_report() saves a JSON report (and optionally a
+Prometheus textfile) and starts a fresh collection. Individual stage events
+are logged with loguru at TRACE level.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.config import METRICS_DIR, PROMETHEUS_TEXTFILE_DIR
+
+STAGE_FIELDS = ("calls", "seconds", "records", "bytes_read", "bytes_written", "max_seconds")
+LATENCY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass
+class StageTimer:
+    """Handle yielded by stage() to attach volumes to the running stage."""
+    records: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def add(
+            self,
+            records: int = 0,
+            bytes_read: int = 0,
+            bytes_written: int = 0
+    ):
+        self.records += records
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+
+class RunMetrics:
+    """
+    Thread-safe accumulator of stage timings, HTTP latencies and counters for one run.
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now()
+        self.stages = {}
+        self.http_latencies = []
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(
+            self,
+            name: str,
+            records: int = 0,
+            bytes_read: int = 0,
+            bytes_written: int = 0
+    ) -> Iterator[StageTimer]:
+        timer = StageTimer(records, bytes_read, bytes_written)
+        started = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            seconds = time.perf_counter() - started
+            self.record_stage(name, seconds, timer.records, timer.bytes_read, timer.bytes_written)
+            logger.trace(
+                "stage {stage} took {seconds:.4f}s ({records} records)",
+                stage=name, seconds=seconds, records=timer.records,
+            )
+
+    def record_stage(
+            self,
+            name: str,
+            seconds: float,
+            records: int = 0,
+            bytes_read: int = 0,
+            bytes_written: int = 0
+    ):
+        with self._lock:
+            s = self.stages.setdefault(name, dict.fromkeys(STAGE_FIELDS, 0))
+            s["calls"] += 1
+            s["seconds"] += seconds
+            s["records"] += records
+            s["bytes_read"] += bytes_read
+            s["bytes_written"] += bytes_written
+            s["max_seconds"] = max(s["max_seconds"], seconds)
+
+    def observe_http(
+            self,
+            seconds: float,
+            status,
+            nbytes: int = 0
+    ):
+        """Record one HTTP attempt; `status` is the HTTP status or an error name."""
+        with self._lock:
+            self.http_latencies.append(seconds)
+            self.counters["http_requests"] += 1
+            self.counters[f"http_status_{status}"] += 1
+            self.counters["http_bytes"] += nbytes
+
+    def count(
+            self,
+            name: str,
+            value: float = 1
+    ):
+        with self._lock:
+            self.counters[name] += value
+
+    def snapshot(self) -> dict:
+        """Picklable copy of the raw measurements, e.g. to return from a worker process."""
+        with self._lock:
+            return {
+                "stages": {name: dict(s) for name, s in self.stages.items()},
+                "http_latencies": list(self.http_latencies),
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, snapshot: dict):
+        """Fold a snapshot from another process into this run."""
+        with self._lock:
+            for name, s in snapshot["stages"].items():
+                target = self.stages.setdefault(name, dict.fromkeys(STAGE_FIELDS, 0))
+                for field in STAGE_FIELDS:
+                    if field == "max_seconds":
+                        target[field] = max(target[field], s[field])
+                    else:
+                        target[field] += s[field]
+            self.http_latencies.extend(snapshot["http_latencies"])
+            self.counters.update(snapshot["counters"])
+
+    def report(self, name: str) -> dict:
+        """Machine-readable summary of the run."""
+        finished_at = datetime.now()
+        snapshot = self.snapshot()
+        stages = {}
+        for stage_name, s in snapshot["stages"].items():
+            seconds = s["seconds"]
+            stages[stage_name] = {
+                **s,
+                "seconds": round(seconds, 6),
+                "max_seconds": round(s["max_seconds"], 6),
+                "records_per_s": round(s["records"] / seconds, 1) if seconds and s["records"] else None,
+                "mb_per_s": round((s["bytes_read"] + s["bytes_written"]) / seconds / 1e6, 3) if seconds else None,
+            }
+
+        latencies = np.asarray(snapshot["http_latencies"])
+        counters = snapshot["counters"]
+        http = {
+            "requests": int(counters.get("http_requests", 0)),
+            "retries": int(counters.get("http_retries", 0)),
+            "bytes": int(counters.get("http_bytes", 0)),
+            "statuses": {
+                k.removeprefix("http_status_"): v for k, v in counters.items() if k.startswith("http_status_")
+            },
+            "latency_ms": {
+                f"p{int(q * 100)}": round(float(np.quantile(latencies, q)) * 1000, 2) for q in LATENCY_QUANTILES
+            } if latencies.size else {},
+        }
+        if latencies.size:
+            http["latency_ms"]["max"] = round(float(latencies.max()) * 1000, 2)
+
+        return {
+            "run": name,
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": finished_at.isoformat(timespec="seconds"),
+            "duration_s": round((finished_at - self.started_at).total_seconds(), 3),
+            "stages": stages,
+            "http": http,
+            "counters": {k: v for k, v in counters.items() if not k.startswith("http_")},
+        }
+
+
+def to_prometheus(report: dict) -> str:
+    """
+    Render a run report in the Prometheus text exposition format.
+    """
+    run = report["run"]
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP music_warehouse_{name} {help_text}")
+        lines.append(f"# TYPE music_warehouse_{name} {kind}")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{v}"' for k, v in {"run": run, **labels}.items())
+            lines.append(f"music_warehouse_{name}{{{label_str}}} {value}")
+
+    stages = report["stages"]
+    metric("stage_seconds", "gauge", "Total seconds spent in a pipeline stage",
+           [({"stage": n}, s["seconds"]) for n, s in stages.items()])
+    metric("stage_calls", "gauge", "Number of times a stage ran",
+           [({"stage": n}, s["calls"]) for n, s in stages.items()])
+    metric("stage_records", "gauge", "Records processed by a stage",
+           [({"stage": n}, s["records"]) for n, s in stages.items()])
+    metric("stage_bytes_read", "gauge", "Bytes read by a stage",
+           [({"stage": n}, s["bytes_read"]) for n, s in stages.items()])
+    metric("stage_bytes_written", "gauge", "Bytes written by a stage",
+           [({"stage": n}, s["bytes_written"]) for n, s in stages.items()])
+
+    http = report["http"]
+    metric("http_requests", "gauge", "HTTP attempts made to the Last.fm API", [({}, http["requests"])])
+    metric("http_retries", "gauge", "HTTP attempts that were retried", [({}, http["retries"])])
+    metric("http_latency_seconds", "gauge", "HTTP latency quantiles", [
+        ({"quantile": str(q)}, http["latency_ms"][f"p{int(q * 100)}"] / 1000)
+        for q in LATENCY_QUANTILES if f"p{int(q * 100)}" in http["latency_ms"]
+    ])
+
+    metric("run_duration_seconds", "gauge", "Wall-clock duration of the run", [({}, report["duration_s"])])
+    metric("run_finished_timestamp_seconds", "gauge", "Unix time the run finished",
+           [({}, datetime.fromisoformat(report["finished_at"]).timestamp())])
+    return "\n".join(lines) + "\n"
+
+
+_metrics = RunMetrics()
+
+
+def get_metrics() -> RunMetrics:
+    return _metrics
+
+
+def reset_metrics() -> RunMetrics:
+    global _metrics
+    _metrics = RunMetrics()
+    return _metrics
+
+
+def stage(name: str, **volumes):
+    """Time a unit of work in the current run; see RunMetrics.stage."""
+    return _metrics.stage(name, **volumes)
+
+
+def _write_atomic(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_run_report(
+        name: str,
+        metrics_dir: Optional[Path] = None,
+        textfile_dir: Optional[Path] = None,
+        reset: bool = True
+) -> Path:
+    """
+    Save the current run as <metrics_dir>/<name>_<timestamp>.json, log a
+    per-stage summary, and, if a textfile directory is configured, export
+    <textfile_dir>/music_warehouse_<name>.prom for the node_exporter.
+
+    With `reset`, a new run starts afterwards. Stages that end partway
+    through a larger run (e.g. ingestion inside a scheduled pipeline run)
+    pass reset=False so later stages keep the same run_id and metrics.
+
+    :return: Path of the JSON report.
+    """
+    report = _metrics.report(name)
+    metrics_dir = Path(metrics_dir or METRICS_DIR)
+    path = metrics_dir / f"{name}_{datetime.now():%Y%m%d_%H%M%S}_{report['run_id']}.json"
+    _write_atomic(path, json.dumps(report, indent=2))
+
+    for stage_name, s in report["stages"].items():
+        logger.info(
+            "{run} {stage}: {calls} calls, {seconds:.3f}s, {records} records ({rate} rec/s), "
+            "{read} B read, {written} B written",
+            run=name, stage=stage_name, calls=s["calls"], seconds=s["seconds"], records=s["records"],
+            rate=s["records_per_s"], read=s["bytes_read"], written=s["bytes_written"],
+        )
+    if report["http"]["requests"]:
+        logger.info("{run} http: {requests} requests, {retries} retries, latency {latency}",
+                    run=name, **{k: report["http"][k] for k in ("requests", "retries")},
+                    latency=report["http"]["latency_ms"])
+
+    textfile_dir = textfile_dir or PROMETHEUS_TEXTFILE_DIR
+    if textfile_dir:
+        _write_atomic(Path(textfile_dir) / f"music_warehouse_{name}.prom", to_prometheus(report))
+
+    if reset:
+        reset_metrics()
+    return path
@@ -0,0 +1,69 @@
+"""
+rate_limiter.py
+Thread-safe token-bucket rate limiter shared by concurrent Last.fm requests.
+Replaces fixed sleeps between calls with a global request budget.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    A token bucket that refills at `rate` tokens per second up to `capacity`.
+
+    Every request takes one token; callers block until a token is available,
+    so any number of worker threads together never exceed the configured rate
+    (apart from an initial burst of at most `capacity` requests).
+    """
+    def __init__(
+            self,
+            rate: float,
+            capacity: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number of requests per second.")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take `tokens` without blocking.
+        :return: True if the tokens were taken, False otherwise.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them.
+        :return: Seconds spent waiting.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}.")
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
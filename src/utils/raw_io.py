@@ -0,0 +1,242 @@
+"""
+Readers and writers for raw (bronze) chart files.
+
+Raw charts can be stored in three formats:
+    json        pretty-printed API payload (the original format)
+    ndjson.gz   compact NDJSON, gzip-compressed
+    ndjson.zst  compact NDJSON, zstd-compressed
+
+NDJSON files start with a header line holding the fetch metadata and the
+payload's @attr block, followed by one chart record per line. Ingestion
+writes and the transforms read raw files through this module, so all
+formats are handled transparently.
+"""
+
+import gzip
+import io
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.utils.chart_schemas import get_schema
+
+try:
+    import orjson
+
+    def _loads(text):
+        return orjson.loads(text)
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:  # pragma: no cover - orjson is optional
+    def _loads(text):
+        return json.loads(text)
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+RAW_FORMATS = {
+    "json": ".json",
+    "ndjson.gz": ".ndjson.gz",
+    "ndjson.zst": ".ndjson.zst",
+}
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n,"
+
+
+def raw_format(path: Path) -> str:
+    name = Path(path).name
+    for fmt, suffix in RAW_FORMATS.items():
+        if name.endswith(suffix):
+            return fmt
+    raise ValueError(f"Unrecognised raw file format: {path}")
+
+
+def raw_stem(path: Path) -> str:
+    """
+    File name without its raw format suffix, e.g. japan_2025-11-11_17-01-13.
+    """
+    name = Path(path).name
+    return name[:-len(RAW_FORMATS[raw_format(path)])]
+
+
+def list_raw_files(directory: Path) -> List[Path]:
+    """
+    All raw chart files in `directory`, in any supported format, sorted by name.
+    """
+    files = []
+    for suffix in RAW_FORMATS.values():
+        files.extend(Path(directory).glob(f"*{suffix}"))
+    return sorted(files)
+
+
+@contextmanager
+def open_text(path: Path):
+    """
+    Open a raw file for reading as text, decompressing on the fly.
+    """
+    fmt = raw_format(path)
+    if fmt == "ndjson.gz":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield f
+    elif fmt == "ndjson.zst":
+        import pyarrow as pa  # zstd codec; imported lazily to keep ingestion startup light
+
+        with pa.input_stream(str(path), compression="zstd") as stream:
+            yield io.TextIOWrapper(stream, encoding="utf-8")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield f
+
+
+def strip_images(records: List[dict]) -> List[dict]:
+    return [{k: v for k, v in record.items() if k != "image"} for record in records]
+
+
+def write_raw(
+        data: dict,
+        path_without_suffix: Path,
+        chart_type: str,
+        fmt: str = "json",
+        drop_images: bool = False,
+        metadata: Optional[dict] = None
+) -> Path:
+    """
+    Write a chart payload in the given raw format.
+    :return: The written path, with the format's suffix appended.
+    """
+    if fmt not in RAW_FORMATS:
+        raise ValueError(f"Unknown raw format '{fmt}', expected one of {', '.join(RAW_FORMATS)}")
+    path = Path(f"{path_without_suffix}{RAW_FORMATS[fmt]}")
+    schema = get_schema(chart_type)
+
+    if fmt == "json":
+        if drop_images:
+            root_key, record_key = schema.root_key, schema.record_key
+            data = {root_key: {**data[root_key], record_key: strip_images(data[root_key][record_key])}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    root_key, record_key = schema.root_key, schema.record_key
+    records = data[root_key][record_key]
+    if drop_images:
+        records = strip_images(records)
+
+    header = {
+        "_meta": {
+            **(metadata or {}),
+            "chart_type": chart_type,
+            "root_key": root_key,
+            "record_key": record_key,
+            "attr": data[root_key].get("@attr", {}),
+            "images_stripped": drop_images,
+            "written_at": datetime.now().isoformat(timespec="seconds"),
+        }
+    }
+    lines = [_dumps(header)] + [_dumps(record) for record in records]
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+
+    if fmt == "ndjson.gz":
+        with gzip.open(path, "wb", compresslevel=6) as f:
+            f.write(body)
+    else:
+        import pyarrow as pa
+
+        with pa.output_stream(str(path), compression="zstd") as f:
+            f.write(body)
+    return path
+
+
+def read_ndjson_header(path: Path) -> dict:
+    with open_text(path) as f:
+        return _loads(f.readline())["_meta"]
+
+
+def load_payload(path: Path) -> dict:
+    """
+    Load a raw file of any format as an API-shaped payload.
+    """
+    if raw_format(path) == "json":
+        with open(path, "rb") as f:
+            return _loads(f.read())
+
+    with open_text(path) as f:
+        meta = _loads(f.readline())["_meta"]
+        records = [_loads(line) for line in f if line.strip()]
+    return {meta["root_key"]: {meta["record_key"]: records, "@attr": meta.get("attr", {})}}
+
+
+def iter_json_records(
+        path: Path,
+        record_key: str,
+        chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    Yield the objects of the `record_key` array in a JSON chart file one at a time.
+
+    The file is read in `chunk_size` pieces and each record is decoded on its
+    own, so only one chunk and one record are held in memory at once.
+    """
+    decoder = json.JSONDecoder()
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(record_key))
+    keep = len(record_key) + 64
+
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        # seek to the opening bracket of the records array
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            match = start.search(buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            if not chunk:
+                raise ValueError(f"No '{record_key}' array found in {path}")
+            buffer = buffer[-keep:]
+
+        eof = False
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                if pos >= len(buffer):
+                    raise ValueError("need more data")
+                record, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise ValueError(f"Truncated '{record_key}' array in {path}")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield record
+            pos = end
+
+
+def iter_records(
+        path: Path,
+        kind: str
+) -> Iterator[dict]:
+    """
+    Stream the chart records of a raw file of any format, one at a time.
+    """
+    record_key = get_schema(kind).record_key
+    if raw_format(path) == "json":
+        yield from iter_json_records(path, record_key)
+        return
+
+    with open_text(path) as f:
+        f.readline()  # header
+        for line in f:
+            if line.strip():
+                yield _loads(line)
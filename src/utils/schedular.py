@@ -1,26 +1,393 @@
+"""
+schedular.py
+Runs the whole pipeline on a schedule: ingest → (artists ∥ tracks transforms) → gold build,
+with metadata enrichment running alongside the transforms.
+
+Steps form a small DAG; a step starts as soon as its dependencies have
+succeeded, so the artist and track transforms run concurrently, and the
+dependents of a failed step are skipped. Transforms are incremental and are
+skipped when ingestion found no changed chart.
+
+Scheduling uses APScheduler with a cron trigger, at most one running
+instance and missed runs coalesced into one. A lock file also stops a
+scheduled run from overlapping a manual one, and on start-up a run is
+triggered immediately if a scheduled run was missed while the scheduler
+was down.
+
+Usage:
+    python -m src.utils.schedular                     # run on PIPELINE_CRON
+    python -m src.utils.schedular --cron "0 */6 * * *"
+    python -m src.utils.schedular --once              # run the pipeline once and exit
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import typer
 from apscheduler.schedulers.blocking import BlockingScheduler
-from datetime import datetime
-from src.clients.lastfm_client import LastfmClient
+from apscheduler.triggers.cron import CronTrigger
+
+from src.clients.lastfm_client import CHART_TYPES, LastfmClient
+from src.config import (
+    ARTIST_JSON_PATH, OUTPUT_DIR, PIPELINE_CRON, PIPELINE_LOCK_PATH, PIPELINE_MISFIRE_GRACE, PIPELINE_STATE_PATH,
+    PIPELINE_TIMEZONE, TRACKS_JSON_PATH
+)
+from src.gold.build_gold import build_gold
+from src.lastfm_fetch import IngestionManifest, last_run_was_noop
+from src.lastfm_fetch.enrichment import Enricher, enrich
+from src.lastfm_fetch.metadata_store import MetadataStore
+from src.transform_data import transform_artists, transform_tracks
+from src.utils.metrics import get_metrics, reset_metrics, write_run_report
+
+
+UPSTREAM_FAILED = "upstream failed"
+
+
+@dataclass(frozen=True)
+class Step:
+    """One pipeline step; `func` returning "skipped" marks it as skipped rather than ok."""
+    name: str
+    func: Callable[[], object]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def ingest_step():
+    client = LastfmClient(limit=50, manifest=IngestionManifest())
+    failures = client.run()
+    if len(failures) == len(client.countries) * len(CHART_TYPES):
+        raise RuntimeError("every chart failed to download")
+
+
+def transform_step(kind: str, output_dir: Path = OUTPUT_DIR):
+    if last_run_was_noop():
+        typer.echo(f"Last ingestion run was a no-op, skipping {kind} transform.")
+        return "skipped"
+    if kind == "artists":
+        transform_artists.transform_json_data(ARTIST_JSON_PATH, output_dir, incremental=True)
+    else:
+        transform_tracks.transform_json_data(TRACKS_JSON_PATH, output_dir, incremental=True)
 
-def daily_job():
+
+def enrich_step():
+    if last_run_was_noop():
+        typer.echo("Last ingestion run was a no-op, skipping enrichment.")
+        return "skipped"
+    store = MetadataStore()
+    try:
+        _, failures = enrich(enricher=Enricher(store))
+    finally:
+        store.close()
+    if failures:
+        raise RuntimeError(f"{len(failures)} metadata fetches failed")
+
+
+def default_steps(output_dir: Path = OUTPUT_DIR) -> List[Step]:
+    return [
+        Step("ingest", ingest_step),
+        Step("transform_artists", lambda: transform_step("artists", output_dir), ("ingest",)),
+        Step("transform_tracks", lambda: transform_step("tracks", output_dir), ("ingest",)),
+        Step("gold", lambda: build_gold(output_dir), ("transform_artists", "transform_tracks")),
+        Step("enrich", enrich_step, ("ingest",)),
+    ]
+
+
+def validate_dag(steps: List[Step]):
+    """
+    Raise ValueError on duplicate names, unknown dependencies or cycles.
+    """
+    names = [s.name for s in steps]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate step names in pipeline")
+    by_name = {s.name: s for s in steps}
+    for s in steps:
+        unknown = set(s.depends_on) - set(by_name)
+        if unknown:
+            raise ValueError(f"Step '{s.name}' depends on unknown steps: {', '.join(sorted(unknown))}")
+
+    done = set()
+    remaining = list(steps)
+    while remaining:
+        ready = [s for s in remaining if set(s.depends_on) <= done]
+        if not ready:
+            raise ValueError(f"Pipeline has a dependency cycle among: {', '.join(s.name for s in remaining)}")
+        done.update(s.name for s in ready)
+        remaining = [s for s in remaining if s.name not in done]
+
+
+def run_dag(
+        steps: List[Step],
+        max_workers: int = 3
+) -> Dict[str, StepResult]:
     """
-    Job to run daily for fetching Last.fm data.
+    Run steps in dependency order, independent steps concurrently.
+    A step runs only if all its dependencies succeeded (or were skipped);
+    the dependents of a failed step are skipped.
+
+    :return: {step name: StepResult} in completion order.
     """
-    print(f"Running Last.fm data fetch job.")
-    client = LastfmClient(limit=50, delay=1.5)
-    client.run()
-    print(f"Job completed.")
+    validate_dag(steps)
+    results: Dict[str, StepResult] = {}
+    pending = {s.name: s for s in steps}
+    running = {}
+
+    def blocked(result: Optional[StepResult]) -> bool:
+        return result is not None and (result.status == "failed" or result.error == UPSTREAM_FAILED)
+
+    def timed(step: Step) -> StepResult:
+        started = time.perf_counter()
+        try:
+            outcome = step.func()
+            status = "skipped" if outcome == "skipped" else "ok"
+            return StepResult(status, time.perf_counter() - started)
+        except Exception as e:
+            return StepResult("failed", time.perf_counter() - started, f"{type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for name, step in list(pending.items()):
+                deps = [results.get(d) for d in step.depends_on]
+                if any(blocked(r) for r in deps):
+                    results[name] = StepResult("skipped", error=UPSTREAM_FAILED)
+                    del pending[name]
+                elif all(r is not None for r in deps):
+                    typer.echo(f"[pipeline] starting {name}")
+                    running[executor.submit(timed, step)] = name
+                    del pending[name]
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                result = results[name] = future.result()
+                get_metrics().record_stage(f"step_{name}", result.seconds)
+                color = {"ok": typer.colors.GREEN, "skipped": typer.colors.YELLOW}.get(result.status, typer.colors.RED)
+                typer.secho(
+                    f"[pipeline] {name} {result.status} in {result.seconds:.1f}s"
+                    + (f": {result.error}" if result.error else ""),
+                    fg=color
+                )
+    return results
+
 
-def run_scheduler():
+class PipelineLock:
     """
-    Sets up and starts the scheduler to run the daily job.
+    Cross-process run lock: a file created exclusively and holding the owner's pid.
+    A lock left behind by a process that no longer exists is taken over.
     """
 
-    schedular = BlockingScheduler()
-    # Run every 24 hours
-    schedular.add_job(daily_job, "interval", hours=24)
-    print(f"Scheduler started will fetch data every 24 hours.")
-    schedular.start()
+    def __init__(self, path: Path = PIPELINE_LOCK_PATH):
+        self.path = Path(path)
+
+    def _is_stale(self) -> bool:
+        try:
+            content = self.path.read_text().strip()
+            if not content:
+                # just created by another process that has not written its pid yet
+                return False
+            os.kill(int(content), 0)
+        except PermissionError:
+            return False
+        except (OSError, ValueError):
+            return True
+        return False
+
+    def acquire(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._is_stale():
+                    return False
+                self.path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def release(self):
+        self.path.unlink(missing_ok=True)
+
+
+def load_state(path: Path = PIPELINE_STATE_PATH) -> dict:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_state(state: dict, path: Path = PIPELINE_STATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_run_lock = threading.Lock()
+
+
+def run_pipeline(
+        steps: Optional[List[Step]] = None,
+        lock_path: Path = PIPELINE_LOCK_PATH,
+        state_path: Path = PIPELINE_STATE_PATH
+) -> Optional[Dict[str, StepResult]]:
+    """
+    Run the pipeline DAG once unless another run is in progress.
+    :return: Step results, or None if the run was skipped because of an overlap.
+    """
+    lock = PipelineLock(lock_path)
+    if not _run_lock.acquire(blocking=False):
+        typer.echo("[pipeline] a run is already in progress in this process, skipping")
+        return None
+    try:
+        if not lock.acquire():
+            typer.echo(f"[pipeline] a run is already in progress (lock {lock.path}), skipping")
+            return None
+        try:
+            started_at = datetime.now(timezone.utc)
+            typer.echo(f"[pipeline] run started at {started_at:%Y-%m-%d %H:%M:%S %Z}")
+            # every step of this run records into one set of metrics, reset when the pipeline report is written
+            reset_metrics()
+            results = run_dag(steps if steps is not None else default_steps())
+            finished_at = datetime.now(timezone.utc)
+
+            failed = [name for name, r in results.items() if r.status == "failed"]
+            state = load_state(state_path)
+            state.update({
+                "last_started": started_at.isoformat(),
+                "last_finished": finished_at.isoformat(),
+                "last_status": "failed" if failed else "ok",
+                "steps": {name: vars(r) for name, r in results.items()},
+            })
+            if not failed:
+                state["last_success"] = finished_at.isoformat()
+            save_state(state, state_path)
+            write_run_report("pipeline")
+            typer.echo(
+                f"[pipeline] run {'failed at ' + ', '.join(failed) if failed else 'succeeded'} "
+                f"in {(finished_at - started_at).total_seconds():.1f}s"
+            )
+            return results
+        finally:
+            lock.release()
+    finally:
+        _run_lock.release()
+
+
+def missed_run(
+        trigger: CronTrigger,
+        last_started: Optional[datetime],
+        now: Optional[datetime] = None
+) -> bool:
+    """
+    True if the trigger had a fire time between the last run and now (or there was no run yet).
+    """
+    if last_started is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    next_fire = trigger.get_next_fire_time(None, last_started)
+    return next_fire is not None and next_fire <= now
+
+
+def build_scheduler(
+        cron: str = PIPELINE_CRON,
+        tz: str = PIPELINE_TIMEZONE,
+        catch_up: bool = True,
+        state_path: Path = PIPELINE_STATE_PATH,
+        job: Callable = run_pipeline
+) -> BlockingScheduler:
+    """
+    Scheduler running `job` on a cron schedule, one instance at a time,
+    with missed runs coalesced. With `catch_up`, the first run starts
+    immediately when a scheduled run was missed since the last one.
+    """
+    trigger = CronTrigger.from_crontab(cron, timezone=tz)
+    scheduler = BlockingScheduler(timezone=tz)
+
+    options = {}
+    last = load_state(state_path).get("last_started")
+    if catch_up and missed_run(trigger, datetime.fromisoformat(last) if last else None):
+        typer.echo("A scheduled run was missed since the last run, starting one now.")
+        options["next_run_time"] = datetime.now(timezone.utc)
+
+    scheduler.add_job(
+        job,
+        trigger,
+        id="pipeline",
+        name="ingest → transform → gold",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=PIPELINE_MISFIRE_GRACE,
+        replace_existing=True,
+        **options,
+    )
+    return scheduler
+
+
+def run_scheduler(
+        cron: str = PIPELINE_CRON,
+        tz: str = PIPELINE_TIMEZONE,
+        catch_up: bool = True
+):
+    """
+    Sets up and starts the scheduler for the pipeline.
+    """
+    scheduler = build_scheduler(cron, tz, catch_up)
+    typer.echo(f"Scheduler started, running the pipeline on '{cron}' ({tz}).")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+
+# CLI entry point
+def main(
+        cron: str = typer.Option(
+            PIPELINE_CRON,
+            "--cron",
+            "-c",
+            help="Cron expression for the pipeline schedule, e.g. '0 */6 * * *'"
+        ),
+        tz: str = typer.Option(
+            PIPELINE_TIMEZONE,
+            "--timezone",
+            help="Timezone the cron expression is evaluated in"
+        ),
+        catch_up: bool = typer.Option(
+            True,
+            "--catch-up/--no-catch-up",
+            help="Run immediately on start-up if a scheduled run was missed"
+        ),
+        once: bool = typer.Option(
+            False,
+            "--once",
+            help="Run the pipeline once and exit instead of scheduling it"
+        ),
+):
+    if once:
+        results = run_pipeline()
+        if results is not None and any(r.status == "failed" for r in results.values()):
+            raise typer.Exit(1)
+        return
+    run_scheduler(cron, tz, catch_up)
+
 
 if __name__ == "__main__":
-    run_scheduler()
\ No newline at end of file
+    typer.run(main)
@@ -3,6 +3,7 @@ Pytest configuration and shared fixtures for music_warehouse tests.
 """
 
 import pytest
+import shutil
 import sys
 from pathlib import Path
 
@@ -11,12 +12,18 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.utils.metrics import reset_metrics
+
 
 @pytest.fixture(autouse=True)
-def reset_environment(monkeypatch):
+def reset_environment(monkeypatch, tmp_path):
     """Reset environment variables for each test"""
-    # You can add any environment setup here
-    pass
+    # Never read or write the shared on-disk response cache from tests
+    monkeypatch.setattr('src.lastfm_fetch.pull_geo.get_default_cache', lambda: None)
+    # Run reports go to the test's temporary directory, one fresh collection per test
+    monkeypatch.setattr('src.utils.metrics.METRICS_DIR', tmp_path / "metrics")
+    monkeypatch.setattr('src.utils.metrics.PROMETHEUS_TEXTFILE_DIR', None)
+    reset_metrics()
 
 
 @pytest.fixture
@@ -26,3 +33,14 @@ def temp_data_dir(tmp_path):
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
+
+@pytest.fixture
+def raw_geo_dir(tmp_path):
+    """Copy the sample raw chart files into a temporary directory"""
+    source = project_root / "data" / "raw" / "geo"
+    target = tmp_path / "raw" / "geo"
+    for chart_type in ["artists", "tracks"]:
+        (target / chart_type).mkdir(parents=True)
+        for file in sorted((source / chart_type).glob("*.json")):
+            shutil.copy(file, target / chart_type / file.name)
+    return target
@@ -0,0 +1,136 @@
+"""
+Tests for the benchmark suite in src/benchmarks
+
+Run tests with:
+    pytest tests/test_benchmarks.py -v
+"""
+
+import importlib
+
+import pytest
+import requests
+
+from src.benchmarks import bench_memory
+from src.benchmarks.bench_pipeline import bench_ingestion, bench_transform, compare
+from src.benchmarks.mock_server import MockLastfmServer
+from src.benchmarks.synthetic import chart_payload, write_corpus
+from src.config import lastfm_config
+from src.lastfm_fetch.http_client import LastfmAPIError, LastfmHttpClient
+from src.lastfm_fetch.pull_geo import fetch_geo_data, fetch_top_n
+from src.lastfm_fetch.response_cache import ResponseCache
+from src.transform_data.transform_tracks import transform_track_data_country
+
+
+class TestSyntheticCorpus:
+    """Test cases for synthetic chart generation"""
+
+    def test_payload_shape_matches_api(self):
+        payload = chart_payload("tracks", "Spain", limit=10, page=2, total=15)
+        assert len(payload["tracks"]["track"]) == 5
+        assert payload["tracks"]["track"][0]["@attr"]["rank"] == "10"
+        assert payload["tracks"]["@attr"]["totalPages"] == "2"
+
+    def test_corpus_is_transformable(self, tmp_path):
+        files = write_corpus(tmp_path, "tracks", 120, records_per_file=50, countries=["Spain", "Japan"], days=2)
+        assert len(files) == 3
+        assert files[0].name == "spain_2025-01-01_00-00-00.json"
+        df = transform_track_data_country(files[2])
+        assert len(df) == 20
+        assert df["chart_country"].iloc[0] == "spain"
+
+
+class TestMockServer:
+    """Test cases for the mock Last.fm server"""
+
+    def test_serves_pages_and_errors(self):
+        with MockLastfmServer(latency=0, total=60) as server:
+            client = LastfmHttpClient(base_url=server.url, max_retries=0)
+            data = client.get_json({"method": "geo.gettopartists", "country": "Spain", "limit": 50, "page": 2})
+            assert len(data["topartists"]["artist"]) == 10
+            client.close()
+            assert server.requests == 1
+
+    def test_pagination(self):
+        with MockLastfmServer(latency=0, total=120) as server:
+            client = LastfmHttpClient(base_url=server.url)
+            data = fetch_top_n("Spain", "tracks", 500, limit=50, client=client)
+            client.close()
+        assert len(data["tracks"]["track"]) == 120
+        assert server.stats["ok"] == 3
+
+    def test_throttles_with_429(self):
+        with MockLastfmServer(latency=0, rate_limit=1) as server:
+            client = LastfmHttpClient(base_url=server.url, max_retries=0)
+            params = {"method": "geo.gettoptracks", "country": "Spain"}
+            client.get_json(params)
+            with pytest.raises(requests.HTTPError) as exc:
+                client.get_json(params)
+            client.close()
+        assert exc.value.response.status_code == 429
+        assert exc.value.response.headers["Retry-After"] == "1"
+        assert server.stats["throttled"] == 1
+
+    def test_injected_errors_are_retried(self):
+        with MockLastfmServer(latency=0, error_rate=0.2, api_error_rate=0.2, seed=1) as server:
+            client = LastfmHttpClient(base_url=server.url, max_retries=10, backoff_factor=0.001, max_backoff=0.001)
+            for page in range(1, 6):
+                client.get_json({"method": "geo.gettopartists", "country": "Spain", "page": page})
+            client.close()
+        assert server.stats["ok"] == 5
+        assert server.stats["errors"] + server.stats["api_errors"] > 0
+
+    def test_api_errors_surface(self):
+        with MockLastfmServer(latency=0, api_error_rate=1.0) as server:
+            client = LastfmHttpClient(base_url=server.url, max_retries=0)
+            with pytest.raises(LastfmAPIError):
+                client.get_json({"method": "geo.gettopartists", "country": "Spain"})
+            client.close()
+
+    def test_cache_is_separate_per_endpoint(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        with MockLastfmServer(latency=0) as server:
+            client = LastfmHttpClient(base_url=server.url)
+            fetch_geo_data("Spain", "artists", 10, 1, client=client, cache=cache)
+            fetch_geo_data("Spain", "artists", 10, 1, client=client, cache=cache)
+            client.close()
+        assert server.requests == 1
+        real_api_params = {"method": "geo.gettopartists", "country": "Spain", "format": "json", "limit": 10, "page": 1}
+        assert cache.get(real_api_params) is None
+        cache.close()
+
+    def test_base_url_overridable_from_environment(self, monkeypatch):
+        monkeypatch.setenv("LASTFM_BASE_URL", "http://127.0.0.1:8765/2.0/")
+        try:
+            assert importlib.reload(lastfm_config).BASE_URL == "http://127.0.0.1:8765/2.0/"
+        finally:
+            monkeypatch.delenv("LASTFM_BASE_URL")
+            importlib.reload(lastfm_config)
+        assert lastfm_config.BASE_URL == lastfm_config.LASTFM_API_URL
+
+
+class TestBenchmarkSuite:
+    """Test cases for the benchmark stages and comparison"""
+
+    def test_transform_stages(self, tmp_path):
+        results = bench_transform(tmp_path, "artists", 100, repeat=1, days=2)
+        assert [r["stage"] for r in results] == ["parse", "normalize", "concat", "write"]
+        assert all(r["records"] == 100 and r["seconds"] > 0 for r in results)
+
+    def test_ingestion_against_mock_server(self, tmp_path):
+        result = bench_ingestion(tmp_path, countries=2, latency=0, concurrency=2)
+        assert result["failures"] == 0
+        assert result["requests"] == 4
+        assert len(list((tmp_path / "ingest" / "artists").iterdir())) == 2
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [{"stage": "parse", "kind": "artists", "records": 100, "seconds": 1.0}]}
+        current = {"results": [{"stage": "parse", "kind": "artists", "records": 100, "seconds": 1.5}]}
+        [row] = compare(current, baseline, threshold=0.1)
+        assert row["regression"] and row["ratio"] == 1.5
+
+    def test_memory_report(self, raw_geo_dir):
+        results = bench_memory.run_benchmark(raw_geo_dir, copies=2)
+        assert set(results) == {"artists", "tracks"}
+        report = results["artists"]
+        assert report.loc["rank", ["dtype", "compact_dtype"]].tolist() == ["int64", "int16"]
+        assert report.loc["total", "compact_bytes"] < report.loc["total", "bytes"]
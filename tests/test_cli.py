@@ -0,0 +1,101 @@
+"""
+Tests for src/cli.py
+
+Run tests with:
+    pytest tests/test_cli.py -v
+"""
+
+import subprocess
+import sys
+
+import typer
+from typer.testing import CliRunner
+
+from src.benchmarks.bench_imports import run_probe
+from src.cli import COMMANDS, LazyCommand, LazyCommands, app, load_command
+
+
+runner = CliRunner()
+calls = []
+
+
+def fake_ingest(limit: int = typer.Option(50, "--limit", "-l")):
+    calls.append(limit)
+
+
+def iter_commands(commands=COMMANDS, prefix=()):
+    for name, entry in commands.items():
+        if isinstance(entry, LazyCommands):
+            yield from iter_commands(entry.commands, prefix + (name,))
+        else:
+            yield prefix + (name,), entry
+
+
+class TestLazyLoading:
+    """Test that the CLI defers heavy imports until a subcommand runs"""
+
+    def test_help_loads_no_heavy_modules(self):
+        code = (
+            "import sys; sys.argv = ['music-warehouse', '--help']\n"
+            "from src.cli import main\n"
+            "try:\n    main()\nexcept SystemExit:\n    pass"
+        )
+        _, heavy = run_probe(code)
+        assert heavy == []
+
+    def test_group_help_loads_no_heavy_modules(self):
+        _, heavy = run_probe(
+            "from typer.testing import CliRunner\n"
+            "from src.cli import app\n"
+            "assert CliRunner().invoke(app, ['build', '--help']).exit_code == 0"
+        )
+        assert heavy == []
+
+    def test_light_packages_do_not_load_requests(self):
+        _, heavy = run_probe("import src.clients, src.lastfm_fetch.manifest")
+        assert "requests" not in heavy
+
+    def test_python_dash_m(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "src", "--help"], capture_output=True, text=True, check=True
+        )
+        assert "music-warehouse" in result.stdout
+        assert "transform" in result.stdout
+
+
+class TestCommands:
+    """Test dispatch to the registered subcommands"""
+
+    def test_every_target_resolves(self):
+        for path, entry in iter_commands():
+            cmd = load_command(path[-1], entry)
+            assert cmd.name == path[-1]
+            assert cmd.params, f"{' '.join(path)} has no options"
+
+    def test_listing_and_nested_help(self):
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+        result = runner.invoke(app, ["bench", "--help"])
+        assert result.exit_code == 0
+        assert "mock-server" in result.output
+
+    def test_subcommand_help_shows_its_options(self):
+        result = runner.invoke(app, ["transform", "tracks", "--help"])
+        assert result.exit_code == 0
+        assert "--incremental" in result.output
+
+    def test_unknown_command(self):
+        result = runner.invoke(app, ["transform", "albums"])
+        assert result.exit_code != 0
+        assert "No such command" in result.output
+
+    def test_invokes_module_main(self, monkeypatch):
+        monkeypatch.setitem(COMMANDS, "ingest", LazyCommand(f"{__name__}:fake_ingest", "fake"))
+        calls.clear()
+        result = runner.invoke(app, ["ingest", "-l", "10"])
+
+        assert result.exit_code == 0, result.output
+        assert calls == [10]
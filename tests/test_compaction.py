@@ -0,0 +1,139 @@
+"""
+Tests for src/transform_data/compaction.py and src/transform_data/silver_manifest.py
+
+Run tests with:
+    pytest tests/test_compaction.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.analytics.rank_matrix import RankMatrix
+from src.transform_data.compact import compact_schema
+from src.transform_data.compaction import compact_silver
+from src.transform_data.engine import transform_chart_file, transform_kind
+from src.transform_data.silver_writer import open_partitioned, silver_files, silver_path, write_silver
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+
+
+def live_rows(output_dir, kind="artists"):
+    return pd.concat([pd.read_parquet(f) for f in silver_files(output_dir, kind)])
+
+
+class TestFlatCompaction:
+    """Test cases for compacting the flat silver layout"""
+
+    def test_snapshots_are_merged_and_deduplicated(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        for _ in range(3):
+            transform_artists_json(raw_geo_dir / "artists", out)
+        before = silver_files(out, "artists")
+        assert len(live_rows(out)) == 3 * 22 * 50
+
+        result = compact_silver(out, "artists")
+        assert (result.files_in, result.files_out) == (3, 1)
+        assert (result.rows_in, result.rows_out) == (3 * 22 * 50, 22 * 50)
+
+        files = silver_files(out, "artists")
+        assert len(files) == 1 and files[0].name.startswith("artists_compacted_")
+        df = pd.read_parquet(files[0])
+        assert len(df) == 22 * 50
+        assert df[["chart_country", "chart_date", "rank"]].equals(
+            df[["chart_country", "chart_date", "rank"]].sort_values(["chart_country", "chart_date", "rank"])
+        )
+        # the latest snapshot wins
+        assert df["load_time"].min() >= pd.read_parquet(before[-1])["load_time"].min()
+
+    def test_retired_files_outlive_running_readers(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_artists_json(raw_geo_dir / "artists", out)
+        listed = silver_files(out, "artists")
+
+        compact_silver(out, "artists")
+        assert all(f.exists() for f in listed)
+
+        assert compact_silver(out, "artists", retention=0).deleted == 2
+        assert not any(f.exists() for f in listed)
+
+    def test_files_written_during_compaction_stay_live(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_artists_json(raw_geo_dir / "artists", out)
+        compact_silver(out, "artists")
+        new_part = transform_artists_json(raw_geo_dir / "artists", out)
+
+        assert new_part in silver_files(out, "artists")
+        assert len(silver_files(out, "artists")) == 2
+
+    def test_target_rows_splits_output(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_artists_json(raw_geo_dir / "artists", out)
+
+        result = compact_silver(out, "artists", target_rows=500)
+        assert result.files_out == 3
+        assert sorted(len(pd.read_parquet(f)) for f in silver_files(out, "artists")) == [100, 500, 500]
+
+    def test_readers_see_the_same_charts(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_artists_json(raw_geo_dir / "artists", out)
+        before = RankMatrix.from_silver(out, "artists")
+
+        compact_silver(out, "artists")
+        after = RankMatrix.from_silver(out, "artists")
+        np.testing.assert_array_equal(before.ranks, after.ranks)
+
+    def test_single_file_is_left_alone(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        output_file = transform_artists_json(raw_geo_dir / "artists", out)
+
+        result = compact_silver(out, "artists")
+        assert result.files_out == 1
+        assert silver_files(out, "artists") == [output_file]
+
+    def test_legacy_column_order_and_types(self, raw_geo_dir, tmp_path):
+        """A snapshot from before the compact schema, with its columns in another order, merges with a new one"""
+        out = tmp_path / "out"
+        files = sorted((raw_geo_dir / "artists").glob("*.json"))
+        legacy = pd.concat([transform_chart_file(f, "artists") for f in files], ignore_index=True)
+        legacy = legacy[list(reversed(legacy.columns))].drop(columns="streamable")
+        silver_dir = silver_path(out, "artists")
+        silver_dir.mkdir(parents=True)
+        legacy.to_parquet(silver_dir / "artists_20251112_072608.parquet", index=False)
+        transform_artists_json(raw_geo_dir / "artists", out)
+
+        result = compact_silver(out, "artists")
+        assert (result.files_in, result.files_out, result.rows_out) == (2, 1, 22 * 50)
+        assert pq.read_schema(silver_files(out, "artists")[0]).remove_metadata() == compact_schema("artists")
+
+    def test_engines_merge(self, raw_geo_dir, tmp_path):
+        """Silver written by the pandas engine and by the fast engine compacts together"""
+        out = tmp_path / "out"
+        transform_kind("artists", raw_geo_dir / "artists", out, engine="pandas")
+        transform_kind("artists", raw_geo_dir / "artists", out, engine="fast")
+
+        result = compact_silver(out, "artists")
+        assert (result.files_in, result.files_out, result.rows_out) == (2, 1, 22 * 50)
+
+    def test_missing_dataset(self, tmp_path):
+        assert compact_silver(tmp_path, "tracks") is None
+
+
+class TestPartitionedCompaction:
+    """Test cases for compacting the partitioned silver layout"""
+
+    def test_each_partition_becomes_one_file(self, raw_geo_dir, tmp_path):
+        out = tmp_path / "out"
+        df = pd.read_parquet(transform_artists_json(raw_geo_dir / "artists", tmp_path / "flat"))
+        dataset_dir = silver_path(out, "artists", "partitioned")
+        write_silver(df, dataset_dir, "artists", layout="partitioned")
+        write_silver(df, dataset_dir, "artists", layout="partitioned", replace_partitions=False)
+        assert open_partitioned(dataset_dir).count_rows() == 2 * 22 * 50
+
+        result = compact_silver(out, "artists", layout="partitioned")
+        assert (result.files_in, result.files_out) == (44, 22)
+        assert open_partitioned(dataset_dir).count_rows() == 22 * 50
+        assert len(silver_files(out, "artists")) == 22
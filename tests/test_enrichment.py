@@ -0,0 +1,149 @@
+"""
+Tests for src/lastfm_fetch/enrichment.py and src/lastfm_fetch/metadata_store.py
+
+Run tests with:
+    pytest tests/test_enrichment.py -v
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.benchmarks.mock_server import MockLastfmServer
+from src.lastfm_fetch.enrichment import ENRICH_METHODS, Enricher, Entity, collect_entities, enrich
+from src.lastfm_fetch.http_client import LastfmAPIError
+from src.lastfm_fetch.metadata_store import MetadataStore
+
+
+class FakeClient:
+    """Answers every request with its own params, or with an error for chosen artists"""
+
+    def __init__(self, errors=None):
+        self.calls = []
+        self.errors = errors or {}
+
+    def get_json(self, params):
+        self.calls.append(params)
+        error = self.errors.get(params["artist"])
+        if error is not None:
+            raise error
+        return {"echo": {k: v for k, v in params.items() if k != "api_key"}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MetadataStore(tmp_path / "enrichment" / "metadata.sqlite", ttl=3600)
+    yield store
+    store.close()
+
+
+def raw_files(raw_geo_dir):
+    return [(kind, file) for kind in ["artists", "tracks"] for file in sorted((raw_geo_dir / kind).glob("*.json"))]
+
+
+class TestCollectEntities:
+    """Test cases for entity extraction from raw charts"""
+
+    def test_entities_are_unique_across_charts(self, raw_geo_dir):
+        entities = collect_entities(raw_files(raw_geo_dir))
+        artists = [e for e in entities.values() if e.kind == "artist"]
+        tracks = [e for e in entities.values() if e.kind == "track"]
+
+        # 44 files of 50 rows, but the same names recur across countries and days
+        assert 0 < len(artists) < 22 * 50
+        assert 0 < len(tracks) < 22 * 50
+        assert all(t.artist for t in tracks)
+        assert Entity("track", tracks[0].name, tracks[0].artist).key in entities
+
+    def test_keys_ignore_case(self):
+        assert Entity("artist", "Rosé").key == Entity("artist", "ROSÉ").key
+        assert Entity("track", "APT.", "ROSÉ").key != Entity("artist", "APT.").key
+
+
+class TestEnricher:
+    """Test cases for fetching and storing entity metadata"""
+
+    def test_each_entity_is_fetched_once_per_ttl(self, store):
+        client = FakeClient()
+        enricher = Enricher(store, concurrency=4, client=client)
+        entities = [Entity("artist", "A"), Entity("artist", "B"), Entity("track", "Song", "A")]
+
+        stored, failures = enricher.run(entities)
+        assert failures == []
+        assert stored == len(client.calls) == 2 * 2 + 1
+        assert store.get(Entity("track", "Song", "A").key, "track.getInfo")["echo"]["track"] == "Song"
+
+        assert enricher.run(entities) == (0, [])
+        assert len(client.calls) == 5
+
+    def test_stale_entries_are_refreshed(self, store):
+        client = FakeClient()
+        enricher = Enricher(store, client=client)
+        artist = Entity("artist", "A")
+        store.put_many(
+            [(artist.key, method, {}, {"old": True}, None) for method in ENRICH_METHODS["artist"]],
+            now=time.time() - 7200
+        )
+
+        assert enricher.pending([artist]) == [(artist, m) for m in ENRICH_METHODS["artist"]]
+        enricher.run([artist])
+        assert "echo" in store.get(artist.key, "artist.getInfo")
+
+    def test_unknown_entity_is_stored_and_not_retried(self, store):
+        client = FakeClient(errors={"Nobody": LastfmAPIError(6, "The artist you supplied could not be found")})
+        enricher = Enricher(store, client=client)
+
+        stored, failures = enricher.run([Entity("artist", "Nobody")])
+        assert (stored, failures) == (2, [])
+        assert store.get(Entity("artist", "Nobody").key, "artist.getInfo") is None
+        assert enricher.pending([Entity("artist", "Nobody")]) == []
+
+    def test_failures_are_reported_and_not_stored(self, store):
+        client = FakeClient(errors={"Broken": LastfmAPIError(16, "temporarily unavailable")})
+        enricher = Enricher(store, client=client)
+
+        stored, failures = enricher.run([Entity("artist", "Broken"), Entity("artist", "Fine")])
+        assert stored == 2
+        assert sorted(method for _, method, _ in failures) == sorted(ENRICH_METHODS["artist"])
+        assert len(enricher.pending([Entity("artist", "Broken")])) == 2
+
+
+class TestEnrich:
+    """Test cases for the enrichment stage over raw directories"""
+
+    def test_only_new_raw_files_are_read(self, raw_geo_dir, store):
+        client = FakeClient()
+        enrich(raw_geo_dir, Enricher(store, client=client))
+        first = len(client.calls)
+        assert first == len(store)
+
+        with patch("src.lastfm_fetch.enrichment.collect_entities", wraps=collect_entities) as collect:
+            enrich(raw_geo_dir, Enricher(store, client=client))
+        assert list(collect.call_args[0][0]) == []
+        assert len(client.calls) == first
+
+    def test_failed_run_reads_its_files_again(self, raw_geo_dir, store):
+        artist = sorted(collect_entities(raw_files(raw_geo_dir)).values())[0].name
+        failing = FakeClient(errors={artist: LastfmAPIError(11, "Service Offline")})
+        _, failures = enrich(raw_geo_dir, Enricher(store, client=failing))
+        assert failures
+
+        retry = FakeClient()
+        _, failures = enrich(raw_geo_dir, Enricher(store, client=retry))
+        assert failures == []
+        assert {call["artist"] for call in retry.calls} == {artist}
+
+    def test_against_mock_server(self, raw_geo_dir, store):
+        """One request per unique (entity, method), none on a second run"""
+        entities = collect_entities(raw_files(raw_geo_dir))
+        expected = sum(len(ENRICH_METHODS[e.kind]) for e in entities.values())
+        with MockLastfmServer(latency=0.0) as server, \
+                patch("src.lastfm_fetch.enrichment.API_KEY", "test_api_key"):
+            enricher = Enricher(store, concurrency=8, rate_limit=1000, base_url=server.url)
+            stored, failures = enrich(raw_geo_dir, enricher, all_files=True)
+            enrich(raw_geo_dir, enricher, all_files=True)
+
+        assert failures == []
+        assert stored == expected == server.stats["requests"]
+        assert store.get(next(iter(entities)), "artist.getTopTags")["toptags"]["tag"]
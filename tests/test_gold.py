@@ -0,0 +1,166 @@
+"""
+Tests for src/gold/build_gold.py
+
+Run tests with:
+    pytest tests/test_gold.py -v
+"""
+
+import duckdb
+import pytest
+
+from src.gold.build_gold import build_gold, connect
+from src.gold.dimensions import refresh_model
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+from src.transform_data.transform_tracks import transform_json_data as transform_tracks_json
+
+
+@pytest.fixture
+def silver_dir(raw_geo_dir, tmp_path):
+    """Silver data for the first sample day only; the second day is held back"""
+    held_back = tmp_path / "held_back"
+    for kind in ["artists", "tracks"]:
+        (held_back / kind).mkdir(parents=True)
+        for file in (raw_geo_dir / kind).glob("*_2025-11-12_*.json"):
+            file.rename(held_back / kind / file.name)
+
+    out = tmp_path / "out"
+    transform_artists_json(raw_geo_dir / "artists", out, incremental=True)
+    transform_tracks_json(raw_geo_dir / "tracks", out, incremental=True)
+    return out, raw_geo_dir, held_back
+
+
+def query(db_path, sql):
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        return con.execute(sql).fetchall()
+    finally:
+        con.close()
+
+
+class TestBuildGold:
+    """Test cases for the DuckDB gold layer"""
+
+    def test_initial_build(self, silver_dir, tmp_path):
+        out, _, _ = silver_dir
+        db = tmp_path / "gold.duckdb"
+
+        assert build_gold(out, db) == {"artists": 11, "tracks": 11}
+        assert query(db, "SELECT count(*) FROM silver_artists") == [(550,)]
+        # a single day has no previous chart, so every entry is new
+        assert query(db, "SELECT bool_and(is_new_entry) FROM artist_rank_deltas") == [(True,)]
+        assert query(db, "SELECT max(n_countries) FROM artist_presence")[0][0] <= 11
+        assert query(db, "SELECT sum(n_tracks) FROM track_artist_rollup") == [(550,)]
+
+    def test_incremental_refresh(self, silver_dir, tmp_path):
+        """A new day is loaded on its own and deltas are computed against the previous day"""
+        out, raw_geo_dir, held_back = silver_dir
+        db = tmp_path / "gold.duckdb"
+        build_gold(out, db)
+
+        assert build_gold(out, db) == {"artists": 0, "tracks": 0}
+
+        for kind in ["artists", "tracks"]:
+            for file in (held_back / kind).glob("*.json"):
+                file.rename(raw_geo_dir / kind / file.name)
+        transform_artists_json(raw_geo_dir / "artists", out, incremental=True)
+        transform_tracks_json(raw_geo_dir / "tracks", out, incremental=True)
+
+        assert build_gold(out, db) == {"artists": 11, "tracks": 11}
+        assert query(db, "SELECT count(*) FROM silver_artists") == [(1100,)]
+        assert query(db, "SELECT count(*) FROM artist_rank_deltas") == [(1100,)]
+
+        moved = query(db, """
+            SELECT count(*) FROM artist_rank_deltas
+            WHERE chart_date = DATE '2025-11-12' AND NOT is_new_entry
+              AND rank_delta = prev_rank - rank AND prev_chart_date = DATE '2025-11-11'
+        """)[0][0]
+        assert moved > 0
+
+    def test_snapshots_are_deduplicated(self, silver_dir, tmp_path):
+        """Loading the same country-days twice (full snapshots) does not duplicate rows"""
+        out, raw_geo_dir, _ = silver_dir
+        db = tmp_path / "gold.duckdb"
+        transform_artists_json(raw_geo_dir / "artists", out)
+
+        build_gold(out, db)
+        assert query(db, "SELECT count(*) FROM silver_artists") == [(550,)]
+
+    def test_quote_in_silver_path(self, raw_geo_dir, tmp_path):
+        """Silver file paths are bound as parameters, not spliced into the SQL"""
+        out = tmp_path / "it's out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_tracks_json(raw_geo_dir / "tracks", out, layout="partitioned")
+
+        assert build_gold(out, tmp_path / "gold.duckdb") == {"artists": 22, "tracks": 22}
+
+
+class TestDimensions:
+    """Test cases for the surrogate-key dimensions and fact tables"""
+
+    def test_facts_reference_dimensions(self, silver_dir, tmp_path):
+        out, _, _ = silver_dir
+        db = tmp_path / "gold.duckdb"
+        build_gold(out, db)
+
+        assert query(db, "SELECT count(*) FROM dim_country") == [(11,)]
+        assert query(db, "SELECT count(*) FROM fact_artist_chart") == [(550,)]
+        assert query(db, "SELECT count(*) FROM fact_track_chart") == [(550,)]
+        # every fact row resolves to a dimension row
+        assert query(db, """
+            SELECT count(*) FROM fact_track_chart f
+            LEFT JOIN dim_track t USING (track_key) LEFT JOIN dim_artist a ON a.artist_key = f.artist_key
+            WHERE t.track_key IS NULL OR a.artist_key IS NULL
+        """) == [(0,)]
+        # an artist charting in several countries, or under several URLs with one mbid, is a single entity
+        assert query(db, "SELECT count(*) FROM dim_artist")[0][0] < query(
+            db, "SELECT count(DISTINCT lower(artist_url)) FROM (SELECT artist_url FROM silver_artists "
+                "UNION ALL SELECT artist_url FROM silver_tracks)"
+        )[0][0]
+        assert query(db, """
+            SELECT count(*) FROM (
+                SELECT artist_mbid FROM silver_artists s
+                JOIN artist_alias al ON al.alias = 'url:' || rtrim(lower(s.artist_url), '/')
+                WHERE artist_mbid <> '' GROUP BY artist_mbid HAVING count(DISTINCT al.artist_key) > 1
+            )
+        """) == [(0,)]
+
+    def test_keys_are_stable_across_refreshes(self, silver_dir, tmp_path):
+        out, raw_geo_dir, held_back = silver_dir
+        db = tmp_path / "gold.duckdb"
+        build_gold(out, db)
+        before = dict(query(db, "SELECT artist_url, artist_key FROM dim_artist"))
+
+        for kind in ["artists", "tracks"]:
+            for file in (held_back / kind).glob("*.json"):
+                file.rename(raw_geo_dir / kind / file.name)
+        transform_artists_json(raw_geo_dir / "artists", out, incremental=True)
+        transform_tracks_json(raw_geo_dir / "tracks", out, incremental=True)
+        build_gold(out, db)
+
+        after = dict(query(db, "SELECT artist_url, artist_key FROM dim_artist"))
+        assert all(after[url] == key for url, key in before.items())
+        assert query(db, "SELECT count(*) FROM fact_artist_chart") == [(1100,)]
+        assert query(db, "SELECT count(*), count(DISTINCT artist_key) FROM dim_artist")[0][0] == len(after)
+
+    def test_identity_prefers_mbid_then_url(self, tmp_path):
+        """Rows without an mbid join the entity first seen with one through its URL"""
+        con = connect(tmp_path / "gold.duckdb")
+        con.execute("""
+            INSERT INTO silver_artists VALUES
+                ('Spain', DATE '2025-11-11', 1, 'Muse', 'abc', 'https://www.last.fm/music/Muse', 10, now()),
+                ('France', DATE '2025-11-11', 1, 'muse ', '', 'https://www.last.fm/music/muse/', 20, now()),
+                ('Italy', DATE '2025-11-11', 1, 'Muse', 'other', 'https://www.last.fm/music/Other+Muse', 30, now())
+        """)
+        con.execute("""
+            CREATE TEMP TABLE _affected_artists AS
+            SELECT DISTINCT chart_country, chart_date FROM silver_artists
+        """)
+        refresh_model(con, "artists")
+
+        assert con.execute("SELECT count(*) FROM dim_artist").fetchone() == (2,)
+        keys = con.execute("""
+            SELECT c.chart_country, f.artist_key FROM fact_artist_chart f JOIN dim_country c USING (country_key)
+        """).fetchall()
+        keys = dict(keys)
+        assert keys["Spain"] == keys["France"] != keys["Italy"]
+        con.close()
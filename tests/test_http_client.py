@@ -0,0 +1,106 @@
+"""
+Tests for src/lastfm_fetch/http_client.py
+
+Run tests with:
+    pytest tests/test_http_client.py -v
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from src.lastfm_fetch.http_client import LastfmAPIError, LastfmHttpClient, parse_retry_after
+
+
+def make_response(status_code=200, payload=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload if payload is not None else {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error")
+    else:
+        response.raise_for_status = Mock()
+    return response
+
+
+class TestRetries:
+    """Test cases for LastfmHttpClient.get_json retry behaviour"""
+
+    @patch('src.lastfm_fetch.http_client.time.sleep')
+    def test_retries_throttled_request(self, mock_sleep):
+        """A 429 is retried and its Retry-After header is honoured"""
+        client = LastfmHttpClient(max_retries=3)
+        client.session.get = Mock(side_effect=[
+            make_response(429, headers={"Retry-After": "7"}),
+            make_response(200, {"topartists": {}}),
+        ])
+
+        assert client.get_json({"method": "geo.gettopartists"}) == {"topartists": {}}
+        assert client.session.get.call_count == 2
+        assert mock_sleep.call_args[0][0] >= 7
+
+    @patch('src.lastfm_fetch.http_client.time.sleep')
+    def test_retries_server_errors_then_raises(self, mock_sleep):
+        """Persistent 5xx responses raise once the retry budget is spent"""
+        client = LastfmHttpClient(max_retries=2)
+        client.session.get = Mock(return_value=make_response(503))
+
+        with pytest.raises(requests.HTTPError):
+            client.get_json({})
+        assert client.session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('src.lastfm_fetch.http_client.time.sleep')
+    def test_retries_connection_errors(self, mock_sleep):
+        """Connection errors and timeouts are retried"""
+        client = LastfmHttpClient(max_retries=2)
+        client.session.get = Mock(side_effect=[
+            requests.ConnectionError("reset"),
+            requests.Timeout("slow"),
+            make_response(200, {"ok": True}),
+        ])
+
+        assert client.get_json({}) == {"ok": True}
+
+    @patch('src.lastfm_fetch.http_client.time.sleep')
+    def test_retries_transient_api_error(self, mock_sleep):
+        """Last.fm's 'rate limit exceeded' payload is retried"""
+        client = LastfmHttpClient(max_retries=2)
+        client.session.get = Mock(side_effect=[
+            make_response(200, {"error": 29, "message": "Rate Limit Exceeded"}),
+            make_response(200, {"ok": True}),
+        ])
+
+        assert client.get_json({}) == {"ok": True}
+
+    @patch('src.lastfm_fetch.http_client.time.sleep')
+    def test_permanent_api_error_is_not_retried(self, mock_sleep):
+        """Errors such as an invalid API key fail immediately"""
+        client = LastfmHttpClient(max_retries=3)
+        client.session.get = Mock(return_value=make_response(200, {"error": 10, "message": "Invalid API key"}))
+
+        with pytest.raises(LastfmAPIError) as exc:
+            client.get_json({})
+        assert exc.value.code == 10
+        assert client.session.get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_backoff_is_capped(self):
+        """Backoff grows exponentially but never exceeds max_backoff"""
+        client = LastfmHttpClient(backoff_factor=1, max_backoff=4)
+        assert all(0 <= client.backoff(attempt) <= 4 for attempt in range(10))
+
+
+class TestParseRetryAfter:
+    """Test cases for parse_retry_after"""
+
+    def test_seconds(self):
+        assert parse_retry_after("12") == 12
+
+    def test_http_date_in_the_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
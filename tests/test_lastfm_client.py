@@ -0,0 +1,103 @@
+"""
+Tests for src/clients/lastfm_client.py and src/utils/rate_limiter.py
+
+Run tests with:
+    pytest tests/test_lastfm_client.py -v
+"""
+
+import pytest
+import threading
+import time
+from unittest.mock import patch
+
+from src.clients.lastfm_client import LastfmClient
+from src.utils.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket rate limiter"""
+
+    def test_initial_burst_is_capacity(self):
+        """A fresh bucket allows `capacity` requests without waiting"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    def test_acquire_waits_for_refill(self):
+        """Once the burst is spent, acquire blocks for roughly 1/rate seconds"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        bucket.acquire()
+        start = time.monotonic()
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_rate_holds_across_threads(self):
+        """Many threads together never exceed the configured rate"""
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 1 token available up front, 10 more at 50/s
+        assert time.monotonic() - start >= 0.18
+
+    def test_invalid_rate(self):
+        """Non-positive rates are rejected"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestLastfmClient:
+    """Test cases for LastfmClient.run"""
+
+    @patch('src.clients.lastfm_client.pull_chart')
+    @patch('src.clients.lastfm_client.API_KEY', 'test_api_key')
+    def test_run_fetches_every_chart(self, mock_pull):
+        """Every (country, chart_type) pair is fetched exactly once"""
+        client = LastfmClient(countries=["Japan", "Spain", "India"], concurrency=3, rate_limit=1000)
+        failures = client.run()
+
+        assert failures == []
+        fetched = {(c.kwargs['country'], c.kwargs['chart_type']) for c in mock_pull.call_args_list}
+        assert fetched == {
+            (country, chart_type)
+            for country in ["Japan", "Spain", "India"]
+            for chart_type in ["artists", "tracks"]
+        }
+        assert mock_pull.call_count == 6
+
+    @patch('src.clients.lastfm_client.pull_chart')
+    @patch('src.clients.lastfm_client.API_KEY', 'test_api_key')
+    def test_run_collects_failures(self, mock_pull):
+        """A failing chart is reported without aborting the others"""
+        def fake_pull(country, chart_type, **kwargs):
+            if country == "Spain" and chart_type == "tracks":
+                raise RuntimeError("boom")
+
+        mock_pull.side_effect = fake_pull
+        client = LastfmClient(countries=["Japan", "Spain"], concurrency=2, rate_limit=1000)
+        failures = client.run()
+
+        assert mock_pull.call_count == 4
+        assert len(failures) == 1
+        assert failures[0][:2] == ("Spain", "tracks")
+
+    @patch('src.clients.lastfm_client.pull_chart')
+    @patch('src.clients.lastfm_client.API_KEY', 'test_api_key')
+    def test_run_runs_concurrently(self, mock_pull):
+        """Slow requests overlap instead of running back to back"""
+        mock_pull.side_effect = lambda **kwargs: time.sleep(0.1)
+        client = LastfmClient(countries=["Japan", "Spain", "India", "Italy"], concurrency=8, rate_limit=1000)
+
+        start = time.monotonic()
+        client.run()
+        assert time.monotonic() - start < 0.5
+
+    def test_requires_countries(self):
+        """An empty country list is rejected"""
+        with pytest.raises(ValueError):
+            LastfmClient(countries=[])
@@ -0,0 +1,95 @@
+"""
+Tests for src/lastfm_fetch/manifest.py
+
+Run tests with:
+    pytest tests/test_manifest.py -v
+"""
+
+from unittest.mock import patch
+
+from src.lastfm_fetch.manifest import IngestionManifest, content_hash, last_run_was_noop
+from src.lastfm_fetch.pull_geo import save_response
+
+
+PAYLOAD = {'topartists': {'artist': [{'name': 'Artist 1', '@attr': {'rank': '1'}}]}}
+
+
+class TestContentHash:
+    """Test cases for content_hash"""
+
+    def test_key_order_does_not_matter(self):
+        assert content_hash({'a': 1, 'b': 2}) == content_hash({'b': 2, 'a': 1})
+
+    def test_content_changes_hash(self):
+        assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+
+class TestIncrementalSave:
+    """Test cases for save_response with a manifest"""
+
+    @patch('src.lastfm_fetch.pull_geo.typer.echo')
+    def test_unchanged_chart_is_skipped(self, mock_echo, temp_data_dir):
+        """The second identical payload is not written"""
+        manifest = IngestionManifest(temp_data_dir / "_manifest.json")
+
+        with patch('src.lastfm_fetch.pull_geo.DATA_DIR', temp_data_dir):
+            first = save_response(PAYLOAD, "Japan", "artists", manifest=manifest)
+            second = save_response(PAYLOAD, "Japan", "artists", manifest=manifest)
+
+        assert first is not None and first.exists()
+        assert second is None
+        assert len(list((temp_data_dir / "artists").glob("*.json"))) == 1
+
+    @patch('src.lastfm_fetch.pull_geo.typer.echo')
+    def test_changed_chart_is_written(self, mock_echo, temp_data_dir):
+        """A different payload for the same chart is written"""
+        manifest = IngestionManifest(temp_data_dir / "_manifest.json")
+        changed = {'topartists': {'artist': [{'name': 'Artist 2', '@attr': {'rank': '1'}}]}}
+
+        with patch('src.lastfm_fetch.pull_geo.DATA_DIR', temp_data_dir):
+            save_response(PAYLOAD, "Japan", "artists", manifest=manifest)
+            assert save_response(changed, "Japan", "artists", manifest=manifest) is not None
+
+    @patch('src.lastfm_fetch.pull_geo.typer.echo')
+    def test_pages_are_tracked_separately(self, mock_echo, temp_data_dir):
+        """The same payload on another page is not considered unchanged"""
+        manifest = IngestionManifest(temp_data_dir / "_manifest.json")
+
+        with patch('src.lastfm_fetch.pull_geo.DATA_DIR', temp_data_dir):
+            save_response(PAYLOAD, "Japan", "artists", manifest=manifest, page=1)
+            assert save_response(PAYLOAD, "Japan", "artists", manifest=manifest, page=2) is not None
+
+
+class TestRunOutcome:
+    """Test cases for run bookkeeping"""
+
+    @patch('src.lastfm_fetch.pull_geo.typer.echo')
+    def test_noop_run_is_recorded(self, mock_echo, temp_data_dir):
+        """A run that changes nothing is persisted as a no-op"""
+        path = temp_data_dir / "_manifest.json"
+
+        with patch('src.lastfm_fetch.pull_geo.DATA_DIR', temp_data_dir):
+            manifest = IngestionManifest(path)
+            save_response(PAYLOAD, "Japan", "artists", manifest=manifest)
+            assert manifest.finish_run()["noop"] is False
+            assert not last_run_was_noop(path)
+
+            manifest = IngestionManifest(path)
+            save_response(PAYLOAD, "Japan", "artists", manifest=manifest)
+            run = manifest.finish_run()
+
+        assert run["noop"] is True
+        assert run["unchanged_charts"] == 1
+        assert last_run_was_noop(path)
+
+    def test_failed_run_is_not_noop(self, tmp_path):
+        """A run whose fetches all failed changed nothing but is not a no-op"""
+        path = tmp_path / "_manifest.json"
+        run = IngestionManifest(path).finish_run(failures=2)
+
+        assert run["noop"] is False
+        assert run["failed_charts"] == 2
+        assert not last_run_was_noop(path)
+
+    def test_missing_manifest_is_not_noop(self, tmp_path):
+        assert not last_run_was_noop(tmp_path / "missing.json")
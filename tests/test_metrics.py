@@ -0,0 +1,131 @@
+"""
+Tests for src/utils/metrics.py and the pipeline instrumentation
+
+Run tests with:
+    pytest tests/test_metrics.py -v
+"""
+
+import json
+
+import pytest
+
+from src.benchmarks.bench_pipeline import bench_ingestion
+from src.benchmarks.mock_server import MockLastfmServer
+from src.lastfm_fetch.http_client import LastfmHttpClient
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+from src.utils import metrics
+from src.utils.metrics import RunMetrics, get_metrics, to_prometheus, write_run_report
+
+
+class TestRunMetrics:
+    """Test cases for the metrics collector"""
+
+    def test_stage_accumulates(self):
+        run = RunMetrics()
+        for _ in range(3):
+            with run.stage("parse", bytes_read=100) as timer:
+                timer.add(records=10)
+
+        report = run.report("test")
+        assert report["stages"]["parse"]["calls"] == 3
+        assert report["stages"]["parse"]["records"] == 30
+        assert report["stages"]["parse"]["bytes_read"] == 300
+        assert report["stages"]["parse"]["seconds"] >= report["stages"]["parse"]["max_seconds"]
+
+    def test_stage_recorded_on_error(self):
+        run = RunMetrics()
+        with pytest.raises(ValueError):
+            with run.stage("write"):
+                raise ValueError("boom")
+        assert run.report("test")["stages"]["write"]["calls"] == 1
+
+    def test_http_percentiles_and_retries(self):
+        run = RunMetrics()
+        for ms in range(1, 101):
+            run.observe_http(ms / 1000, 200, nbytes=10)
+        run.observe_http(0.5, 429)
+        run.count("http_retries")
+
+        http = run.report("test")["http"]
+        assert http["requests"] == 101
+        assert http["retries"] == 1
+        assert http["bytes"] == 1000
+        assert http["statuses"] == {"200": 100, "429": 1}
+        assert 49 <= http["latency_ms"]["p50"] <= 52
+        assert http["latency_ms"]["max"] == 500
+
+    def test_merge_snapshot(self):
+        parent, child = RunMetrics(), RunMetrics()
+        with parent.stage("parse") as timer:
+            timer.add(records=1)
+        with child.stage("parse") as timer:
+            timer.add(records=2)
+        child.observe_http(0.1, 200)
+
+        parent.merge(child.snapshot())
+        report = parent.report("test")
+        assert report["stages"]["parse"]["calls"] == 2
+        assert report["stages"]["parse"]["records"] == 3
+        assert report["http"]["requests"] == 1
+
+
+class TestRunReport:
+    """Test cases for the JSON report and Prometheus export"""
+
+    def test_write_run_report(self, tmp_path):
+        with metrics.stage("fetch") as timer:
+            timer.add(records=50)
+
+        path = write_run_report("ingest", metrics_dir=tmp_path / "reports", textfile_dir=tmp_path / "prom")
+        report = json.loads(path.read_text())
+        assert report["run"] == "ingest"
+        assert report["stages"]["fetch"]["records"] == 50
+
+        prom = (tmp_path / "prom" / "music_warehouse_ingest.prom").read_text()
+        assert 'music_warehouse_stage_records{run="ingest",stage="fetch"} 50' in prom
+        # a new run starts after the report
+        assert get_metrics().report("next")["stages"] == {}
+
+    def test_prometheus_quantiles(self):
+        run = RunMetrics()
+        run.observe_http(0.2, 200)
+        prom = to_prometheus(run.report("ingest"))
+        assert 'music_warehouse_http_latency_seconds{run="ingest",quantile="0.5"} 0.2' in prom
+
+
+class TestInstrumentation:
+    """Test cases for the stages recorded by the pipeline"""
+
+    def test_http_retries_are_counted(self):
+        with MockLastfmServer(latency=0, rate_limit=1) as server:
+            client = LastfmHttpClient(base_url=server.url, max_retries=1, max_backoff=0)
+            params = {"method": "geo.gettopartists", "country": "Spain"}
+            client.get_json(params)
+            client.get_json(params)
+            client.close()
+
+        http = get_metrics().report("test")["http"]
+        assert http["statuses"]["429"] == 1
+        assert http["retries"] == 1
+
+    def test_ingestion_writes_report(self, tmp_path):
+        bench_ingestion(tmp_path, countries=2, latency=0, concurrency=2)
+
+        [path] = (tmp_path / "metrics").glob("ingest_*.json")
+        report = json.loads(path.read_text())
+        assert report["stages"]["fetch"]["calls"] == 4
+        assert report["stages"]["save"]["records"] == 200
+        assert report["stages"]["save"]["bytes_written"] > 0
+        assert report["http"]["requests"] == 4
+        # the ingest report does not end the run: later pipeline stages still see its metrics
+        assert get_metrics().report("pipeline")["http"]["requests"] == 4
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_transform_stages(self, raw_geo_dir, tmp_path, workers):
+        transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", workers=workers)
+
+        stages = get_metrics().report("test")["stages"]
+        assert stages["parse"]["calls"] == 22
+        assert stages["normalize"]["records"] == 1100
+        assert stages["concat"]["records"] == 1100
+        assert stages["write"]["bytes_written"] > 0
@@ -16,15 +16,15 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.lastfm_fetch.pull_geo import fetch_geo_data, save_response, main
+from src.config import CONNECT_TIMEOUT, READ_TIMEOUT
+from src.lastfm_fetch.pull_geo import fetch_geo_data, fetch_top_n, merge_pages, save_response, main
 
 
 class TestFetchGeoData:
     """Test cases for fetch_geo_data function"""
 
-    @patch('src.lastfm_fetch.pull_geo.requests.get')
+    @patch('src.lastfm_fetch.http_client.requests.Session.get')
     @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
-    @patch('src.lastfm_fetch.pull_geo.BASE_URL', 'https://ws.audioscrobbler.com/2.0/')
     def test_fetch_geo_data_success(self, mock_get):
         """Test successful API call for fetching geo data"""
         # Mock response
@@ -52,7 +52,7 @@ class TestFetchGeoData:
         assert 'topartists' in result
         mock_get.assert_called_once()
 
-        # Verify the params passed to requests.get
+        # Verify the params passed to the pooled session
         call_args = mock_get.call_args
         assert call_args[0][0] == 'https://ws.audioscrobbler.com/2.0/'
         params = call_args[1]['params']
@@ -63,9 +63,8 @@ class TestFetchGeoData:
         assert params['limit'] == 50
         assert params['page'] == 1
 
-    @patch('src.lastfm_fetch.pull_geo.requests.get')
+    @patch('src.lastfm_fetch.http_client.requests.Session.get')
     @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
-    @patch('src.lastfm_fetch.pull_geo.BASE_URL', 'https://ws.audioscrobbler.com/2.0/')
     def test_fetch_geo_data_tracks(self, mock_get):
         """Test fetching tracks instead of artists"""
         mock_response = Mock()
@@ -97,7 +96,7 @@ class TestFetchGeoData:
         assert params['limit'] == 25
         assert params['page'] == 2
 
-    @patch('src.lastfm_fetch.pull_geo.requests.get')
+    @patch('src.lastfm_fetch.http_client.requests.Session.get')
     @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
     def test_fetch_geo_data_api_error(self, mock_get):
         """Test handling of API errors"""
@@ -113,7 +112,7 @@ class TestFetchGeoData:
                 page=1
             )
 
-    @patch('src.lastfm_fetch.pull_geo.requests.get')
+    @patch('src.lastfm_fetch.http_client.requests.Session.get')
     @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
     def test_fetch_geo_data_timeout(self, mock_get):
         """Test that timeout is set correctly"""
@@ -129,9 +128,70 @@ class TestFetchGeoData:
             page=1
         )
 
-        # Verify timeout is set
+        # Verify separate connect/read timeouts are set
         call_args = mock_get.call_args
-        assert call_args[1]['timeout'] == 100
+        assert call_args[1]['timeout'] == (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+
+def make_artist_page(page, per_page, total_pages):
+    """Build a fake geo.gettopartists page with globally numbered ranks"""
+    first_rank = (page - 1) * per_page + 1
+    return {
+        'topartists': {
+            'artist': [
+                {'name': f'Artist {rank}', '@attr': {'rank': str(rank)}}
+                for rank in reversed(range(first_rank, first_rank + per_page))
+            ],
+            '@attr': {
+                'country': 'Japan',
+                'page': str(page),
+                'perPage': str(per_page),
+                'totalPages': str(total_pages),
+                'total': str(per_page * total_pages),
+            }
+        }
+    }
+
+
+class TestFetchTopN:
+    """Test cases for multi-page fetching"""
+
+    @patch('src.lastfm_fetch.pull_geo.fetch_geo_data')
+    def test_fetches_only_needed_pages(self, mock_fetch):
+        """Top 25 at 10 per page needs pages 1-3, not all 10 pages"""
+        mock_fetch.side_effect = lambda country, chart_type, limit, page, client=None, cache=None, api_key=None: \
+            make_artist_page(page, limit, total_pages=10)
+
+        result = fetch_top_n("Japan", "artists", top=25, limit=10)
+
+        requested = sorted(c.args[3] for c in mock_fetch.call_args_list)
+        assert requested == [1, 2, 3]
+
+        artists = result['topartists']['artist']
+        assert [a['@attr']['rank'] for a in artists] == [str(r) for r in range(1, 26)]
+        assert result['topartists']['@attr']['totalPages'] == '1'
+        assert result['topartists']['@attr']['perPage'] == '25'
+
+    @patch('src.lastfm_fetch.pull_geo.fetch_geo_data')
+    def test_stops_at_total_pages(self, mock_fetch):
+        """A chart shorter than `top` returns every available entry"""
+        mock_fetch.side_effect = lambda country, chart_type, limit, page, client=None, cache=None, api_key=None: \
+            make_artist_page(page, limit, total_pages=2)
+
+        result = fetch_top_n("Japan", "artists", top=1000, limit=50)
+
+        assert mock_fetch.call_count == 2
+        assert len(result['topartists']['artist']) == 100
+
+    def test_merge_pages_tracks(self):
+        """Track pages merge under the 'tracks' root key"""
+        pages = [
+            {'tracks': {'track': [{'@attr': {'rank': '1'}}, {'@attr': {'rank': '0'}}], '@attr': {'totalPages': '2'}}},
+            {'tracks': {'track': [{'@attr': {'rank': '2'}}], '@attr': {'totalPages': '2'}}},
+        ]
+        merged = merge_pages(pages, "tracks")
+        assert [t['@attr']['rank'] for t in merged['tracks']['track']] == ['0', '1', '2']
+        assert merged['tracks']['@attr']['pagesFetched'] == '2'
 
 
 class TestSaveResponse:
@@ -242,7 +302,7 @@ class TestMain:
 class TestIntegration:
     """Integration tests"""
 
-    @patch('src.lastfm_fetch.pull_geo.requests.get')
+    @patch('src.lastfm_fetch.http_client.requests.Session.get')
     @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
     @patch('src.lastfm_fetch.pull_geo.datetime')
     @patch('builtins.open', create=True)
@@ -0,0 +1,117 @@
+"""
+Tests for src/analytics/rank_matrix.py
+
+Run tests with:
+    pytest tests/test_rank_matrix.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.rank_matrix import MISSING, RankMatrix, build_rank_matrix
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+
+
+def small_matrix():
+    """Two artists in one country over four days"""
+    rows = [
+        ("A", "Spain", "2025-01-01", 3), ("A", "Spain", "2025-01-02", 1), ("A", "Spain", "2025-01-04", 2),
+        ("B", "Spain", "2025-01-01", 1), ("B", "Spain", "2025-01-02", 2), ("B", "Spain", "2025-01-03", 1),
+        ("B", "Spain", "2025-01-04", 1),
+    ]
+    entity, country, date, rank = (np.array(column) for column in zip(*rows))
+    return RankMatrix.from_arrays("artists", entity, country, date.astype("datetime64[D]"), rank)
+
+
+class TestRankMatrix:
+    """Test cases for the vectorized rank analytics"""
+
+    def test_layout(self):
+        matrix = small_matrix()
+        assert matrix.shape == (2, 1, 4)
+        assert matrix.ranks.dtype == np.int16
+        assert matrix.ranks[0, 0, 2] == MISSING
+
+    def test_deltas_entries_and_drop_offs(self):
+        matrix = small_matrix()
+        np.testing.assert_array_equal(matrix.deltas()[0, 0], [np.nan, 2, np.nan, np.nan])
+        np.testing.assert_array_equal(matrix.deltas()[1, 0], [np.nan, -1, 1, 0])
+        np.testing.assert_array_equal(matrix.new_entries()[0, 0], [True, False, False, True])
+        np.testing.assert_array_equal(matrix.drop_offs()[0, 0], [False, False, True, False])
+
+    def test_missing_country_chart_is_skipped(self):
+        """France has no chart on the 2nd: the 3rd is compared with the 1st, like in gold"""
+        rows = [
+            ("A", "Spain", "2025-01-01", 1), ("A", "Spain", "2025-01-02", 1), ("A", "Spain", "2025-01-03", 1),
+            ("A", "France", "2025-01-01", 4), ("A", "France", "2025-01-03", 1),
+            ("B", "France", "2025-01-01", 1),
+        ]
+        entity, country, date, rank = (np.array(column) for column in zip(*rows))
+        matrix = RankMatrix.from_arrays("artists", entity, country, date.astype("datetime64[D]"), rank)
+        france = matrix.country_index("France")
+
+        np.testing.assert_array_equal(matrix.previous_charts()[france], [-1, 0, 0])
+        np.testing.assert_array_equal(matrix.deltas()[0, france], [np.nan, np.nan, 3])
+        np.testing.assert_array_equal(matrix.new_entries()[0, france], [True, False, False])
+        np.testing.assert_array_equal(matrix.drop_offs()[1, france], [False, False, True])
+        assert not matrix.drop_offs()[:, france, 1].any()
+
+        movers = matrix.top_movers(date="2025-01-03", country="France")
+        assert movers["entity"].tolist() == ["A"]
+        assert movers.iloc[0]["prev_rank"] == 4
+
+    def test_deep_ranks_widen_instead_of_wrapping(self):
+        entity, country = np.array(["A", "A"]), np.array(["Spain", "Spain"])
+        date = np.array(["2025-01-01", "2025-01-02"], dtype="datetime64[D]")
+        matrix = RankMatrix.from_arrays("artists", entity, country, date, np.array([40000, 39000]))
+
+        assert matrix.ranks.dtype == np.int32
+        np.testing.assert_array_equal(matrix.deltas()[0, 0], [np.nan, 1000])
+        with pytest.raises(ValueError, match="Negative rank"):
+            RankMatrix.from_arrays("artists", entity, country, date, np.array([-2, 1]))
+
+    def test_longest_streaks(self):
+        matrix = small_matrix()
+        np.testing.assert_array_equal(matrix.longest_streaks()[:, 0], [2, 4])
+
+    def test_top_movers(self):
+        movers = small_matrix().top_movers(date="2025-01-02")
+        assert movers["entity"].tolist() == ["A"]
+        assert movers.iloc[0]["rank_delta"] == 2
+        with pytest.raises(KeyError):
+            small_matrix().top_movers(date="2030-01-01")
+
+    def test_series(self):
+        series = small_matrix().series("A", "Spain")
+        assert series.index[0] == pd.Timestamp("2025-01-01")
+        assert series.isna().tolist() == [False, False, True, False]
+
+    def test_save_and_load_memory_mapped(self, tmp_path):
+        matrix = small_matrix()
+        matrix.save(tmp_path / "matrix")
+        loaded = RankMatrix.load(tmp_path / "matrix")
+
+        assert isinstance(loaded.ranks, np.memmap)
+        np.testing.assert_array_equal(loaded.ranks, matrix.ranks)
+        assert loaded.entities.tolist() == ["A", "B"]
+        np.testing.assert_array_equal(loaded.longest_streaks(), matrix.longest_streaks())
+
+    def test_from_silver_matches_pandas(self, raw_geo_dir, tmp_path):
+        """Deltas agree with a pandas groupby over the silver history"""
+        out = tmp_path / "out"
+        output_file = transform_artists_json(raw_geo_dir / "artists", out)
+        matrix = build_rank_matrix(out, "artists", tmp_path / "matrix")
+
+        df = pd.read_parquet(output_file)
+        assert matrix.present().sum() == len(df)
+
+        df = df.sort_values("chart_date")
+        df["prev_rank"] = df.groupby(["artist_name", "chart_country"])["rank"].shift()
+        moved = df.dropna(subset=["prev_rank"])
+        sample = moved.iloc[0]
+        e = matrix.entity_index(sample["artist_name"])
+        c = matrix.country_index(sample["chart_country"])
+        d = int(np.searchsorted(matrix.dates, np.datetime64(sample["chart_date"], "D")))
+        assert matrix.deltas()[e, c, d] == sample["prev_rank"] - sample["rank"]
+        assert (tmp_path / "matrix" / "artists" / "ranks.npy").exists()
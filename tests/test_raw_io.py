@@ -0,0 +1,79 @@
+"""
+Tests for src/utils/raw_io.py
+
+Run tests with:
+    pytest tests/test_raw_io.py -v
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.transform_data.transform_tracks import transform_json_data as transform_tracks_json
+from src.utils.raw_io import iter_records, list_raw_files, load_payload, raw_stem, write_raw
+
+
+@pytest.fixture
+def track_payload(raw_geo_dir):
+    file = sorted((raw_geo_dir / "tracks").glob("*.json"))[0]
+    return file, json.loads(file.read_text())
+
+
+class TestWriteRaw:
+    """Test cases for the raw landing formats"""
+
+    @pytest.mark.parametrize("fmt", ["json", "ndjson.gz", "ndjson.zst"])
+    def test_round_trip(self, tmp_path, track_payload, fmt):
+        """Every format loads back as the original API payload"""
+        _, payload = track_payload
+        path = write_raw(payload, tmp_path / "japan_2025-11-11_17-01-14", "tracks", fmt=fmt)
+
+        assert path.name == f"japan_2025-11-11_17-01-14.{fmt}"
+        assert raw_stem(path) == "japan_2025-11-11_17-01-14"
+        assert load_payload(path) == payload
+        assert list(iter_records(path, "tracks")) == payload["tracks"]["track"]
+
+    def test_compact_formats_are_smaller(self, tmp_path, track_payload):
+        """Compressed NDJSON without images is several times smaller than the pretty JSON"""
+        original, payload = track_payload
+        path = write_raw(payload, tmp_path / "japan_2025-11-11_17-01-14", "tracks", fmt="ndjson.zst",
+                         drop_images=True)
+        assert original.stat().st_size / path.stat().st_size > 5
+
+    def test_strip_images(self, tmp_path, track_payload):
+        _, payload = track_payload
+        path = write_raw(payload, tmp_path / "x_2025-11-11_00-00-00", "tracks", fmt="ndjson.gz", drop_images=True)
+        records = load_payload(path)["tracks"]["track"]
+        assert all("image" not in record for record in records)
+        assert records[0]["artist"] == payload["tracks"]["track"][0]["artist"]
+
+    def test_unknown_format(self, tmp_path, track_payload):
+        with pytest.raises(ValueError):
+            write_raw(track_payload[1], tmp_path / "x", "tracks", fmt="xml")
+
+
+class TestTransparentReads:
+    """Test cases for transforms over mixed raw formats"""
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_transform_reads_every_format(self, raw_geo_dir, tmp_path, streaming):
+        """Converting half the files to compressed NDJSON does not change the silver output"""
+        tracks_dir = raw_geo_dir / "tracks"
+        expected = pd.read_parquet(transform_tracks_json(tracks_dir, tmp_path / "before"))
+
+        for i, file in enumerate(sorted(tracks_dir.glob("*.json"))):
+            if i % 2:
+                fmt = "ndjson.gz" if i % 4 == 1 else "ndjson.zst"
+                write_raw(json.loads(file.read_text()), tracks_dir / raw_stem(file), "tracks", fmt=fmt,
+                          drop_images=True)
+                file.unlink()
+
+        assert len(list_raw_files(tracks_dir)) == 22
+        actual = pd.read_parquet(transform_tracks_json(tracks_dir, tmp_path / "after", streaming=streaming))
+
+        columns = [c for c in expected.columns if c != "load_time"]
+        pd.testing.assert_frame_equal(
+            expected[columns].reset_index(drop=True),
+            actual[columns].reset_index(drop=True),
+        )
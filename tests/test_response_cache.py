@@ -0,0 +1,91 @@
+"""
+Tests for src/lastfm_fetch/response_cache.py
+
+Run tests with:
+    pytest tests/test_response_cache.py -v
+"""
+
+from unittest.mock import Mock, patch
+
+from src.lastfm_fetch.pull_geo import fetch_geo_data
+from src.lastfm_fetch.response_cache import ResponseCache
+
+
+PARAMS = {'method': 'geo.gettopartists', 'country': 'Japan', 'limit': 50, 'page': 1, 'format': 'json'}
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache"""
+
+    def test_round_trip(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        assert cache.get(PARAMS) is None
+
+        cache.set(PARAMS, {'topartists': {}})
+        assert cache.get(PARAMS) == {'topartists': {}}
+
+    def test_api_key_is_not_part_of_the_key(self, tmp_path):
+        """Requests that differ only in api_key share an entry"""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set({**PARAMS, 'api_key': 'one'}, {'ok': True})
+        assert cache.get({**PARAMS, 'api_key': 'two'}) == {'ok': True}
+
+    def test_value_types_are_normalized(self, tmp_path):
+        """limit=50 and limit='50' are the same request"""
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set(PARAMS, {'ok': True})
+        assert cache.get({**PARAMS, 'limit': '50'}) == {'ok': True}
+
+    @patch('src.lastfm_fetch.response_cache.time.time')
+    def test_entries_expire(self, mock_time, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", ttl=60)
+        mock_time.return_value = 1000
+        cache.set(PARAMS, {'ok': True})
+
+        mock_time.return_value = 1059
+        assert cache.get(PARAMS) == {'ok': True}
+        mock_time.return_value = 1061
+        assert cache.get(PARAMS) is None
+        assert len(cache) == 0
+
+    @patch('src.lastfm_fetch.response_cache.time.time')
+    def test_least_recently_used_is_evicted(self, mock_time, tmp_path):
+        """Going over max_bytes evicts the entry read longest ago"""
+        payload = {'data': 'x' * 100}
+        cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=250)
+
+        mock_time.return_value = 1
+        cache.set({**PARAMS, 'page': 1}, payload)
+        mock_time.return_value = 2
+        cache.set({**PARAMS, 'page': 2}, payload)
+        mock_time.return_value = 3
+        cache.get({**PARAMS, 'page': 1})
+        mock_time.return_value = 4
+        cache.set({**PARAMS, 'page': 3}, payload)
+
+        assert cache.get({**PARAMS, 'page': 1}) is not None
+        assert cache.get({**PARAMS, 'page': 2}) is None
+        assert cache.get({**PARAMS, 'page': 3}) is not None
+
+    def test_entries_replay(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        cache.set({**PARAMS, 'api_key': 'secret'}, {'ok': True})
+
+        entries = list(cache.entries())
+        assert entries == [({k: str(v) for k, v in PARAMS.items()}, {'ok': True})]
+
+
+class TestFetchGeoDataCache:
+    """Test cases for fetch_geo_data reading through a cache"""
+
+    @patch('src.lastfm_fetch.pull_geo.API_KEY', 'test_api_key')
+    def test_second_call_is_served_from_cache(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        client = Mock()
+        client.get_json.return_value = {'topartists': {'artist': []}}
+
+        first = fetch_geo_data("Japan", "artists", 50, 1, client=client, cache=cache)
+        second = fetch_geo_data("Japan", "artists", 50, 1, client=client, cache=cache)
+
+        assert first == second
+        client.get_json.assert_called_once()
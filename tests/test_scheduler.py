@@ -0,0 +1,163 @@
+"""
+Tests for src/utils/schedular.py
+
+Run tests with:
+    pytest tests/test_scheduler.py -v
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from apscheduler.triggers.cron import CronTrigger
+
+from src.utils.metrics import get_metrics, stage, write_run_report
+
+from src.utils.schedular import (
+    PipelineLock, Step, build_scheduler, load_state, missed_run, run_dag, run_pipeline, save_state, validate_dag
+)
+
+
+class TestRunDag:
+    """Test cases for the pipeline DAG runner"""
+
+    def test_independent_steps_run_concurrently(self):
+        # both transforms must be inside the barrier at the same time to pass it
+        barrier = threading.Barrier(2, timeout=5)
+        order = []
+        steps = [
+            Step("ingest", lambda: order.append("ingest")),
+            Step("artists", lambda: (barrier.wait(), order.append("artists")), ("ingest",)),
+            Step("tracks", lambda: (barrier.wait(), order.append("tracks")), ("ingest",)),
+            Step("gold", lambda: order.append("gold"), ("artists", "tracks")),
+        ]
+        results = run_dag(steps)
+
+        assert all(r.status == "ok" for r in results.values())
+        assert order[0] == "ingest" and order[-1] == "gold"
+
+    def test_failure_skips_dependents(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        ran = []
+        steps = [
+            Step("ingest", lambda: None),
+            Step("artists", fail, ("ingest",)),
+            Step("tracks", lambda: ran.append("tracks"), ("ingest",)),
+            Step("gold", lambda: ran.append("gold"), ("artists", "tracks")),
+            Step("report", lambda: ran.append("report"), ("gold",)),
+        ]
+        results = run_dag(steps)
+
+        assert results["artists"].status == "failed"
+        assert "boom" in results["artists"].error
+        assert results["tracks"].status == "ok"
+        assert results["gold"].status == "skipped"
+        assert results["report"].status == "skipped"
+        assert ran == ["tracks"]
+
+    def test_skipped_step_does_not_block(self):
+        results = run_dag([Step("transform", lambda: "skipped"), Step("gold", lambda: None, ("transform",))])
+        assert results["transform"].status == "skipped"
+        assert results["gold"].status == "ok"
+
+    def test_invalid_dags(self):
+        with pytest.raises(ValueError, match="unknown"):
+            validate_dag([Step("a", lambda: None, ("missing",))])
+        with pytest.raises(ValueError, match="cycle"):
+            validate_dag([Step("a", lambda: None, ("b",)), Step("b", lambda: None, ("a",))])
+
+
+class TestRunPipeline:
+    """Test cases for overlap protection and run state"""
+
+    def test_lock_prevents_overlap(self, tmp_path):
+        lock = PipelineLock(tmp_path / "pipeline.lock")
+        assert lock.acquire()
+        assert not PipelineLock(tmp_path / "pipeline.lock").acquire()
+        lock.release()
+        assert PipelineLock(tmp_path / "pipeline.lock").acquire()
+
+    def test_stale_lock_is_taken_over(self, tmp_path):
+        path = tmp_path / "pipeline.lock"
+        path.write_text("999999999")
+        assert PipelineLock(path).acquire()
+        assert path.read_text() == str(os.getpid())
+
+    def test_overlapping_run_is_skipped(self, tmp_path):
+        lock_path, state_path = tmp_path / "pipeline.lock", tmp_path / "state.json"
+        inner = []
+        step = Step("nested", lambda: inner.append(run_pipeline([], lock_path, state_path)))
+
+        results = run_pipeline([step], lock_path, state_path)
+
+        assert results["nested"].status == "ok"
+        assert inner == [None]
+        assert not lock_path.exists()
+
+    def test_state_is_recorded(self, tmp_path):
+        state_path = tmp_path / "state.json"
+        run_pipeline([Step("ingest", lambda: None)], tmp_path / "pipeline.lock", state_path)
+
+        state = load_state(state_path)
+        assert state["last_status"] == "ok"
+        assert state["steps"]["ingest"]["status"] == "ok"
+        assert "last_success" in state
+
+    def test_one_run_report_covers_every_step(self, tmp_path):
+        """An intermediate stage report does not discard the metrics of the running pipeline"""
+        def ingest():
+            with stage("fetch") as timer:
+                timer.add(records=10)
+            write_run_report("ingest", reset=False)
+
+        def transform():
+            with stage("parse") as timer:
+                timer.add(records=10)
+
+        with stage("stale"):
+            pass
+        steps = [Step("ingest", ingest), Step("transform", transform, ("ingest",))]
+        run_pipeline(steps, tmp_path / "pipeline.lock", tmp_path / "state.json")
+
+        [ingest_report] = [json.loads(p.read_text()) for p in (tmp_path / "metrics").glob("ingest_*.json")]
+        [pipeline_report] = [json.loads(p.read_text()) for p in (tmp_path / "metrics").glob("pipeline_*.json")]
+        assert {"fetch", "parse"} <= set(pipeline_report["stages"])
+        assert "stale" not in pipeline_report["stages"]
+        assert pipeline_report["run_id"] == ingest_report["run_id"]
+        # the next run starts afresh
+        assert get_metrics().report("next")["stages"] == {}
+
+
+class TestScheduling:
+    """Test cases for cron scheduling and catch-up"""
+
+    def test_missed_run(self):
+        trigger = CronTrigger.from_crontab("0 0 * * *", timezone="UTC")
+        last = datetime(2025, 1, 1, 0, 0, 5, tzinfo=timezone.utc)
+
+        assert missed_run(trigger, None)
+        assert not missed_run(trigger, last, now=datetime(2025, 1, 1, 23, 0, tzinfo=timezone.utc))
+        assert missed_run(trigger, last, now=datetime(2025, 1, 3, 8, 0, tzinfo=timezone.utc))
+
+    def test_job_options(self, tmp_path):
+        state_path = tmp_path / "state.json"
+        save_state({"last_started": datetime.now(timezone.utc).isoformat()}, state_path)
+
+        scheduler = build_scheduler("*/5 * * * *", "UTC", state_path=state_path, job=lambda: None)
+        job = scheduler.get_job("pipeline")
+        assert job.max_instances == 1
+        assert job.coalesce is True
+        # no catch-up needed: the first run is left to the cron trigger
+        assert getattr(job, "next_run_time", None) is None
+
+    def test_catch_up_runs_immediately(self, tmp_path):
+        state_path = tmp_path / "state.json"
+        save_state({"last_started": "2020-01-01T00:00:00+00:00"}, state_path)
+
+        scheduler = build_scheduler("0 0 * * *", "UTC", state_path=state_path, job=lambda: None)
+        job = scheduler.get_job("pipeline")
+        assert (job.next_run_time - datetime.now(timezone.utc)).total_seconds() < 5
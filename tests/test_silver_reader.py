@@ -0,0 +1,114 @@
+"""
+Tests for src/analytics/silver_reader.py
+
+Run tests with:
+    pytest tests/test_silver_reader.py -v
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.analytics.silver_reader import TableCache, load_charts
+from src.transform_data.compaction import compact_silver
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+
+
+@pytest.fixture
+def cache():
+    return TableCache(max_bytes=64 * 1024 * 1024)
+
+
+class TestLoadCharts:
+    """Test cases for filtered, projected silver reads"""
+
+    def test_filters_and_projection(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+
+        df = load_charts("artists", countries=["japan", "spain"], date_range=("2025-11-12", None),
+                         columns=["artist_name", "rank"], output_dir=out, cache=cache)
+        assert list(df.columns) == ["artist_name", "rank"]
+        assert len(df) == 2 * 50
+        assert df["rank"].dtype == "int16"
+
+        everything = load_charts("artists", output_dir=out, cache=cache)
+        assert len(everything) == 22 * 50
+        assert set(everything["chart_country"].astype(str)) >= {"japan", "spain"}
+
+    def test_latest_load_wins(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        second = pd.read_parquet(transform_artists_json(raw_geo_dir / "artists", out))
+
+        assert len(load_charts("artists", output_dir=out, latest=False, cache=cache)) == 2 * 22 * 50
+        df = load_charts("artists", output_dir=out, cache=cache)
+        assert len(df) == 22 * 50
+        assert (df["load_time"] >= second["load_time"].min()).all()
+
+    def test_partitioned_layout_is_pruned(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out, layout="partitioned")
+
+        table = load_charts("artists", countries=["japan"], output_dir=out, as_arrow=True, cache=cache)
+        assert isinstance(table, pa.Table)
+        assert table.num_rows == 2 * 50
+        assert set(table.column("chart_country").to_pylist()) == {"japan"}
+        # one file per japan chart day was opened
+        assert cache.misses == 2
+
+    def test_retired_files_are_not_read(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+        transform_artists_json(raw_geo_dir / "artists", out)
+        compact_silver(out, "artists")
+
+        assert len(load_charts("artists", output_dir=out, latest=False, cache=cache)) == 22 * 50
+
+    def test_files_with_another_column_order(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        fresh = transform_artists_json(raw_geo_dir / "artists", out)
+        legacy = pd.read_parquet(fresh)
+        legacy[list(reversed(legacy.columns))].to_parquet(fresh.with_name("artists_20251112_072608.parquet"))
+
+        df = load_charts("artists", columns=["rank", "artist_name"], output_dir=out, latest=False, cache=cache)
+        assert list(df.columns) == ["rank", "artist_name"]
+        assert len(df) == 2 * 22 * 50
+
+    def test_unknown_column(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown artists columns"):
+            load_charts("artists", columns=["nope"], output_dir=tmp_path)
+
+    def test_no_data(self, tmp_path):
+        df = load_charts("tracks", columns=["rank"], output_dir=tmp_path, cache=None)
+        assert df.empty and list(df.columns) == ["rank"]
+
+
+class TestTableCache:
+    """Test cases for the decoded-file cache"""
+
+    def test_repeated_queries_hit_the_cache(self, raw_geo_dir, tmp_path, cache):
+        out = tmp_path / "out"
+        transform_artists_json(raw_geo_dir / "artists", out)
+
+        first = load_charts("artists", countries=["japan"], output_dir=out, cache=cache)
+        second = load_charts("artists", countries=["japan"], output_dir=out, cache=cache)
+        assert (cache.misses, cache.hits) == (1, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+        # a new silver file is read on its own, the old one still comes from the cache
+        transform_artists_json(raw_geo_dir / "artists", out)
+        load_charts("artists", countries=["japan"], output_dir=out, cache=cache)
+        assert (cache.misses, cache.hits) == (2, 2)
+
+    def test_least_recently_used_tables_are_evicted(self):
+        table = pa.table({"x": pa.array(range(1000), pa.int64())})
+        cache = TableCache(max_bytes=int(table.nbytes * 2.5))
+        for key in "abc":
+            cache.put(key, table)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        cache.put("d", table)
+        assert cache.get("c") is None and cache.get("b") is not None
+        assert cache.nbytes <= cache.max_bytes
@@ -0,0 +1,411 @@
+"""
+Tests for src/transform_data
+
+Run tests with:
+    pytest tests/test_transform.py -v
+"""
+
+import json
+import os
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+import typer
+
+from src.benchmarks.bench_parse import run_benchmark
+from src.benchmarks.synthetic import chart_payload
+from src.transform_data import streaming
+from src.transform_data.compact import compact_schema, to_compact_frame, to_compact_table
+from src.transform_data.engine import raw_sources, transform_chart_file, transform_charts, transform_kind
+from src.transform_data.parallel import transform_files
+from src.transform_data.silver_writer import open_partitioned, quarantine_path
+from src.transform_data.transform_artists import transform_artist_data_country
+from src.transform_data.transform_artists import transform_json_data as transform_artists_json
+from src.transform_data.transform_tracks import transform_track_data_country
+from src.transform_data.transform_tracks import transform_json_data as transform_tracks_json
+from src.transform_data.validation import validate_chart_frame
+from src.transform_data.watermark import ProcessedFiles
+from src.utils.chart_schemas import CHART_SCHEMAS, ChartSchema, Field
+from src.utils.raw_io import iter_json_records
+
+
+class TestTransformFiles:
+    """Test cases for the parallel transform helper"""
+
+    def test_parallel_matches_serial(self, raw_geo_dir):
+        """Process-pool results are identical and in the same order as a serial run"""
+        files = sorted((raw_geo_dir / "artists").glob("*.json"))
+
+        serial, serial_errors = transform_files(files, transform_artist_data_country, workers=1)
+        parallel, parallel_errors = transform_files(files, transform_artist_data_country, workers=3)
+
+        assert serial_errors == parallel_errors == []
+        assert len(serial) == len(parallel) == len(files)
+        for left, right in zip(serial, parallel):
+            pd.testing.assert_frame_equal(left.drop(columns="load_time"), right.drop(columns="load_time"))
+
+    def test_bad_file_is_reported(self, raw_geo_dir):
+        """A malformed file is reported without failing the others"""
+        bad = raw_geo_dir / "tracks" / "nowhere_2025-11-11_00-00-00.json"
+        bad.write_text("{not json")
+        files = sorted((raw_geo_dir / "tracks").glob("*.json"))
+
+        dfs, errors = transform_files(files, transform_track_data_country, workers=2)
+
+        assert len(dfs) == len(files) - 1
+        assert [file for file, _ in errors] == [bad]
+
+
+class TestFastParser:
+    """Test cases for the fast-path parser against the json_normalize path"""
+
+    @pytest.mark.parametrize("kind,transform", [
+        ("artists", transform_artist_data_country),
+        ("tracks", transform_track_data_country),
+    ])
+    def test_engines_agree(self, raw_geo_dir, kind, transform):
+        """Both engines produce the same columns, values and dtypes"""
+        for file in sorted((raw_geo_dir / kind).glob("*.json")):
+            slow = transform(file, engine="pandas").drop(columns="load_time").reset_index(drop=True)
+            fast = transform(file, engine="fast").drop(columns="load_time")
+            pd.testing.assert_frame_equal(slow, fast[slow.columns])
+
+    def test_benchmark_reports_both_engines(self, raw_geo_dir):
+        results = run_benchmark(raw_geo_dir, repeat=1)
+        assert set(results) == {"artists", "tracks"}
+        assert results["artists"]["files"] == 22
+        assert results["artists"]["fast"] > 0
+
+
+class TestTransformJsonData:
+    """Test cases for the artist/track transform entry points"""
+
+    def test_artists_silver_output(self, raw_geo_dir, tmp_path):
+        output_file = transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", workers=2)
+
+        df = pd.read_parquet(output_file)
+        assert len(df) == 22 * 50
+        assert {"rank", "artist_name", "artist_listeners", "chart_country", "chart_date"} <= set(df.columns)
+        assert "image" not in df.columns
+
+    def test_tracks_silver_output(self, raw_geo_dir, tmp_path):
+        output_file = transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "out", workers=1)
+
+        df = pd.read_parquet(output_file)
+        assert len(df) == 22 * 50
+        assert {"rank", "track_name", "artist_name", "track_listeners"} <= set(df.columns)
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(typer.Exit):
+            transform_artists_json(tmp_path / "missing", tmp_path / "out")
+
+
+class TestIncrementalTransform:
+    """Test cases for --incremental silver builds"""
+
+    def test_only_new_files_are_processed(self, raw_geo_dir, tmp_path):
+        """A second run with no new raw files writes nothing; a new file yields a small part"""
+        artists_dir = raw_geo_dir / "artists"
+        new_file = artists_dir / "japan_2025-11-11_17-01-13.json"
+        held_back = new_file.read_bytes()
+        new_file.unlink()
+
+        first = transform_artists_json(artists_dir, tmp_path / "out", incremental=True)
+        assert len(pd.read_parquet(first)) == 21 * 50
+
+        assert transform_artists_json(artists_dir, tmp_path / "out", incremental=True) is None
+
+        new_file.write_bytes(held_back)
+        second = transform_artists_json(artists_dir, tmp_path / "out", incremental=True)
+        part = pd.read_parquet(second)
+        assert len(part) == 50
+        assert set(part["chart_country"]) == {"japan"}
+        assert second != first
+
+    def test_touched_file_with_same_content_is_skipped(self, raw_geo_dir, tmp_path):
+        """A new mtime alone (e.g. a fresh checkout) does not trigger reprocessing"""
+        tracks_dir = raw_geo_dir / "tracks"
+        transform_tracks_json(tracks_dir, tmp_path / "out", incremental=True)
+
+        for file in tracks_dir.glob("*.json"):
+            os.utime(file, (1, 1))
+        assert transform_tracks_json(tracks_dir, tmp_path / "out", incremental=True) is None
+
+
+class TestPartitionedLayout:
+    """Test cases for the Hive-partitioned silver layout"""
+
+    def test_partitions_and_pruning(self, raw_geo_dir, tmp_path):
+        """One directory per country-day, and a country-day filter reads a single file"""
+        dataset_dir = transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", layout="partitioned")
+
+        assert dataset_dir == tmp_path / "out" / "silver" / "geo" / "partitioned" / "artists"
+        assert (dataset_dir / "chart_date=2025-11-11" / "chart_country=japan").is_dir()
+
+        dataset = open_partitioned(dataset_dir)
+        assert dataset.count_rows() == 22 * 50
+
+        day = (ds.field("chart_country") == "japan") & (ds.field("chart_date") == date(2025, 11, 12))
+        fragments = list(dataset.get_fragments(filter=day))
+        assert len(fragments) == 1
+        assert dataset.to_table(filter=day).num_rows == 50
+
+    def test_full_rebuild_replaces_partitions(self, raw_geo_dir, tmp_path):
+        """Re-running a full transform replaces country-day partitions instead of duplicating rows"""
+        transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "out", layout="partitioned", compression="snappy")
+        dataset_dir = transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "out", layout="partitioned")
+        assert open_partitioned(dataset_dir).count_rows() == 22 * 50
+
+    def test_unknown_layout(self, raw_geo_dir, tmp_path):
+        with pytest.raises(typer.BadParameter):
+            transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", layout="sharded")
+
+
+class TestStreamingTransform:
+    """Test cases for --streaming transforms"""
+
+    def test_json_records_stream_in_small_chunks(self, raw_geo_dir):
+        """Records decoded across chunk boundaries match json.load"""
+        for kind, root, key in [("artists", "topartists", "artist"), ("tracks", "tracks", "track")]:
+            file = sorted((raw_geo_dir / kind).glob("*.json"))[0]
+            expected = json.loads(file.read_text())[root][key]
+            assert list(iter_json_records(file, key, chunk_size=13)) == expected
+
+    def test_truncated_file_raises(self, tmp_path):
+        file = tmp_path / "japan_2025-11-11_00-00-00.json"
+        file.write_text('{"topartists": {"artist": [{"name": "A"}, {"name": "B"')
+        with pytest.raises(ValueError):
+            list(iter_json_records(file, "artist"))
+
+    def test_streaming_matches_in_memory(self, raw_geo_dir, tmp_path):
+        """Streaming with tiny batches yields the same rows as the in-memory transform"""
+        in_memory = pd.read_parquet(transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "a"))
+        streamed_file = transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "b", streaming=True, batch_size=7,
+                                              row_group_size=100)
+        streamed = pd.read_parquet(streamed_file)
+
+        assert pq_row_groups(streamed_file) == 11
+        pd.testing.assert_frame_equal(
+            in_memory.drop(columns="load_time").reset_index(drop=True),
+            streamed.drop(columns="load_time")[in_memory.drop(columns="load_time").columns],
+        )
+
+    def test_large_file_is_streamed_batch_by_batch(self, tmp_path, monkeypatch):
+        """Batches of a file much larger than batch_size are written out before the file has been read to the end"""
+        raw_file = tmp_path / "japan_2025-11-11_00-00-00.json"
+        raw_file.write_text(json.dumps(chart_payload("artists", "Japan", limit=5000, total=5000)))
+
+        events = []
+        read_batches, write_batch = streaming.iter_record_batches, streaming.FileSpool.write
+
+        def spy_read(*args):
+            yield from read_batches(*args)
+            events.append("end of file")
+
+        def spy_write(spool, batch):
+            events.append("write")
+            write_batch(spool, batch)
+
+        monkeypatch.setattr(streaming, "iter_record_batches", spy_read)
+        monkeypatch.setattr(streaming.FileSpool, "write", spy_write)
+        rows, errors = streaming.stream_to_parquet(
+            [raw_file], "artists", tmp_path / "artists.parquet", batch_size=100, compression="zstd",
+            row_group_size=1000, dictionary_columns=[]
+        )
+
+        assert (rows, errors) == (5000, [])
+        assert events[:events.index("end of file")].count("write") == 50
+        # the spool is removed once replayed
+        assert sorted(f.name for f in tmp_path.iterdir()) == ["artists.parquet", raw_file.name]
+
+    def test_failed_file_is_skipped(self, raw_geo_dir, tmp_path):
+        """A bad raw file is reported and skipped; the rest is streamed and watermarked"""
+        bad_file = raw_geo_dir / "artists" / "zz_2025-11-13_00-00-00.json"
+        bad_file.write_text('{"topartists": {"artist": [{"name": "A"}, {')
+
+        output_file = transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", streaming=True,
+                                             incremental=True, batch_size=1)
+        df = pd.read_parquet(output_file)
+        assert len(df) == 22 * 50
+        assert "A" not in set(df["artist_name"].astype(str))
+
+        watermark = ProcessedFiles(output_file.parent)
+        assert watermark.new_files(sorted((raw_geo_dir / "artists").glob("*.json"))) == [bad_file]
+
+    def test_all_files_failing_leaves_no_file(self, tmp_path):
+        raw_dir = tmp_path / "raw"
+        raw_dir.mkdir()
+        (raw_dir / "zz_2025-11-13_00-00-00.json").write_text('{"topartists": {"artist": [{')
+        with pytest.raises(typer.Exit):
+            transform_artists_json(raw_dir, tmp_path / "out", streaming=True)
+        assert list((tmp_path / "out").rglob("*.parquet")) == []
+
+
+class TestCompactSchema:
+    """Test cases for the compact silver types"""
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_silver_files_use_compact_schema(self, raw_geo_dir, tmp_path, streaming):
+        output_file = transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "out", streaming=streaming)
+        assert pq.read_schema(output_file).remove_metadata() == compact_schema("tracks")
+
+    def test_compact_frame_dtypes(self, raw_geo_dir):
+        parsed = transform_chart_file(sorted((raw_geo_dir / "artists").glob("*.json"))[0], "artists")
+        df = to_compact_frame(parsed, "artists")
+
+        assert df["artist_name"].dtype == "category"
+        assert df["chart_country"].dtype == "category"
+        assert df["artist_url"].dtype == pd.StringDtype("pyarrow")
+        assert df["rank"].dtype == "int16"
+        assert df["artist_listeners"].dtype == "int32"
+        assert df["streamable"].dtype == "bool"
+        assert str(df["chart_date"].dtype) == "date32[day][pyarrow]"
+        assert df["artist_name"].astype(str).tolist() == parsed["artist_name"].tolist()
+
+    def test_out_of_range_values_are_not_wrapped(self):
+        with pytest.raises(pa.ArrowInvalid):
+            to_compact_table(pd.DataFrame({"rank": [1, 40000]}), "artists")
+
+
+class TestChartSchemaEngine:
+    """Test cases for the schema registry and the shared transform engine"""
+
+    @pytest.fixture
+    def tags_schema(self, monkeypatch):
+        schema = ChartSchema(
+            kind="tags",
+            label="tag",
+            method="geo.gettoptags",
+            root_key="toptags",
+            record_key="tag",
+            fields=(
+                Field("tag_name", ("name",), str),
+                Field("tag_reach", ("reach",), int),
+                Field("rank", ("@attr", "rank"), int),
+            ),
+            dictionary_columns=("tag_name",),
+        )
+        monkeypatch.setitem(CHART_SCHEMAS, "tags", schema)
+        return schema
+
+    def write_tags(self, raw_dir):
+        tags_dir = raw_dir / "tags"
+        tags_dir.mkdir()
+        for country in ["japan", "brazil"]:
+            records = [{"name": f"tag{i}", "reach": str(100 - i), "@attr": {"rank": str(i)}} for i in range(5)]
+            (tags_dir / f"{country}_2025-11-11_00-00-00.json").write_text(json.dumps({"toptags": {"tag": records}}))
+        return tags_dir
+
+    def test_registered_chart_type_is_transformed(self, raw_geo_dir, tmp_path, tags_schema):
+        """A new chart type needs only a registry entry to reach silver, with either engine"""
+        tags_dir = self.write_tags(raw_geo_dir)
+        file = sorted(tags_dir.iterdir())[0]
+        slow = transform_chart_file(file, "tags", engine="pandas").drop(columns="load_time")
+        fast = transform_chart_file(file, "tags", engine="fast").drop(columns="load_time")
+        pd.testing.assert_frame_equal(slow, fast[slow.columns])
+
+        output_file = transform_kind("tags", tags_dir, tmp_path / "out", workers=1)
+        df = pd.read_parquet(output_file)
+        assert output_file.parent == tmp_path / "out" / "silver" / "geo" / "tags"
+        assert len(df) == 10
+        assert df["tag_reach"].dtype == "int64"
+
+    def test_single_pass_over_every_chart_type(self, raw_geo_dir, tmp_path):
+        """One run over the raw root writes each chart type like its own transform would"""
+        outputs = transform_charts(raw_sources(raw_geo_dir), tmp_path / "all", workers=2)
+        assert set(outputs) == {"artists", "tracks"}
+
+        alone = pd.read_parquet(transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "alone"))
+        together = pd.read_parquet(outputs["tracks"])
+        pd.testing.assert_frame_equal(alone.drop(columns="load_time"), together.drop(columns="load_time"))
+        assert len(pd.read_parquet(outputs["artists"])) == 22 * 50
+
+    def test_incremental_tracks_each_chart_type(self, raw_geo_dir, tmp_path):
+        transform_charts(raw_sources(raw_geo_dir, ["artists"]), tmp_path / "out", incremental=True)
+        outputs = transform_charts(raw_sources(raw_geo_dir), tmp_path / "out", incremental=True)
+
+        assert outputs["artists"] is None
+        assert len(pd.read_parquet(outputs["tracks"])) == 22 * 50
+
+    def test_unknown_chart_type(self, raw_geo_dir):
+        with pytest.raises(ValueError, match="Unknown chart type"):
+            raw_sources(raw_geo_dir, ["albums"])
+
+
+class TestValidation:
+    """Test cases for columnar validation and the quarantine dataset"""
+
+    def corrupt(self, raw_geo_dir):
+        """Break four records of one artists file in four different ways"""
+        file = sorted((raw_geo_dir / "artists").glob("*.json"))[0]
+        data = json.loads(file.read_text())
+        records = data["topartists"]["artist"]
+        records[0]["listeners"] = "n/a"
+        records[1]["name"] = " "
+        records[2]["listeners"] = "-5"
+        records[3]["@attr"]["rank"] = records[4]["@attr"]["rank"]
+        file.write_text(json.dumps(data))
+
+    @pytest.mark.parametrize("engine", ["fast", "pandas"])
+    def test_bad_rows_are_quarantined_not_their_file(self, raw_geo_dir, tmp_path, engine):
+        self.corrupt(raw_geo_dir)
+        output_file = transform_kind("artists", raw_geo_dir / "artists", tmp_path / "out", engine=engine)
+
+        df = pd.read_parquet(output_file)
+        assert len(df) == 22 * 50 - 4
+        assert df["artist_listeners"].dtype == "int32"
+        quarantine = pd.read_parquet(next(quarantine_path(tmp_path / "out", "artists").glob("*.parquet")))
+        assert sorted(quarantine["quarantine_reason"]) == [
+            "duplicate_rank", "invalid_number", "missing_value", "negative_value"
+        ]
+
+    def test_streaming_quarantines_bad_rows(self, raw_geo_dir, tmp_path):
+        self.corrupt(raw_geo_dir)
+        output_file = transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", streaming=True)
+
+        assert len(pd.read_parquet(output_file)) == 22 * 50 - 4
+        assert len(pd.read_parquet(next(quarantine_path(tmp_path / "out", "artists").glob("*.parquet")))) == 4
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_values_too_large_for_storage_are_quarantined(self, raw_geo_dir, tmp_path, streaming):
+        """A rank beyond int16 or a listener count beyond int32 is quarantined instead of failing the write"""
+        file = sorted((raw_geo_dir / "artists").glob("*.json"))[0]
+        data = json.loads(file.read_text())
+        records = data["topartists"]["artist"]
+        records[0]["listeners"] = str(2 ** 31)
+        records[1]["@attr"]["rank"] = "40000"
+        file.write_text(json.dumps(data))
+
+        output_file = transform_artists_json(raw_geo_dir / "artists", tmp_path / "out", streaming=streaming)
+        assert len(pd.read_parquet(output_file)) == 22 * 50 - 2
+        quarantine = pd.read_parquet(next(quarantine_path(tmp_path / "out", "artists").glob("*.parquet")))
+        assert quarantine["quarantine_reason"].tolist() == ["out_of_range"] * 2
+
+    def test_unparseable_date_is_quarantined(self, raw_geo_dir, tmp_path):
+        """A file name without a valid date no longer gets today's date"""
+        file = sorted((raw_geo_dir / "tracks").glob("*.json"))[0]
+        file.rename(file.with_name("japan_2025-13-45_00-00-00.json"))
+
+        df = pd.read_parquet(transform_tracks_json(raw_geo_dir / "tracks", tmp_path / "out"))
+        assert len(df) == 21 * 50
+        assert df["chart_date"].notna().all()
+        assert pd.to_datetime(df["chart_date"]).max() < pd.Timestamp("2026-01-01")
+
+    def test_checks_on_a_frame(self, raw_geo_dir):
+        df = transform_chart_file(sorted((raw_geo_dir / "artists").glob("*.json"))[0], "artists")
+        df = df[df["rank"] != 10]
+        df.loc[df.index[0], "chart_date"] = pd.Timestamp("2100-01-01")
+
+        valid, quarantine, report = validate_chart_frame(df, "artists")
+        assert (len(valid), len(quarantine)) == (48, 1)
+        assert report.quarantined == {"bad_date": 1}
+        assert report.rank_gaps == 1
+        assert 0 <= report.empty_mbid_rate["artist_mbid"] <= 1
+
+
+def pq_row_groups(path):
+    return pq.ParquetFile(path).num_row_groups